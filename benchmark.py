@@ -0,0 +1,380 @@
+# benchmark.py
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+from statistics import mean, median
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sudoku_batch import iter_batch_items
+from sudoku_solver import DEFAULT_ENGINE, engine_names, solve_many
+from sudoku_utils import Board, board_to_string, parse_board_string, read_board_from_file
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench")
+INPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "input")
+# Baseline được commit nên chỉ chứa số đo không phụ thuộc máy: tổng số nút
+# tìm kiếm của từng corpus / engine (tất định) và thời gian chia cho thời gian
+# chạy calibrate() trên cùng máy. Tạo / ghi đè: python benchmark.py --update-baseline
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+# Tên corpus -> đường dẫn (thư mục file 9 dòng hoặc file mỗi dòng một đề 81 ký tự)
+CORPORA: Dict[str, str] = {
+    "easy": os.path.join(BENCH_DIR, "easy.txt"),
+    "input": INPUT_DIR,
+    "hard": os.path.join(BENCH_DIR, "hard.txt"),
+    "17clue": os.path.join(BENCH_DIR, "17clue.txt"),
+}
+
+# Đề 17 gợi ý đã biết (nghiệm duy nhất), làm hạt giống cho corpus 17clue
+SEEDS_17 = (
+    "000000010400000000020000000000050407008000300001090000300400200050100000000806000",
+    "000000010400000000020000000000050604008000300001090000300400200050100000000807000",
+    "000000012000035000000600070700000300000400800100000000000120000080000040050000600",
+    "000000012003600000000007000410020000000500300700000600280000040000300500000000000",
+    "000000012008030000000000040120500000000004700060000000507000300000620000000100000",
+    "000000012040050000000009000070600400000100000000000050000087500601000300200000000",
+    "000000012050400000000000030700600400001000000000080000920000800000510700000003000",
+    "000000012300000060000040000900000500000001070020000000000350400001400800060000000",
+    "000000012400090000000000050070200000600000400000108000018000000000030700502000000",
+    "000000012500008000000700000600120000700000450000030000030000800000500700020000000",
+    "000000013000030080070000000000206000030000900000010000600500204000400700100000000",
+    "000000013000200000000000080000760200008000400010000000200000750600340000000008000",
+    "000000013000500070000802000000400900107000000000000200890000050040000600000010000",
+    "000000013000700060000508000000400800106000000000000200740000050020000400000010000",
+    "000000013000700060000509000000400900106000000000000200740000050080000400000010000",
+    "000000013000800070000502000000400900107000000000000200890000050040000600000010000",
+    "000000013020500000000000000103000070000802000004000000000340500670000200000010000",
+)
+
+
+# ========= CORPUS =========
+
+def load_corpus(name: str) -> List[Tuple[str, Board]]:
+    """Các đề (nhãn, board) 9×9 hợp lệ của corpus; file lỗi / khác 9×9 bị bỏ qua."""
+    path = CORPORA.get(name, name)
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"Không thấy corpus {name} ({path}). Tạo bằng: python benchmark.py --build-corpora"
+        )
+    from_files, items = iter_batch_items(path)
+    puzzles = []
+    for label, data in items:
+        try:
+            board = read_board_from_file(data) if from_files else parse_board_string(data)
+        except ValueError:
+            continue
+        puzzles.append((label, board))
+    return puzzles
+
+
+def _random_transform(board: Board, rng: random.Random) -> Board:
+    """Đề tương đương ngẫu nhiên: đổi nhãn, hoán vị band / hàng / stack / cột, chuyển vị."""
+    def line_order() -> List[int]:
+        bands = rng.sample(range(3), 3)
+        return [b * 3 + k for b in bands for k in rng.sample(range(3), 3)]
+
+    rows, cols = line_order(), line_order()
+    relabel = [0] + rng.sample(range(1, 10), 9)
+    out = [[relabel[board[r][c]] for c in cols] for r in rows]
+    if rng.random() < 0.5:
+        out = [list(col) for col in zip(*out)]
+    return out
+
+
+def build_corpora(seed: int = 2024) -> None:
+    """
+    Sinh các corpus cục bộ trong bench/ (chạy một lần, kết quả được commit
+    để mọi lần đo dùng cùng dữ liệu):
+    - easy: 100 đề 36 gợi ý.
+    - hard: 50 đề có điểm grader cao nhất trong 400 đề 22 gợi ý.
+    - 17clue: các đề 17 gợi ý đã biết + biến đổi đối xứng ngẫu nhiên.
+    """
+    from sudoku_generator import generate_many
+    from sudoku_grader import Grader
+    from sudoku_solver import is_unique
+
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    rng = random.Random(seed)
+
+    def write(name: str, header: str, puzzles: Sequence[str]) -> None:
+        with open(CORPORA[name], "w", encoding="utf-8") as f:
+            f.write(f"# {header}\n")
+            for text in puzzles:
+                f.write(text + "\n")
+        print(f"{name}: {len(puzzles)} đề -> {CORPORA[name]}")
+
+    write("easy", f"36 gợi ý, seed={seed}", list(generate_many(100, 36, seed=seed)))
+
+    grader = Grader()
+    candidates = list(generate_many(400, 22, seed=seed + 1))
+    candidates.sort(key=lambda s: grader.grade(parse_board_string(s)).score, reverse=True)
+    write("hard", f"top 50/400 theo điểm grader, 22 gợi ý, seed={seed + 1}", candidates[:50])
+
+    seeds = []
+    for text in SEEDS_17:
+        board = parse_board_string(text)
+        if is_unique(board):
+            seeds.append(board)
+    puzzles = [board_to_string(b) for b in seeds]
+    for board in seeds:
+        for _ in range(5):
+            variant = _random_transform(board, rng)
+            puzzles.append(board_to_string(variant))
+    write("17clue", f"{len(seeds)} đề 17 gợi ý x 6 biến thể đối xứng, seed={seed}", puzzles)
+
+
+# ========= ĐO =========
+
+def percentile(sorted_samples: Sequence[float], p: float) -> float:
+    """Percentile kiểu nearest-rank trên dãy đã sắp xếp."""
+    if not sorted_samples:
+        return 0.0
+    k = max(0, math.ceil(p / 100.0 * len(sorted_samples)) - 1)
+    return sorted_samples[k]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    s = sorted(samples)
+    return {
+        "n": len(s),
+        "mean_ms": mean(s) if s else 0.0,
+        "median_ms": median(s) if s else 0.0,
+        "p95_ms": percentile(s, 95),
+        "p99_ms": percentile(s, 99),
+        "max_ms": s[-1] if s else 0.0,
+    }
+
+
+def calibrate(rounds: int = 7) -> float:
+    """
+    Thời gian (ms, tốt nhất trong rounds lượt) của một vòng Python thuần cố
+    định, không gọi code solver: phép bit + đọc / ghi list như vòng lặp nóng
+    của engine. Chia thời gian giải cho số này để so được giữa các máy.
+    """
+    table = list(range(81))
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        mask = 0
+        for k in range(200_000):
+            i = table[k % 81]
+            mask = (mask | (1 << (i % 9))) & ~(k & 0x1FE)
+            table[i] = (i + mask) % 81
+        best = min(best, (time.perf_counter() - start) * 1000.0)
+    return best
+
+
+def bench_corpus(
+    puzzles: List[Tuple[str, Board]], engine: str, repeat: int, warmup: int
+) -> Dict[str, float]:
+    """
+    Chạy warmup lượt bỏ kết quả, rồi repeat lượt đo; mỗi lượt giải toàn bộ
+    corpus qua solve_many() (dùng lại bộ nhớ tạm như batch thật).
+    Mẫu = thời gian từng đề ở từng lượt. Lỗi nếu có đề không giải được.
+    Thêm "nodes": tổng số nút tìm kiếm trên cả corpus, đếm ở một lượt riêng
+    có collect_stats (engine có đếm chậm hơn nên không lẫn vào số đo thời gian).
+    """
+    boards = [board for _, board in puzzles]
+    for _ in range(warmup):
+        for _ in solve_many(boards, engine=engine):
+            pass
+
+    samples: List[float] = []
+    for _ in range(repeat):
+        for (label, _), result in zip(puzzles, solve_many(boards, engine=engine, stats=True)):
+            if not result.solved:
+                raise RuntimeError(f"{engine} không giải được {label}.")
+            samples.append(result.elapsed_ms)
+
+    summary = summarize(samples)
+    summary["nodes"] = sum(
+        result.stats.nodes for result in solve_many(boards, engine=engine, collect_stats=True)
+    )
+    return summary
+
+
+def compare(
+    current: Dict[str, Dict[str, Dict[str, float]]],
+    baseline: Dict[str, Dict[str, Dict[str, float]]],
+    metric: str,
+    threshold: float,
+    calibration_ms: float,
+    base_calibration_ms: Optional[float],
+    time_threshold: float,
+) -> List[str]:
+    """
+    So với baseline; trả về danh sách cặp (corpus/engine) có số nút tìm kiếm
+    tăng quá threshold, hoặc metric (chia cho thời gian calibrate() của lần
+    chạy tương ứng) tăng quá time_threshold. Số nút tất định nên ngưỡng chặt
+    được; thời gian tương đối vẫn lệch giữa các CPU / lần chạy nên ngưỡng
+    rộng hơn. Baseline cũ không có calibration_ms thì chỉ so số nút.
+    """
+    regressions = []
+    for corpus, engines in current.items():
+        for engine, stats in engines.items():
+            base = baseline.get(corpus, {}).get(engine)
+            if not base:
+                continue
+            checks = []
+            if base.get("nodes"):
+                checks.append(("nodes", base["nodes"], stats["nodes"], "{:.0f}", threshold))
+            if base_calibration_ms and base.get(metric):
+                checks.append((
+                    f"{metric}/calib",
+                    base[metric] / base_calibration_ms,
+                    stats[metric] / calibration_ms,
+                    "{:.4f}",
+                    time_threshold,
+                ))
+            for name, before, after, fmt, limit in checks:
+                ratio = after / before
+                flag = "REGRESSION" if ratio > 1.0 + limit else "ok"
+                print(
+                    f"  {corpus}/{engine}: {name} {fmt.format(before)} -> "
+                    f"{fmt.format(after)} (x{ratio:.2f}) {flag}"
+                )
+                if ratio > 1.0 + limit:
+                    regressions.append(f"{corpus}/{engine} ({name})")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark các engine trên các corpus đề.")
+    parser.add_argument(
+        "--corpus",
+        action="append",
+        help=f"Corpus (lặp lại được; tên trong {', '.join(CORPORA)} hoặc đường dẫn). Mặc định: tất cả.",
+    )
+    parser.add_argument(
+        "--engine",
+        action="append",
+        choices=engine_names(),
+        help=f"Engine (lặp lại được, mặc định: {DEFAULT_ENGINE}).",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Số lượt đo (mặc định: 5).")
+    parser.add_argument("--warmup", type=int, default=1, help="Số lượt chạy nóng (mặc định: 1).")
+    parser.add_argument("--json", metavar="FILE", help="Ghi kết quả JSON ra file.")
+    parser.add_argument(
+        "--baseline",
+        metavar="FILE",
+        default=None,
+        help="File baseline JSON để so sánh (mặc định: bench/baseline.json nếu có).",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        "--save-baseline",
+        dest="update_baseline",
+        action="store_true",
+        help=(
+            "Ghi kết quả lần này (kèm số nút và thời gian calibrate) làm baseline mới "
+            "thay vì so sánh; chạy lại sau khi thay đổi có chủ đích số nút / tốc độ."
+        ),
+    )
+    parser.add_argument(
+        "--metric",
+        choices=("median_ms", "p95_ms", "p99_ms", "max_ms", "mean_ms"),
+        default="median_ms",
+        help="Chỉ số thời gian (chia cho calibrate) dùng để so baseline (mặc định: median_ms).",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.20,
+        help="Số nút tìm kiếm tăng quá tỉ lệ này so với baseline thì báo lỗi (mặc định: 0.20 = 20%%).",
+    )
+    parser.add_argument(
+        "--time-threshold",
+        type=float,
+        default=0.50,
+        help=(
+            "Thời gian tương đối (metric / calibrate) tăng quá tỉ lệ này so với "
+            "baseline thì báo lỗi (mặc định: 0.50 = 50%%)."
+        ),
+    )
+    parser.add_argument(
+        "--build-corpora",
+        action="store_true",
+        help="Sinh lại bench/easy.txt, hard.txt, 17clue.txt rồi thoát.",
+    )
+    args = parser.parse_args()
+
+    if args.build_corpora:
+        build_corpora()
+        sys.exit(0)
+    # Chỉ baseline mặc định mới được phép chưa có; --baseline gõ tay mà thiếu
+    # file thì báo lỗi thay vì âm thầm bỏ qua bước so sánh
+    if args.baseline is None:
+        args.baseline = DEFAULT_BASELINE
+    elif not args.update_baseline and not os.path.exists(args.baseline):
+        parser.error(f"không tìm thấy file baseline: {args.baseline}")
+
+    corpora = args.corpus or list(CORPORA)
+    engines = args.engine or [DEFAULT_ENGINE]
+    calibration_ms = calibrate()
+    print(f"calibrate: {calibration_ms:.3f} ms")
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    print(
+        f"{'corpus':<10} {'engine':<12} {'n':>6} {'median':>9} {'p95':>9} {'p99':>9} "
+        f"{'max':>9}  (ms) {'nodes':>9}"
+    )
+    for corpus in corpora:
+        puzzles = load_corpus(corpus)
+        results[corpus] = {}
+        for engine in engines:
+            stats = bench_corpus(puzzles, engine, args.repeat, args.warmup)
+            results[corpus][engine] = stats
+            print(
+                f"{corpus:<10} {engine:<12} {stats['n']:>6} {stats['median_ms']:>9.3f} "
+                f"{stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f} {stats['max_ms']:>9.3f}"
+                f"       {stats['nodes']:>9}"
+            )
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "calibration_ms": calibration_ms,
+        },
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nĐã ghi JSON: {args.json}")
+
+    failed: List[str] = []
+    baseline: Optional[dict] = None
+    if args.baseline and os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(
+            f"\nSo với baseline {args.baseline} "
+            f"(nodes +{args.threshold:.0%}, {args.metric}/calibrate +{args.time_threshold:.0%}):"
+        )
+        failed = compare(
+            results,
+            baseline["results"],
+            args.metric,
+            args.threshold,
+            calibration_ms,
+            baseline.get("meta", {}).get("calibration_ms"),
+            args.time_threshold,
+        )
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nĐã lưu baseline: {args.baseline}")
+
+    if failed:
+        print(f"\n*** REGRESSION: {', '.join(failed)} vượt ngưỡng so với baseline ***")
+        sys.exit(1)
@@ -1,65 +1,107 @@
-﻿# run_tests.py
-import os
-import time
-from sudoku_solver import solve_sudoku
-from sudoku_utils import read_board_from_file, write_board_to_file
-
-# Thư mục input/output
-input_dir = "input"
-output_dir = "output"
-os.makedirs(output_dir, exist_ok=True)
-
-# Puzzle bình thường
-puzzles = [f"puzzle{i}.txt" for i in range(1, 7)]
-
-# Puzzle lỗi
-error_puzzles = [
-    "puzzle_error_missing_line.txt",
-    "puzzle_error_wrong_char.txt",
-    "puzzle_error_duplicate.txt"
-]
-
-# Tạo report
-report_lines = ["# Report Test Case Sudoku Solver\n"]
-report_lines.append("| Puzzle | Số ô trống ban đầu | Giải được không | Thời gian giải (ms) |")
-report_lines.append("|--------|------------------|----------------|--------------------|")
-
-# Hàm helper để chạy từng puzzle
-def run_puzzle(puzzle_file):
-    input_path = os.path.join(input_dir, puzzle_file)
-    output_file = f"solved{puzzle_file[6:]}"  # solved2.txt, solved3.txt,...
-    output_path = os.path.join(output_dir, output_file)
-    try:
-        board = read_board_from_file(input_path)
-        empty_count = sum(row.count(0) for row in board)
-        start = time.perf_counter()
-        solved = solve_sudoku(board)
-        end = time.perf_counter()
-        elapsed_ms = (end - start) * 1000
-
-        if solved:
-            write_board_to_file(board, output_path)
-            solved_status = "✅"
-        else:
-            solved_status = "❌"
-
-        report_lines.append(f"| {puzzle_file} | {empty_count} | {solved_status} | {elapsed_ms:.2f} |")
-        print(f"{puzzle_file}: solved={solved_status}, time={elapsed_ms:.2f} ms")
-    except Exception as e:
-        report_lines.append(f"| {puzzle_file} | ERROR | ❌ | 0 |")
-        print(f"Lỗi đọc file {puzzle_file}: {e}")
-
-# Chạy puzzle bình thường
-for puzzle_file in puzzles:
-    run_puzzle(puzzle_file)
-
-# Chạy puzzle lỗi
-for puzzle_file in error_puzzles:
-    run_puzzle(puzzle_file)
-
-# Ghi report
-report_path = os.path.join(output_dir, "report_testcase.md")
-with open(report_path, "w", encoding="utf-8") as f:
-    f.write("\n".join(report_lines))
-
-print(f"\nĐã tạo report_testcase.md tại: {os.path.abspath(report_path)}")
+﻿# run_tests.py
+import argparse
+import os
+from sudoku_grader import Grader
+from sudoku_profile import add_profile_arguments, profiled
+from sudoku_solver import DEFAULT_ENGINE, engine_names, solve
+from sudoku_store import SolutionStore
+from sudoku_utils import read_board_from_file, write_board_to_file
+
+# Có thể chạy nhiều engine để so sánh: --engine bitmask --engine dlx
+parser = argparse.ArgumentParser(description="Chạy bộ test puzzle và ghi report.")
+parser.add_argument(
+    "--engine",
+    action="append",
+    choices=engine_names(),
+    help=f"Engine giải (lặp lại để so sánh, mặc định: {DEFAULT_ENGINE}).",
+)
+parser.add_argument(
+    "--store",
+    metavar="DB",
+    help=(
+        "File SQLite lưu lời giải; lần chạy sau dùng lại thay vì giải lại "
+        "(bị bỏ qua khi so sánh nhiều engine)."
+    ),
+)
+add_profile_arguments(parser)
+args = parser.parse_args()
+engines = args.engine or [DEFAULT_ENGINE]
+store = SolutionStore(args.store) if args.store else None
+if store is not None and len(engines) > 1:
+    # So sánh engine: lấy lời giải từ store thì engine sau không được đo
+    print("Nhiều --engine: bỏ qua --store để mọi engine đều thực sự giải.")
+    store.close()
+    store = None
+
+# Thư mục input/output
+input_dir = "input"
+output_dir = "output"
+os.makedirs(output_dir, exist_ok=True)
+
+# Puzzle bình thường
+puzzles = [f"puzzle{i}.txt" for i in range(1, 7)]
+
+# Puzzle lỗi
+error_puzzles = [
+    "puzzle_error_missing_line.txt",
+    "puzzle_error_wrong_char.txt",
+    "puzzle_error_duplicate.txt"
+]
+
+# Tạo report
+report_lines = ["# Report Test Case Sudoku Solver\n"]
+report_lines.append("| Puzzle | Engine | Số ô trống ban đầu | Độ khó (điểm) | Giải được không | Thời gian giải (ms) | Thống kê |")
+report_lines.append("|--------|--------|------------------|---------------|----------------|--------------------|----------|")
+
+# Độ khó không phụ thuộc máy (kỹ thuật khó nhất + số lần quay lui), ổn định hơn thời gian;
+# cũng không phụ thuộc engine nên mỗi puzzle chỉ chấm một lần
+grader = Grader()
+grades = {}
+
+# Hàm helper để chạy từng puzzle
+def run_puzzle(puzzle_file, engine):
+    input_path = os.path.join(input_dir, puzzle_file)
+    output_file = f"solved{puzzle_file[6:]}"  # solved2.txt, solved3.txt,...
+    output_path = os.path.join(output_dir, output_file)
+    try:
+        board = read_board_from_file(input_path)
+        empty_count = sum(row.count(0) for row in board)
+        grade = grades.get(puzzle_file)
+        if grade is None:
+            grade = grades[puzzle_file] = grader.grade(board)
+        result = solve(board, engine=engine, store=store, collect_stats=True)
+        elapsed_ms = result.elapsed_ms
+
+        if result.solved:
+            write_board_to_file(result.board, output_path)
+            solved_status = "✅"
+        else:
+            solved_status = "❌"
+
+        report_lines.append(f"| {puzzle_file} | {engine} | {empty_count} | {grade.rating} ({grade.score}) | {solved_status} | {elapsed_ms:.2f} | {result.stats.summary()} |")
+        print(f"{puzzle_file} [{engine}]: solved={solved_status}, grade={grade.rating} ({grade.score}), time={elapsed_ms:.2f} ms, {result.stats.summary()}")
+    except Exception as e:
+        report_lines.append(f"| {puzzle_file} | {engine} | ERROR | - | ❌ | 0 | - |")
+        print(f"Lỗi đọc file {puzzle_file}: {e}")
+
+# --profile / --profile-out: đo toàn bộ các lượt chạy bằng cProfile
+with profiled(args.profile, args.profile_out):
+    for engine in engines:
+        # Chạy puzzle bình thường
+        for puzzle_file in puzzles:
+            run_puzzle(puzzle_file, engine)
+
+        # Chạy puzzle lỗi
+        for puzzle_file in error_puzzles:
+            run_puzzle(puzzle_file, engine)
+
+if store is not None:
+    print(f"Store: {store.hits} hit, {store.misses} miss ({store.bloom_rejects} loại bởi Bloom filter)")
+    store.close()
+
+# Ghi report
+report_path = os.path.join(output_dir, "report_testcase.md")
+with open(report_path, "w", encoding="utf-8") as f:
+    f.write("\n".join(report_lines))
+
+print(f"\nĐã tạo report_testcase.md tại: {os.path.abspath(report_path)}")
@@ -0,0 +1,282 @@
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sudoku_utils import (
+    Board,
+    CompactBoard,
+    board_to_string,
+    board_to_string_nxn,
+    parse_board_nxn_string,
+    parse_board_string,
+    read_board_from_file,
+    read_board_nxn,
+)
+from sudoku_solver import DEFAULT_ENGINE, SolveStatus, get_engine, solve_many
+
+if TYPE_CHECKING:
+    from sudoku_store import SolutionStore
+
+# Cache lời giải của process worker (tạo ở chunk đầu tiên khi cache_size > 0),
+# dùng chung cho mọi chunk worker đó nhận
+_worker_cache = None
+
+# Một đề trong batch: (nhãn, dữ liệu)
+# - Thư mục: nhãn = tên file, dữ liệu = đường dẫn file 9 dòng (N dòng với
+#   engine nxn).
+# - File nhiều đề: nhãn = "dòng N", dữ liệu = chuỗi 81 ký tự (N*N với nxn).
+BatchItem = Tuple[str, str]
+# Kết quả: (nhãn, lời giải 81 ký tự | "NOSOLUTION" | "TIMEOUT" |
+#          "BUDGET_EXHAUSTED" | "ERROR: ...")
+BatchResult = Tuple[str, str]
+# (đề, lời giải) của các đề giải được, gửi về process chính để ghi store
+SolvedPair = Tuple[CompactBoard, CompactBoard]
+
+NXN_BATCH_ERROR = (
+    "Engine nxn trong batch không dùng được với --vectorized / --store (chỉ cho 9×9)."
+)
+
+
+def iter_batch_items(path: str) -> Tuple[bool, Iterator[BatchItem]]:
+    """
+    Liệt kê các đề của batch.
+    Trả về (from_files, iterator): from_files=True nếu path là thư mục.
+    File nhiều đề: mỗi dòng không rỗng là một đề 81 ký tự, dòng bắt đầu
+    bằng '#' là chú thích. File được đọc dần, không nạp hết vào bộ nhớ.
+    """
+    if os.path.isdir(path):
+        names = sorted(f for f in os.listdir(path) if f.lower().endswith(".txt"))
+        return True, ((name, os.path.join(path, name)) for name in names)
+
+    def lines() -> Iterator[BatchItem]:
+        with open(path, "r", encoding="utf-8") as f:
+            for line_num, line in enumerate(f, start=1):
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield f"dòng {line_num}", line
+
+    return False, lines()
+
+
+def _read_item(data: str, from_files: bool, nxn: bool) -> Board:
+    """Đọc một đề của batch bằng bộ đọc 9×9, hoặc bộ đọc N×N nếu nxn."""
+    if nxn:
+        return read_board_nxn(data) if from_files else parse_board_nxn_string(data)
+    return read_board_from_file(data) if from_files else parse_board_string(data)
+
+
+def solve_chunk(
+    chunk: List[BatchItem],
+    from_files: bool,
+    engine: str = DEFAULT_ENGINE,
+    vectorized: bool = False,
+    timeout_ms: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    cache_size: int = 0,
+    solved: Optional[List[SolvedPair]] = None,
+) -> List[BatchResult]:
+    """
+    Giải một chunk đề (chạy trong process worker).
+    Lỗi dữ liệu của từng đề được ghi vào kết quả, không làm hỏng cả chunk.
+    Các đề hợp lệ đi qua solve_many() để dùng chung bộ nhớ tạm của engine,
+    hoặc solve_many_vectorized() (numpy) nếu vectorized=True.
+    timeout_ms / max_nodes áp cho từng đề (chỉ với solve_many()): đề bị dừng
+    ghi "TIMEOUT" / "BUDGET_EXHAUSTED" thay vì làm treo cả chunk.
+    cache_size > 0: đề lặp lại / đối xứng trong batch lấy từ SolutionCache
+    của worker (bị bỏ qua khi có timeout_ms / max_nodes hoặc vectorized).
+    solved: nếu là list, thêm vào đó (đề, lời giải) của mọi đề giải được.
+    Engine nxn đọc / ghi đề bằng định dạng N×N (read_board_nxn, chuỗi N*N).
+    """
+    global _worker_cache
+    nxn = get_engine(engine).nxn
+    to_string = board_to_string_nxn if nxn else board_to_string
+    results: List[Optional[str]] = [None] * len(chunk)
+    boards: List[Board] = []
+    positions: List[int] = []
+
+    for k, (_, data) in enumerate(chunk):
+        try:
+            board = _read_item(data, from_files, nxn)
+        except (OSError, ValueError) as e:
+            results[k] = f"ERROR: {e}"
+            continue
+        boards.append(board)
+        positions.append(k)
+
+    if vectorized:
+        from sudoku_numpy import solve_many_vectorized
+
+        results_iter = solve_many_vectorized(boards, engine=engine)
+    else:
+        cache = None
+        if cache_size > 0:
+            if _worker_cache is None or _worker_cache.maxsize != cache_size:
+                from sudoku_cache import SolutionCache
+
+                _worker_cache = SolutionCache(cache_size, engine=engine)
+            cache = _worker_cache
+        results_iter = solve_many(
+            boards, engine=engine, timeout_ms=timeout_ms, max_nodes=max_nodes, cache=cache
+        )
+
+    for j, (k, result) in enumerate(zip(positions, results_iter)):
+        if result.solved:
+            results[k] = to_string(result.board)
+            if solved is not None:
+                solved.append(
+                    (CompactBoard.from_rows(boards[j]), CompactBoard.from_rows(result.board))
+                )
+        elif result.status is SolveStatus.NO_SOLUTION:
+            results[k] = "NOSOLUTION"
+        else:
+            results[k] = result.status.value
+
+    return [(label, text) for (label, _), text in zip(chunk, results)]
+
+
+def _solve_chunk_keep_solved(
+    chunk: List[BatchItem], *args
+) -> Tuple[List[BatchResult], List[SolvedPair]]:
+    """solve_chunk() kèm các cặp (đề, lời giải), để submit vào pool."""
+    solved: List[SolvedPair] = []
+    return solve_chunk(chunk, *args, solved=solved), solved
+
+
+def _lookup_chunk(
+    chunk: List[BatchItem], from_files: bool, store: "SolutionStore"
+) -> Tuple[List[Optional[str]], List[BatchItem]]:
+    """
+    Đọc chunk ở process chính và tra store trước khi gửi cho worker.
+    Trả về (known, todo): known[k] là kết quả đã biết của đề thứ k (lời giải
+    từ store hoặc "ERROR: ..."), None nếu phải giải; todo là các đề cần
+    giải, đã chuyển sang chuỗi 81 ký tự (worker không phải đọc lại file).
+    """
+    known: List[Optional[str]] = []
+    todo: List[BatchItem] = []
+    for label, data in chunk:
+        try:
+            board = read_board_from_file(data) if from_files else parse_board_string(data)
+        except (OSError, ValueError) as e:
+            known.append(f"ERROR: {e}")
+            continue
+        solution = store.get(board)
+        if solution is not None:
+            known.append(board_to_string(solution))
+            continue
+        known.append(None)
+        todo.append((label, board_to_string(board)))
+    return known, todo
+
+
+def _merge(
+    chunk: List[BatchItem], known: List[Optional[str]], solved: List[BatchResult]
+) -> List[BatchResult]:
+    """Ghép kết quả worker (theo thứ tự todo) vào các chỗ trống của known."""
+    rest = iter(solved)
+    return [
+        (label, text) if text is not None else next(rest)
+        for (label, _), text in zip(chunk, known)
+    ]
+
+
+def _chunks(items: Iterable[BatchItem], size: int) -> Iterator[List[BatchItem]]:
+    chunk: List[BatchItem] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def solve_batch(
+    path: str,
+    engine: str = DEFAULT_ENGINE,
+    workers: Optional[int] = None,
+    chunksize: int = 256,
+    ordered: bool = True,
+    vectorized: bool = False,
+    timeout_ms: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    cache_size: int = 0,
+    store: Optional["SolutionStore"] = None,
+) -> Iterator[BatchResult]:
+    """
+    Giải mọi đề trong thư mục / file nhiều đề bằng ProcessPoolExecutor.
+    - Đề được gom thành chunk chunksize đề / lần gửi để giảm chi phí IPC.
+    - Chỉ giữ tối đa 2 * workers chunk đang chạy => bộ nhớ không phụ thuộc
+      kích thước batch.
+    - ordered=True: trả kết quả đúng thứ tự đầu vào; False: chunk nào xong
+      trước trả trước (throughput cao hơn khi độ khó các đề chênh lệch).
+    - vectorized=True: mỗi chunk lan truyền bằng numpy, nên dùng chunksize
+      lớn (vài nghìn) để bù chi phí gọi numpy.
+    - timeout_ms / max_nodes: giới hạn cho từng đề (xem solve_chunk), để
+      vài đề bệnh hoạn không giữ worker mãi.
+    - cache_size > 0: mỗi worker giữ một SolutionCache cỡ này.
+    - store: process chính tra store trước (đề đã có lời giải không gửi cho
+      worker), lời giải mới của từng chunk được ghi bằng put_many() (một lần
+      commit / chunk, không phải / đề).
+    - engine="nxn": đề N×N (xem solve_chunk); vectorized và store chỉ cho
+      9×9 nên không dùng cùng được.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize phải >= 1.")
+    if get_engine(engine).nxn and (vectorized or store is not None):
+        raise ValueError(NXN_BATCH_ERROR)
+    workers = workers or os.cpu_count() or 1
+    from_files, items = iter_batch_items(path)
+    chunks = _chunks(items, chunksize)
+    options = (engine, vectorized, timeout_ms, max_nodes, cache_size)
+
+    if store is None:
+        run = solve_chunk
+        args = (from_files,) + options
+        jobs = ((chunk, None, chunk) for chunk in chunks)
+    else:
+        # Đề đã có trong store không gửi cho worker; đề còn lại đã là chuỗi
+        run = _solve_chunk_keep_solved
+        args = (False,) + options
+        jobs = ((chunk, *_lookup_chunk(chunk, from_files, store)) for chunk in chunks)
+
+    def collect(chunk, known, out) -> List[BatchResult]:
+        if store is None:
+            return out
+        results, solved = out if out is not None else ([], [])
+        store.put_many(solved)
+        return _merge(chunk, known, results)
+
+    if workers == 1:
+        for chunk, known, todo in jobs:
+            yield from collect(chunk, known, run(todo, *args) if todo else None)
+        return
+
+    max_pending = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if ordered:
+            queue: "deque[Tuple[List[BatchItem], Any, Optional[Future]]]" = deque()
+            for chunk, known, todo in jobs:
+                fut = pool.submit(run, todo, *args) if todo else None
+                queue.append((chunk, known, fut))
+                if len(queue) >= max_pending:
+                    chunk, known, fut = queue.popleft()
+                    yield from collect(chunk, known, fut.result() if fut else None)
+            while queue:
+                chunk, known, fut = queue.popleft()
+                yield from collect(chunk, known, fut.result() if fut else None)
+        else:
+            pending: Dict[Future, Tuple[List[BatchItem], Any]] = {}
+            for chunk, known, todo in jobs:
+                if not todo:
+                    yield from collect(chunk, known, None)
+                    continue
+                pending[pool.submit(run, todo, *args)] = (chunk, known)
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        yield from collect(*pending.pop(fut), fut.result())
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield from collect(*pending.pop(fut), fut.result())
@@ -0,0 +1,608 @@
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from sudoku_utils import Board
+from sudoku_stats import SolveStats
+
+
+class Geometry:
+    """
+    Bảng tra tính sẵn cho Sudoku n×n với khối box×box (n = box * box).
+    Tạo một lần cho mỗi kích thước (geometry() có cache), dùng chung cho
+    mọi solver cùng kích thước.
+    """
+
+    def __init__(self, box: int) -> None:
+        n = box * box
+        self.box = box
+        self.n = n
+        self.size = n * n
+        # Bit d (1..n) đại diện chữ số d, bit 0 không dùng; int Python không giới hạn số bit
+        self.digit_bits: List[int] = [1 << d for d in range(n + 1)]
+        self.full_mask = ((1 << n) - 1) << 1
+
+        self.row_of: List[int] = [i // n for i in range(self.size)]
+        self.col_of: List[int] = [i % n for i in range(self.size)]
+        self.box_of: List[int] = [
+            (i // n // box) * box + (i % n) // box for i in range(self.size)
+        ]
+        # n hàng, n cột, n khối (theo thứ tự đó)
+        self.units: List[List[int]] = (
+            [[r * n + c for c in range(n)] for r in range(n)]
+            + [[r * n + c for r in range(n)] for c in range(n)]
+            + [[i for i in range(self.size) if self.box_of[i] == b] for b in range(n)]
+        )
+        # 3 đơn vị (chỉ số trong units) chứa mỗi ô: hàng, n + cột, 2n + khối
+        self.units_of: List[Tuple[int, int, int]] = [
+            (self.row_of[i], n + self.col_of[i], 2 * n + self.box_of[i])
+            for i in range(self.size)
+        ]
+        # Các ô "láng giềng" (cùng hàng / cột / khối) của mỗi ô, tăng dần
+        self.peers: List[List[int]] = []
+        for i in range(self.size):
+            peers = set()
+            for u in self.units_of[i]:
+                peers.update(self.units[u])
+            peers.discard(i)
+            self.peers.append(sorted(peers))
+
+
+@lru_cache(maxsize=None)
+def geometry(box: int) -> Geometry:
+    return Geometry(box)
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+# Hằng số cho bảng 9×9 (dùng trực tiếp ở các engine / module chỉ làm 9×9)
+_G9 = geometry(3)
+DIGIT_BITS: List[int] = _G9.digit_bits
+FULL_MASK = _G9.full_mask
+
+# Chỉ số phẳng 0..80 -> hàng / cột / khối 3x3
+ROW_OF: List[int] = _G9.row_of
+COL_OF: List[int] = _G9.col_of
+BOX_OF: List[int] = _G9.box_of
+
+# 20 ô láng giềng của mỗi ô
+PEERS: List[List[int]] = _G9.peers
+
+# 27 đơn vị: 9 hàng, 9 cột, 9 khối 3x3 (theo thứ tự đó)
+UNITS: List[List[int]] = _G9.units
+
+# 3 đơn vị (chỉ số trong UNITS) chứa mỗi ô: hàng, 9 + cột, 18 + khối
+UNITS_OF: List[Tuple[int, int, int]] = _G9.units_of
+
+# Số bit bật của mọi mask 10 bit
+POPCOUNT: List[int] = [bin(m).count("1") for m in range(1 << 10)]
+
+BRANCHING_MODES = ("row", "mrv")
+
+
+class BitmaskSolver:
+    """
+    Engine Backtracking dùng bitmask cho từng hàng / cột / khối.
+    - rows[r], cols[c], boxes[b]: bit d bật <=> chữ số d đã có trong đơn vị đó.
+    - Đặt / gỡ số chỉ cập nhật 3 mask (O(1)), không quét lại bảng.
+    - Kiểm tra đặt số = 1 phép AND, tập ứng viên của ô = 1 phép OR.
+    Một instance có thể load() nhiều đề liên tiếp, không cần tạo lại.
+    box là cạnh khối (mặc định 3 = Sudoku 9×9); mọi bảng tra (đơn vị,
+    láng giềng, mask) lấy từ geometry(box), nên cùng một cài đặt MRV + lan
+    truyền phục vụ cả NxNSolver (16×16, 25×25, ...).
+
+    Chế độ rẽ nhánh:
+    - "row": chọn ô trống đầu tiên theo thứ tự hàng (giống find_empty).
+    - "mrv": chọn ô trống có ít ứng viên nhất (Minimum Remaining Values),
+      thất bại ngay khi có ô 0 ứng viên. Số ứng viên của từng ô được giữ
+      trong các "bucket" theo số lượng và cập nhật tăng dần khi đặt / gỡ số
+      (chỉ đụng tới các ô láng giềng), không quét lại cả bảng ở mỗi nút.
+
+    Lan truyền ràng buộc (propagate=True, đi kèm "mrv"): trước mỗi lần rẽ
+    nhánh, lặp điền naked single (ô chỉ còn 1 ứng viên) và hidden single
+    (chữ số chỉ còn 1 chỗ trong hàng / cột / khối). Các ô điền thêm được ghi
+    vào trail và gỡ lại theo thứ tự ngược khi quay lui. Hidden single chỉ
+    quét lại các đơn vị "bẩn" (hàng / cột / khối của ô vừa đặt và của mọi
+    láng giềng vừa mất ứng viên, xem _place_mrv), không quét mọi đơn vị ở
+    mỗi nút.
+    """
+
+    def __init__(self, box: int = 3) -> None:
+        g = geometry(box)
+        self.geo = g
+        self.n = g.n
+        self.cells: List[int] = [0] * g.size
+        self.rows: List[int] = [0] * g.n
+        self.cols: List[int] = [0] * g.n
+        self.boxes: List[int] = [0] * g.n
+        # Bộ nhớ tạm cho MRV / lan truyền, được xoá và dùng lại ở mỗi lần solve()
+        self.counts: List[int] = [0] * g.size
+        self.buckets: List[set] = [set() for _ in range(g.n + 1)]
+        self.trail: List[Tuple[int, int]] = []
+        self.propagate = False
+        # Hàng đợi đơn vị cần quét hidden single + cờ "đã trong hàng đợi"
+        self.dirty: List[int] = []
+        self.in_dirty = bytearray(3 * g.n)
+
+    def load(self, board: Board) -> bool:
+        """
+        Nạp đề vào engine.
+        Trả về False nếu đề ban đầu đã vi phạm luật (trùng số).
+        """
+        g = self.geo
+        n = self.n
+        if len(board) != n:
+            raise ValueError(f"Solver {n}×{n} không nhận bảng {len(board)} hàng.")
+        digit_bits = g.digit_bits
+        box_of = g.box_of
+        cells = self.cells
+        rows = self.rows
+        cols = self.cols
+        boxes = self.boxes
+        for k in range(n):
+            rows[k] = cols[k] = boxes[k] = 0
+
+        ok = True
+        for r in range(n):
+            row = board[r]
+            for c in range(n):
+                i = r * n + c
+                num = row[c]
+                cells[i] = num
+                if num == 0:
+                    continue
+                bit = digit_bits[num]
+                b = box_of[i]
+                if (rows[r] | cols[c] | boxes[b]) & bit:
+                    ok = False
+                rows[r] |= bit
+                cols[c] |= bit
+                boxes[b] |= bit
+        return ok
+
+    def candidates(self, i: int) -> int:
+        """Mask các chữ số còn đặt được tại ô i."""
+        g = self.geo
+        return g.full_mask & ~(
+            self.rows[g.row_of[i]] | self.cols[g.col_of[i]] | self.boxes[g.box_of[i]]
+        )
+
+    def can_place(self, i: int, num: int) -> bool:
+        g = self.geo
+        used = self.rows[g.row_of[i]] | self.cols[g.col_of[i]] | self.boxes[g.box_of[i]]
+        return not (used & g.digit_bits[num])
+
+    def place(self, i: int, num: int) -> None:
+        g = self.geo
+        bit = g.digit_bits[num]
+        self.cells[i] = num
+        self.rows[g.row_of[i]] |= bit
+        self.cols[g.col_of[i]] |= bit
+        self.boxes[g.box_of[i]] |= bit
+
+    def undo(self, i: int, num: int) -> None:
+        g = self.geo
+        bit = g.digit_bits[num]
+        self.cells[i] = 0
+        self.rows[g.row_of[i]] ^= bit
+        self.cols[g.col_of[i]] ^= bit
+        self.boxes[g.box_of[i]] ^= bit
+
+    def solve(self, branching: str = "mrv", propagate: bool = True) -> bool:
+        """
+        Backtracking, thử chữ số tăng dần tại mỗi ô.
+        Kết quả nằm trong self.cells.
+        """
+        if branching == "row":
+            if propagate:
+                raise ValueError("propagate chỉ dùng được với branching='mrv'.")
+            empties = [i for i in range(self.geo.size) if self.cells[i] == 0]
+            return self._search(empties, 0)
+        if branching == "mrv":
+            self._init_buckets()
+            self.propagate = propagate
+            self.trail.clear()
+            return self._search_mrv()
+        raise ValueError(f"Chế độ rẽ nhánh không hợp lệ: {branching}")
+
+    def _search(self, empties: List[int], k: int) -> bool:
+        if k == len(empties):
+            return True
+
+        g = self.geo
+        i = empties[k]
+        r = g.row_of[i]
+        c = g.col_of[i]
+        b = g.box_of[i]
+        rows = self.rows
+        cols = self.cols
+        boxes = self.boxes
+        cells = self.cells
+
+        cand = g.full_mask & ~(rows[r] | cols[c] | boxes[b])
+        while cand:
+            bit = cand & -cand
+            cand ^= bit
+
+            cells[i] = bit.bit_length() - 1
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+
+            if self._search(empties, k + 1):
+                return True
+
+            rows[r] ^= bit
+            cols[c] ^= bit
+            boxes[b] ^= bit
+        cells[i] = 0
+
+        return False
+
+    # ----- MRV -----
+
+    def _init_buckets(self) -> None:
+        """Tính số ứng viên ban đầu của các ô trống và xếp vào bucket."""
+        g = self.geo
+        popcount = POPCOUNT.__getitem__ if g.n == 9 else _popcount
+        cells = self.cells
+        counts = self.counts
+        buckets = self.buckets
+        for bucket in buckets:
+            bucket.clear()
+        for i in range(g.size):
+            if cells[i] == 0:
+                k = popcount(self.candidates(i))
+                counts[i] = k
+                buckets[k].add(i)
+        # Lần lan truyền đầu tiên xét mọi đơn vị
+        self.dirty[:] = range(3 * g.n)
+        self.in_dirty[:] = b"\x01" * (3 * g.n)
+
+    def _place_mrv(self, i: int, bit: int) -> None:
+        """Đặt số tại ô i và giảm số ứng viên của các láng giềng mất chữ số đó."""
+        g = self.geo
+        row_of = g.row_of
+        col_of = g.col_of
+        box_of = g.box_of
+        units_of = g.units_of
+        cells = self.cells
+        rows = self.rows
+        cols = self.cols
+        boxes = self.boxes
+        counts = self.counts
+        buckets = self.buckets
+        propagate = self.propagate
+        dirty = self.dirty
+        in_dirty = self.in_dirty
+
+        buckets[counts[i]].discard(i)
+        for p in g.peers[i]:
+            if cells[p] == 0 and not (
+                (rows[row_of[p]] | cols[col_of[p]] | boxes[box_of[p]]) & bit
+            ):
+                k = counts[p]
+                buckets[k].discard(p)
+                buckets[k - 1].add(p)
+                counts[p] = k - 1
+                if propagate:
+                    # p mất chữ số này: có thể sinh hidden single ở cả 3 đơn vị của p
+                    for u in units_of[p]:
+                        if not in_dirty[u]:
+                            in_dirty[u] = 1
+                            dirty.append(u)
+
+        cells[i] = bit.bit_length() - 1
+        rows[row_of[i]] |= bit
+        cols[col_of[i]] |= bit
+        boxes[box_of[i]] |= bit
+
+        if propagate:
+            # Ô i hết là ứng viên của các chữ số khác trong 3 đơn vị của nó
+            for u in units_of[i]:
+                if not in_dirty[u]:
+                    in_dirty[u] = 1
+                    dirty.append(u)
+
+    def _undo_mrv(self, i: int, bit: int) -> None:
+        """Gỡ số tại ô i, trả lại ứng viên cho các láng giềng (thứ tự ngược _place_mrv)."""
+        g = self.geo
+        row_of = g.row_of
+        col_of = g.col_of
+        box_of = g.box_of
+        cells = self.cells
+        rows = self.rows
+        cols = self.cols
+        boxes = self.boxes
+        counts = self.counts
+        buckets = self.buckets
+
+        cells[i] = 0
+        rows[row_of[i]] ^= bit
+        cols[col_of[i]] ^= bit
+        boxes[box_of[i]] ^= bit
+
+        for p in g.peers[i]:
+            if cells[p] == 0 and not (
+                (rows[row_of[p]] | cols[col_of[p]] | boxes[box_of[p]]) & bit
+            ):
+                k = counts[p]
+                buckets[k].discard(p)
+                buckets[k + 1].add(p)
+                counts[p] = k + 1
+        buckets[counts[i]].add(i)
+
+    def _pick_mrv(self) -> int:
+        """
+        Ô trống có ít ứng viên nhất.
+        Trả về -1 nếu không còn ô trống, -2 nếu có ô không còn ứng viên nào.
+        """
+        buckets = self.buckets
+        if buckets[0]:
+            return -2
+        for k in range(1, self.n + 1):
+            if buckets[k]:
+                return next(iter(buckets[k]))
+        return -1
+
+    def _search_mrv(self) -> bool:
+        mark = len(self.trail)
+        if self.propagate and not self._propagate():
+            self._undo_trail(mark)
+            return False
+
+        i = self._pick_mrv()
+        if i == -1:
+            return True
+
+        if i != -2:
+            cand = self.candidates(i)
+            while cand:
+                bit = cand & -cand
+                cand ^= bit
+                self._place_mrv(i, bit)
+                if self._search_mrv():
+                    return True
+                self._undo_mrv(i, bit)
+
+        self._undo_trail(mark)
+        return False
+
+    # ----- Đếm lời giải -----
+
+    def count(self, limit: int = 2, propagate: bool = True) -> int:
+        """
+        Đếm số lời giải (MRV + lan truyền), dừng ngay khi đạt limit.
+        Lời giải đầu tiên lưu ở self.solution (list n*n ô); sau khi đếm,
+        self.cells trở về đúng trạng thái vừa load().
+        """
+        self._init_buckets()
+        self.propagate = propagate
+        self.trail.clear()
+        self.solution: Optional[List[int]] = None
+        self._found = 0
+        self._limit = limit
+        self._count_mrv()
+        return self._found
+
+    def _count_mrv(self) -> bool:
+        """Trả về True khi đã đủ limit lời giải (dừng sớm)."""
+        mark = len(self.trail)
+        if self.propagate and not self._propagate():
+            self._undo_trail(mark)
+            return False
+
+        i = self._pick_mrv()
+        if i == -1:
+            if self._found == 0:
+                self.solution = self.cells[:]
+            self._found += 1
+            self._undo_trail(mark)
+            return self._found >= self._limit
+
+        stop = False
+        if i != -2:
+            cand = self.candidates(i)
+            while cand:
+                bit = cand & -cand
+                cand ^= bit
+                self._place_mrv(i, bit)
+                stop = self._count_mrv()
+                self._undo_mrv(i, bit)
+                if stop:
+                    break
+
+        self._undo_trail(mark)
+        return stop
+
+    # ----- Lan truyền ràng buộc -----
+
+    def _assign(self, i: int, bit: int) -> None:
+        self._place_mrv(i, bit)
+        self.trail.append((i, bit))
+
+    def _undo_trail(self, mark: int) -> None:
+        """Gỡ các ô do lan truyền điền thêm, về lại độ dài trail = mark."""
+        trail = self.trail
+        while len(trail) > mark:
+            i, bit = trail.pop()
+            self._undo_mrv(i, bit)
+
+    def _propagate(self) -> bool:
+        """
+        Lặp naked single + hidden single (trên các đơn vị bẩn) tới khi không
+        điền thêm được ô nào. Trả về False nếu phát hiện mâu thuẫn (ô hết
+        ứng viên, hoặc chữ số không còn chỗ đặt trong một đơn vị).
+        """
+        g = self.geo
+        n = self.n
+        full = g.full_mask
+        row_of = g.row_of
+        col_of = g.col_of
+        box_of = g.box_of
+        units = g.units
+        cells = self.cells
+        rows = self.rows
+        cols = self.cols
+        boxes = self.boxes
+        buckets = self.buckets
+        dirty = self.dirty
+        in_dirty = self.in_dirty
+        unit_masks = (rows, cols, boxes)
+
+        while True:
+            # Naked single
+            while buckets[1]:
+                i = next(iter(buckets[1]))
+                self._assign(i, self.candidates(i))
+                if buckets[0]:
+                    return self._clear_dirty()
+
+            if not dirty:
+                return True
+
+            # Hidden single trên một đơn vị bẩn
+            u = dirty.pop()
+            in_dirty[u] = 0
+            used = unit_masks[u // n][u % n]
+            if used == full:
+                continue
+
+            unit = units[u]
+            seen1 = seen2 = 0
+            for j in unit:
+                if cells[j] == 0:
+                    cand = full & ~(rows[row_of[j]] | cols[col_of[j]] | boxes[box_of[j]])
+                    seen2 |= seen1 & cand
+                    seen1 |= cand
+            if (seen1 | used) != full:
+                return self._clear_dirty()
+
+            hidden = seen1 & ~seen2
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                for j in unit:
+                    if cells[j] == 0 and self.candidates(j) & bit:
+                        self._assign(j, bit)
+                        break
+                else:
+                    # Ô duy nhất của chữ số này vừa bị lấp bởi hidden single khác
+                    return self._clear_dirty()
+
+            if buckets[0]:
+                return self._clear_dirty()
+
+    def _clear_dirty(self) -> bool:
+        """Bỏ hàng đợi đơn vị bẩn khi lan truyền thất bại; luôn trả về False."""
+        for u in self.dirty:
+            self.in_dirty[u] = 0
+        self.dirty.clear()
+        return False
+
+    def export(self, board: Board) -> None:
+        """Ghi trạng thái hiện tại của engine ngược vào board (List[List[int]])."""
+        n = self.n
+        cells = self.cells
+        for r in range(n):
+            row = board[r]
+            base = r * n
+            for c in range(n):
+                row[c] = cells[base + c]
+
+
+class InstrumentedBitmaskSolver(BitmaskSolver):
+    """
+    BitmaskSolver có đếm vào self.stats (SolveStats) và, nếu self.budget
+    (sudoku_budget.Budget) khác None, gọi budget.tick() ở mỗi nút để dừng
+    theo deadline / số nút / huỷ. Chỉ dùng khi cần: các hàm tìm kiếm / đặt /
+    gỡ được bọc lại ở lớp con này nên BitmaskSolver gốc không phải kiểm tra
+    cờ nào trong vòng lặp nóng.
+    """
+
+    def __init__(self, box: int = 3) -> None:
+        super().__init__(box)
+        self.stats = SolveStats()
+        self.budget = None
+        self._live = 0
+
+    def solve(self, branching: str = "mrv", propagate: bool = True) -> bool:
+        stats = self.stats
+        n_empty = self.cells.count(0)
+        nodes = stats.nodes
+        self._live = stats.placements - stats.undos
+        solved = super().solve(branching, propagate)
+        if branching == "row":
+            # _search đặt / gỡ inline: mỗi nút (trừ gốc) đi sau đúng một lần đặt,
+            # mọi lần đặt không nằm trên đường tới lời giải đều đã được gỡ.
+            placed = stats.nodes - nodes - 1
+            stats.placements += placed
+            stats.undos += placed - (n_empty if solved else 0)
+            stats.backtracks += placed - (n_empty if solved else 0)
+        return solved
+
+    def count(self, limit: int = 2, propagate: bool = True) -> int:
+        self._live = self.stats.placements - self.stats.undos
+        return super().count(limit, propagate)
+
+    def _search(self, empties: List[int], k: int) -> bool:
+        stats = self.stats
+        stats.nodes += 1
+        stats.depth = k
+        if k > stats.max_depth:
+            stats.max_depth = k
+        if self.budget is not None:
+            self.budget.tick()
+        return super()._search(empties, k)
+
+    def _branch_depth(self) -> int:
+        # Số ô đang đặt do tìm kiếm, trừ các ô do lan truyền (nằm trong trail)
+        stats = self.stats
+        return stats.placements - stats.undos - self._live - len(self.trail)
+
+    def _pick_mrv(self) -> int:
+        stats = self.stats
+        stats.nodes += 1
+        depth = stats.depth = self._branch_depth()
+        if depth > stats.max_depth:
+            stats.max_depth = depth
+        if self.budget is not None:
+            self.budget.tick()
+        return super()._pick_mrv()
+
+    def _place_mrv(self, i: int, bit: int) -> None:
+        self.stats.placements += 1
+        super()._place_mrv(i, bit)
+
+    def _undo_mrv(self, i: int, bit: int) -> None:
+        stats = self.stats
+        stats.undos += 1
+        stats.backtracks += 1
+        super()._undo_mrv(i, bit)
+
+    def _undo_trail(self, mark: int) -> None:
+        # Ô do lan truyền cũng gỡ qua _undo_mrv nhưng không phải quay lui
+        self.stats.backtracks -= max(0, len(self.trail) - mark)
+        super()._undo_trail(mark)
+
+    def _propagate(self) -> bool:
+        self.stats.propagations += 1
+        return super()._propagate()
+
+
+def solve_sudoku_bitmask(
+    board: Board, branching: str = "mrv", propagate: bool = True
+) -> bool:
+    """
+    Giải Sudoku bằng engine bitmask, ghi lời giải vào board nếu giải được.
+    branching: "mrv" (mặc định) hoặc "row" (thứ tự hàng như find_empty).
+    propagate: điền naked / hidden single trước mỗi lần rẽ nhánh (chỉ với "mrv").
+    """
+    solver = BitmaskSolver()
+    if not solver.load(board):
+        return False
+    if not solver.solve(branching, propagate and branching == "mrv"):
+        return False
+    solver.export(board)
+    return True
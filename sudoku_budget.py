@@ -0,0 +1,129 @@
+import threading
+import time
+from enum import Enum
+from typing import Callable, Optional
+
+
+class SolveStatus(Enum):
+    """
+    Kết quả của một lần giải (SolveResult.status). bool(status) chỉ True
+    với SOLVED, nên `if solve(board).status:` đọc như True / False.
+    """
+
+    SOLVED = "SOLVED"
+    NO_SOLUTION = "NO_SOLUTION"
+    TIMEOUT = "TIMEOUT"  # quá deadline (timeout_ms)
+    BUDGET_EXHAUSTED = "BUDGET_EXHAUSTED"  # quá số nút cho phép (max_nodes)
+    CANCELLED = "CANCELLED"  # bị huỷ qua CancelToken
+
+    def __bool__(self) -> bool:
+        return self is SolveStatus.SOLVED
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class CancelToken:
+    """
+    Cờ huỷ dùng chung giữa luồng gọi và luồng đang giải: cancel() từ bất kỳ
+    thread nào, engine thấy ở lần kiểm tra kế tiếp. Budget chỉ cần is_set(),
+    nên threading.Event / multiprocessing.Event cũng dùng thay được.
+    """
+
+    __slots__ = ("_event",)
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def is_set(self) -> bool:
+        return self._event.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class SolveInterrupted(Exception):
+    """Engine dừng giữa chừng vì Budget; status là lý do dừng."""
+
+    def __init__(self, status: SolveStatus) -> None:
+        super().__init__(status.value)
+        self.status = status
+
+
+class Budget:
+    """
+    Giới hạn cho một lần giải: deadline (timeout_ms), số nút tối đa
+    (max_nodes) và CancelToken. Engine gọi tick() ở mỗi nút; tick() chỉ
+    tăng bộ đếm và so sánh một số nguyên, còn check() (đọc đồng hồ, xem cờ
+    huỷ) chỉ chạy mỗi check_every nút, nên chi phí trong vòng lặp nóng gần
+    như không đáng kể. max_nodes vẫn được áp đúng: lần kiểm tra kế tiếp
+    không bao giờ vượt quá max_nodes.
+    progress(budget), nếu có, được gọi ở cuối mỗi check() để báo tiến độ
+    (budget.nodes, budget.stats nếu solve() có thu SolveStats).
+    """
+
+    __slots__ = (
+        "timeout_ms",
+        "max_nodes",
+        "cancel",
+        "check_every",
+        "progress",
+        "stats",
+        "nodes",
+        "_next_check",
+        "_deadline",
+    )
+
+    def __init__(
+        self,
+        timeout_ms: Optional[float] = None,
+        max_nodes: Optional[int] = None,
+        cancel=None,
+        progress: Optional[Callable[["Budget"], None]] = None,
+        check_every: int = 256,
+    ) -> None:
+        if check_every < 1:
+            raise ValueError("check_every phải >= 1.")
+        self.timeout_ms = timeout_ms
+        self.max_nodes = max_nodes
+        self.cancel = cancel
+        self.check_every = check_every
+        self.progress = progress
+        self.stats = None
+        self.nodes = 0
+        self._next_check = 0
+        self._deadline: Optional[float] = None
+
+    def start(self) -> None:
+        """Bắt đầu tính giờ / đếm nút (gọi ngay trước khi giải)."""
+        self.nodes = 0
+        self._deadline = (
+            time.perf_counter() + self.timeout_ms / 1000.0
+            if self.timeout_ms is not None
+            else None
+        )
+        self.check()
+
+    def tick(self) -> None:
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            self.check()
+
+    def check(self) -> None:
+        """Raise SolveInterrupted nếu đã bị huỷ / hết giờ / hết số nút."""
+        if self.cancel is not None and self.cancel.is_set():
+            raise SolveInterrupted(SolveStatus.CANCELLED)
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise SolveInterrupted(SolveStatus.BUDGET_EXHAUSTED)
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SolveInterrupted(SolveStatus.TIMEOUT)
+
+        self._next_check = self.nodes + self.check_every
+        if self.max_nodes is not None:
+            self._next_check = min(self._next_check, self.max_nodes + 1)
+        if self.progress is not None:
+            self.progress(self)
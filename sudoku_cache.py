@@ -0,0 +1,323 @@
+import time
+from collections import OrderedDict
+from itertools import permutations, product
+from math import factorial
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sudoku_utils import AnyBoard, Board
+from sudoku_solver import DEFAULT_ENGINE, SolveResult, SolveStatus, solve
+from sudoku_stats import SolveStats
+
+# Phép biến đổi đối xứng: (chuyển vị?, thứ tự hàng, thứ tự cột, relabel)
+# canonical[r][c] = relabel[src[rows[r]][cols[c]]], src = board (hoặc chuyển vị)
+# relabel: list 10 phần tử, chữ số gốc -> chữ số chuẩn (relabel[0] = 0)
+Transform = Tuple[bool, Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]
+
+# Quá ngưỡng này (đề quá "đối xứng", vd. gần rỗng) thì bỏ qua chuẩn hoá
+MAX_CANDIDATES = 512
+
+
+def _group_orders(keys: Sequence[tuple], members: Sequence[int]) -> Tuple[List[List[int]], int]:
+    """
+    Sắp xếp members theo key giảm dần; các phần tử cùng key (hoà) được
+    liệt kê đủ mọi hoán vị. Trả về (các thứ tự có thể, số lượng).
+    """
+    ordered = sorted(members, key=lambda m: keys[m], reverse=True)
+    groups: List[List[int]] = []
+    for m in ordered:
+        if groups and keys[groups[-1][0]] == keys[m]:
+            groups[-1].append(m)
+        else:
+            groups.append([m])
+    count = 1
+    for g in groups:
+        count *= factorial(len(g))
+    orders = [
+        [m for part in choice for m in part]
+        for choice in product(*(permutations(g) for g in groups))
+    ] if count <= MAX_CANDIDATES else []
+    return orders, count
+
+
+def _line_orders(grid: List[List[int]]) -> Tuple[List[List[int]], int]:
+    """
+    Các thứ tự hàng (hoán vị band + hàng trong band) còn lại sau khi sắp
+    theo bất biến đối xứng:
+    - hàng: số ô có số, số ô có số theo từng stack (đã sắp), và multiset
+      số ô có số của các cột mà hàng đó có số,
+    - band: key các hàng của nó đã sắp.
+    Các bất biến này không đổi khi hoán vị cột / đổi nhãn chữ số, nên đề
+    tương đương luôn cho cùng tập ứng viên.
+    """
+    col_count = [sum(1 for r in range(9) if grid[r][c]) for c in range(9)]
+    row_keys = []
+    for r in range(9):
+        per_stack = sorted(
+            (sum(1 for c in range(s, s + 3) if grid[r][c]) for s in (0, 3, 6)),
+            reverse=True,
+        )
+        cols_hit = tuple(sorted((col_count[c] for c in range(9) if grid[r][c]), reverse=True))
+        row_keys.append((sum(per_stack), tuple(per_stack), cols_hit))
+    band_keys = [
+        tuple(sorted((row_keys[r] for r in range(b * 3, b * 3 + 3)), reverse=True))
+        for b in range(3)
+    ]
+
+    band_orders, total = _group_orders(band_keys, range(3))
+    inner: List[Tuple[List[List[int]], int]] = []
+    for b in range(3):
+        orders, count = _group_orders(row_keys, range(b * 3, b * 3 + 3))
+        inner.append((orders, count))
+        total *= count
+    if total > MAX_CANDIDATES:
+        return [], total
+
+    result = []
+    for band_order in band_orders:
+        for rows in product(*(inner[b][0] for b in band_order)):
+            result.append([r for part in rows for r in part])
+    return result, total
+
+
+def _transpose(grid: List[List[int]]) -> List[List[int]]:
+    return [list(col) for col in zip(*grid)]
+
+
+def _apply(src: List[List[int]], rows: Sequence[int], cols: Sequence[int]) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Hoán vị rồi đổi nhãn theo thứ tự xuất hiện. Trả về (grid phẳng, relabel)."""
+    relabel = [0] * 10
+    nxt = 1
+    out = []
+    for r in rows:
+        row = src[r]
+        for c in cols:
+            v = row[c]
+            if v and not relabel[v]:
+                relabel[v] = nxt
+                nxt += 1
+            out.append(relabel[v])
+    # Chữ số không có trong đề: gán nhãn còn lại theo thứ tự tăng dần
+    for d in range(1, 10):
+        if not relabel[d]:
+            relabel[d] = nxt
+            nxt += 1
+    return tuple(out), tuple(relabel)
+
+
+def canonical_form(board: AnyBoard) -> Tuple[bytes, Optional[Transform]]:
+    """
+    Dạng chuẩn của đề dưới các phép đối xứng Sudoku: đổi nhãn chữ số,
+    hoán vị hàng trong band / cột trong stack, hoán vị band / stack,
+    chuyển vị. Lấy grid nhỏ nhất (theo thứ tự từ điển) trong tập ứng viên.
+    Trả về (key, transform); transform None nếu đề quá đối xứng để chuẩn hoá
+    trong ngân sách (khi đó key là chính đề, vẫn đúng nhưng không gộp được).
+    """
+    grid = [list(row) for row in board]
+    best: Optional[Tuple[Tuple[int, ...], Transform]] = None
+
+    for transposed in (False, True):
+        src = _transpose(grid) if transposed else grid
+        row_orders, n_rows = _line_orders(src)
+        col_orders, n_cols = _line_orders(_transpose(src))
+        if n_rows * n_cols > MAX_CANDIDATES:
+            return b"R" + bytes(v for row in grid for v in row), None
+        for rows in row_orders:
+            for cols in col_orders:
+                flat, relabel = _apply(src, rows, cols)
+                if best is None or flat < best[0]:
+                    best = (flat, (transposed, tuple(rows), tuple(cols), relabel))
+
+    flat, transform = best
+    return b"C" + bytes(flat), transform
+
+
+def to_canonical(board: Board, transform: Transform) -> bytes:
+    """Đưa một grid (vd. lời giải) sang khung chuẩn của transform."""
+    transposed, rows, cols, relabel = transform
+    src = _transpose(board) if transposed else board
+    return bytes(relabel[src[r][c]] for r in rows for c in cols)
+
+
+def from_canonical(flat: bytes, transform: Transform) -> Board:
+    """Ngược lại của to_canonical: grid phẳng khung chuẩn -> Board gốc."""
+    transposed, rows, cols, relabel = transform
+    inverse = [0] * 10
+    for d in range(10):
+        inverse[relabel[d]] = d
+    src = [[0] * 9 for _ in range(9)]
+    k = 0
+    for r in rows:
+        for c in cols:
+            src[r][c] = inverse[flat[k]]
+            k += 1
+    return _transpose(src) if transposed else src
+
+
+# (key tầng 1, canonical key, transform) của một đề, xem SolutionCache.lookup()
+CacheSlot = Tuple[bytes, Optional[bytes], Optional[Transform]]
+
+
+class SolutionCache:
+    """
+    Cache lời giải đặt trước solve(), gộp các đề tương đương qua đối xứng.
+    Dùng qua solve(board, cache=...) / solve_file(..., cache=...) (CLI:
+    --cache), hoặc get() / put() khi việc giải chạy ở nơi khác (GUI).
+    - Tầng 1: key = đúng nội dung đề (đề lặp lại y hệt tốn vài micro giây).
+    - Tầng 2: key = canonical_form(); lời giải lưu ở khung chuẩn rồi map
+      ngược qua transform của từng đề.
+    - Mỗi tầng giới hạn maxsize mục, bỏ mục ít dùng gần đây nhất (LRU).
+    - Cache cả kết quả vô nghiệm (lưu None).
+    """
+
+    def __init__(self, maxsize: int = 4096, engine: str = DEFAULT_ENGINE) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize phải >= 1.")
+        self.maxsize = maxsize
+        self.engine = engine
+        self._exact: "OrderedDict[bytes, Optional[Board]]" = OrderedDict()
+        self._canonical: "OrderedDict[bytes, Optional[bytes]]" = OrderedDict()
+        self.hits = 0
+        self.canonical_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def solve(
+        self,
+        board: AnyBoard,
+        engine: Optional[str] = None,
+        limit: int = 1,
+        stats: bool = False,
+        collect_stats: bool = False,
+        timeout_ms: Optional[float] = None,
+        max_nodes: Optional[int] = None,
+        cancel=None,
+        progress=None,
+        **kwargs: Any,
+    ) -> SolveResult:
+        """
+        Như sudoku_solver.solve() (cùng tham số, kể cả store / options của
+        engine), có tra / ghi cache. Không sửa board.
+        - Bỏ qua cache (gọi thẳng solve()) khi limit != 1, bảng khác 9×9
+          hoặc có timeout_ms / max_nodes / cancel / progress: kết quả bị
+          ngắt giữa chừng không được cache.
+        - collect_stats=True: result.stats có cache_hits = 1 khi trúng cache.
+        """
+        engine = engine or self.engine
+        limits = (timeout_ms, max_nodes, cancel, progress)
+        if limit != 1 or len(board) != 9 or limits != (None, None, None, None):
+            return solve(
+                board,
+                engine=engine,
+                limit=limit,
+                stats=stats,
+                collect_stats=collect_stats,
+                timeout_ms=timeout_ms,
+                max_nodes=max_nodes,
+                cancel=cancel,
+                progress=progress,
+                **kwargs,
+            )
+
+        start = time.perf_counter() if stats or collect_stats else 0.0
+        cached, slot = self.lookup(board, engine, collect_stats)
+        if cached is not None:
+            if stats or collect_stats:
+                cached.elapsed_ms = (time.perf_counter() - start) * 1000.0
+            return cached
+
+        result = solve(board, engine=engine, stats=stats, collect_stats=collect_stats, **kwargs)
+        self.put(board, result, slot)
+        return result
+
+    def get(
+        self, board: AnyBoard, engine: Optional[str] = None, collect_stats: bool = False
+    ) -> Optional[SolveResult]:
+        """Chỉ tra cache (không giải); None nếu chưa có."""
+        return self.lookup(board, engine, collect_stats)[0]
+
+    def lookup(
+        self, board: AnyBoard, engine: Optional[str] = None, collect_stats: bool = False
+    ) -> Tuple[Optional[SolveResult], CacheSlot]:
+        """
+        Như get(), kèm slot = (key tầng 1, canonical key, transform) đã tính
+        để put(board, result, slot) sau khi giải không phải gọi lại
+        canonical_form() (đắt hơn cả một lần giải bitmask).
+        """
+        raw = bytes(v for row in board for v in row)
+        engine = engine or self.engine
+
+        if raw in self._exact:
+            self._exact.move_to_end(raw)
+            self.hits += 1
+            return self._result(engine, self._exact[raw], collect_stats), (raw, None, None)
+
+        key, transform = canonical_form(board)
+        slot = (raw, key, transform)
+        if transform is not None and key in self._canonical:
+            self._canonical.move_to_end(key)
+            self.canonical_hits += 1
+            flat = self._canonical[key]
+            solution = None if flat is None else from_canonical(flat, transform)
+            self._put(self._exact, raw, solution)
+            return self._result(engine, solution, collect_stats), slot
+
+        self.misses += 1
+        return None, slot
+
+    def put(self, board: AnyBoard, result: SolveResult, slot: Optional[CacheSlot] = None) -> None:
+        """
+        Ghi kết quả của một lần giải; chỉ nhận SOLVED / NO_SOLUTION.
+        Lưu bản sao của result.board: người gọi sửa board trả về không làm
+        hỏng cache. slot của một lần trúng tầng 1 (canonical key None) nghĩa
+        là kết quả đã có sẵn trong cache: không ghi lại, không tính
+        canonical_form().
+        """
+        if result.status not in (SolveStatus.SOLVED, SolveStatus.NO_SOLUTION):
+            return
+        if slot is None:
+            key, transform = canonical_form(board)
+            raw = bytes(v for row in board for v in row)
+        elif slot[1] is None:
+            return
+        else:
+            raw, key, transform = slot
+        solution = None if result.board is None else [row[:] for row in result.board]
+        self._put(self._exact, raw, solution)
+        if transform is not None:
+            flat = None if solution is None else to_canonical(solution, transform)
+            self._put(self._canonical, key, flat)
+
+    def _result(
+        self, engine: str, solution: Optional[Board], collect_stats: bool = False
+    ) -> SolveResult:
+        stats = None
+        if collect_stats:
+            stats = SolveStats()
+            stats.cache_hits = 1
+        if solution is None:
+            return SolveResult(engine, 0, None, stats=stats)
+        return SolveResult(engine, 1, [row[:] for row in solution], stats=stats)
+
+    def _put(self, store: OrderedDict, key: bytes, value) -> None:
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > self.maxsize:
+            store.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "canonical_hits": self.canonical_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._exact) + len(self._canonical),
+        }
+
+    def clear(self) -> None:
+        self._exact.clear()
+        self._canonical.clear()
+
+    def solve_many(self, boards, **kwargs: Any) -> Iterator[SolveResult]:
+        for board in boards:
+            yield self.solve(board, **kwargs)
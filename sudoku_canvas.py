@@ -0,0 +1,201 @@
+import tkinter as tk
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+from sudoku_utils import Board
+
+
+class CanvasGrid:
+    """
+    Lưới 9×9 vẽ trên một tk.Canvas duy nhất thay cho 81 tk.Entry:
+    - Mỗi ô có một hình chữ nhật (nền + viền) và một text (chữ số); 9 text
+      ghi chú (pencil mark) chỉ được tạo khi ô có ghi chú lần đầu.
+    - set_value / set_style / set_pencil chỉ đổi dữ liệu và đánh dấu ô bẩn;
+      mọi thay đổi trong cùng một lượt sự kiện được vẽ một lần ở after_idle,
+      và chỉ itemconfig các ô bẩn (dirty region theo ô).
+    - reset_styles / fill_bg đổi cả lưới bằng một lệnh itemconfig theo tag
+      thay vì lặp 81 widget trong Python.
+    Không tự xử lý bàn phím / chuột: GUI bind trên self.canvas, dùng cell_at.
+    """
+
+    def __init__(
+        self,
+        parent: tk.Misc,
+        cell: int,
+        thin: int,
+        thick: int,
+        font,
+        pencil_font,
+        bg: str,
+        cell_bg: str,
+        cell_fg: str,
+        border: str,
+        pencil_fg: str,
+    ) -> None:
+        self.cell = cell
+        self.default_style = (cell_bg, cell_fg, border)
+        self.pencil_fg = pencil_fg
+        self.pencil_font = pencil_font
+
+        # Toạ độ góc trên-trái của từng hàng / cột: khe mỏng giữa các ô,
+        # khe dày giữa các khối 3×3 (giống padding của lưới Entry cũ)
+        self.starts: List[int] = []
+        pos = thick
+        for k in range(9):
+            self.starts.append(pos)
+            pos += cell + (thick + thin if k % 3 == 2 else 2 * thin)
+        size = pos - thin
+
+        self.canvas = tk.Canvas(
+            parent,
+            width=size,
+            height=size,
+            bg=bg,
+            highlightthickness=0,
+            bd=0,
+            takefocus=1,
+        )
+
+        self.values = bytearray(81)
+        self.pencil: List[int] = [0] * 81  # mask bit d = ghi chú chữ số d
+        self.styles: List[Tuple[str, str, str]] = [self.default_style] * 81
+        self._rects: List[int] = []
+        self._texts: List[int] = []
+        self._pencil_items: List[Optional[List[int]]] = [None] * 81
+        self._dirty: set = set()
+        self._flush_pending = False
+
+        half = cell // 2
+        for i in range(81):
+            x, y = self.starts[i % 9], self.starts[i // 9]
+            self._rects.append(
+                self.canvas.create_rectangle(
+                    x, y, x + cell, y + cell,
+                    fill=cell_bg, outline=border, width=1, tags=("cell",),
+                )
+            )
+            self._texts.append(
+                self.canvas.create_text(
+                    x + half, y + half, text="", font=font, fill=cell_fg, tags=("value",)
+                )
+            )
+
+    # ----- Dữ liệu -----
+
+    def get_value(self, r: int, c: int) -> int:
+        return self.values[r * 9 + c]
+
+    def set_value(self, r: int, c: int, num: int) -> None:
+        i = r * 9 + c
+        if self.values[i] != num:
+            self.values[i] = num
+            self._mark(i)
+
+    def board(self) -> Board:
+        values = self.values
+        return [list(values[r * 9:r * 9 + 9]) for r in range(9)]
+
+    def set_board(self, board: Board) -> None:
+        for r in range(9):
+            for c in range(9):
+                self.set_value(r, c, board[r][c])
+
+    def get_pencil(self, r: int, c: int) -> int:
+        return self.pencil[r * 9 + c]
+
+    def set_pencil(self, r: int, c: int, mask: int) -> None:
+        """Ghi chú của ô: mask bit d (1..9); chỉ hiện khi ô đang trống."""
+        i = r * 9 + c
+        if self.pencil[i] != mask:
+            self.pencil[i] = mask
+            self._mark(i)
+
+    def clear_pencil(self) -> None:
+        for i in range(81):
+            if self.pencil[i]:
+                self.pencil[i] = 0
+                self._mark(i)
+
+    # ----- Màu -----
+
+    def set_style(
+        self,
+        r: int,
+        c: int,
+        bg: Optional[str] = None,
+        fg: Optional[str] = None,
+        border: Optional[str] = None,
+    ) -> None:
+        """Đổi màu nền / chữ / viền của một ô (None = giữ nguyên)."""
+        i = r * 9 + c
+        old = self.styles[i]
+        new = (bg or old[0], fg or old[1], border or old[2])
+        if new != old:
+            self.styles[i] = new
+            self._mark(i)
+
+    def reset_styles(self) -> None:
+        """Trả mọi ô về màu mặc định bằng 3 lệnh itemconfig theo tag."""
+        cell_bg, cell_fg, border = self.default_style
+        self.styles = [self.default_style] * 81
+        self.canvas.itemconfig("cell", fill=cell_bg, outline=border)
+        self.canvas.itemconfig("value", fill=cell_fg)
+
+    def fill_bg(self, color: str) -> None:
+        """Tô nền cả lưới (hiệu ứng flash), không đổi self.styles."""
+        self.canvas.itemconfig("cell", fill=color)
+
+    # ----- Chuột -----
+
+    def cell_at(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """Ô chứa điểm (x, y) trên canvas, None nếu rơi vào khe giữa các ô."""
+        c = bisect_right(self.starts, x) - 1
+        r = bisect_right(self.starts, y) - 1
+        if r < 0 or c < 0:
+            return None
+        if x >= self.starts[c] + self.cell or y >= self.starts[r] + self.cell:
+            return None
+        return r, c
+
+    # ----- Vẽ lại -----
+
+    def _mark(self, i: int) -> None:
+        self._dirty.add(i)
+        if not self._flush_pending:
+            self._flush_pending = True
+            self.canvas.after_idle(self.flush)
+
+    def flush(self) -> None:
+        """Vẽ lại các ô bẩn (tự gọi ở after_idle; gọi tay nếu cần vẽ ngay)."""
+        self._flush_pending = False
+        dirty, self._dirty = self._dirty, set()
+        canvas = self.canvas
+        for i in dirty:
+            bg, fg, border = self.styles[i]
+            num = self.values[i]
+            canvas.itemconfig(self._rects[i], fill=bg, outline=border)
+            canvas.itemconfig(self._texts[i], text=str(num) if num else "", fill=fg)
+
+            mask = self.pencil[i] if num == 0 else 0
+            items = self._pencil_items[i]
+            if items is None:
+                if not mask:
+                    continue
+                items = self._pencil_items[i] = self._create_pencil(i)
+            for d in range(1, 10):
+                canvas.itemconfig(items[d - 1], text=str(d) if mask >> d & 1 else "")
+
+    def _create_pencil(self, i: int) -> List[int]:
+        x, y = self.starts[i % 9], self.starts[i // 9]
+        third = self.cell / 3
+        return [
+            self.canvas.create_text(
+                x + third * (k % 3 + 0.5),
+                y + third * (k // 3 + 0.5),
+                text="",
+                font=self.pencil_font,
+                fill=self.pencil_fg,
+                tags=("pencil",),
+            )
+            for k in range(9)
+        ]
@@ -0,0 +1,304 @@
+from typing import List, Optional
+
+from sudoku_utils import Board
+from sudoku_budget import SolveInterrupted
+from sudoku_stats import SolveStats
+
+# Ma trận exact cover của Sudoku 9x9:
+# - 729 hàng: mỗi ứng viên (ô i, chữ số d).
+# - 324 cột ràng buộc:
+#     [0, 81)    ô i đã có số
+#     [81, 162)  hàng r có chữ số d
+#     [162, 243) cột c có chữ số d
+#     [243, 324) khối b có chữ số d
+N_COLUMNS = 324
+N_CANDIDATES = 729
+
+
+def _candidate_columns(cand: int) -> List[int]:
+    """4 cột ràng buộc mà ứng viên cand = i * 9 + (d - 1) phủ (đánh số từ 1)."""
+    i, d0 = divmod(cand, 9)
+    r, c = divmod(i, 9)
+    b = (r // 3) * 3 + c // 3
+    return [
+        1 + i,
+        1 + 81 + r * 9 + d0,
+        1 + 162 + c * 9 + d0,
+        1 + 243 + b * 9 + d0,
+    ]
+
+
+class DLXSolver:
+    """
+    Dancing Links (Algorithm X của Knuth) trên ma trận 324 ràng buộc.
+    Các liên kết lưu trong list song song (L, R, U, D, C) thay vì object
+    để giảm chi phí truy cập. Luôn chọn cột có ít hàng nhất (heuristic S),
+    nên thời gian ổn định kể cả với đề "đánh đố" thuật toán quay lui thường.
+    Sau mỗi lần solve / count, ma trận được trả về nguyên trạng nên một
+    instance dùng lại được cho nhiều đề.
+    """
+
+    def __init__(self) -> None:
+        # Node 0 là root, node 1..324 là header cột, sau đó là 4 node / ứng viên.
+        n_nodes = 1 + N_COLUMNS + 4 * N_CANDIDATES
+        self.L: List[int] = [0] * n_nodes
+        self.R: List[int] = [0] * n_nodes
+        self.U: List[int] = list(range(n_nodes))
+        self.D: List[int] = list(range(n_nodes))
+        self.C: List[int] = [0] * n_nodes
+        self.ROW: List[int] = [-1] * n_nodes
+        self.S: List[int] = [0] * (1 + N_COLUMNS)
+        # Node đầu tiên của mỗi ứng viên (để chọn sẵn các số đề cho)
+        self.first_node: List[int] = [0] * N_CANDIDATES
+
+        L, R, U, D, C = self.L, self.R, self.U, self.D, self.C
+
+        for h in range(1 + N_COLUMNS):
+            L[h] = h - 1
+            R[h] = h + 1
+            C[h] = h
+        L[0] = N_COLUMNS
+        R[N_COLUMNS] = 0
+
+        node = 1 + N_COLUMNS
+        for cand in range(N_CANDIDATES):
+            first = node
+            self.first_node[cand] = first
+            for col in _candidate_columns(cand):
+                # Chèn node vào cuối cột col
+                C[node] = col
+                self.ROW[node] = cand
+                U[node] = U[col]
+                D[node] = col
+                D[U[col]] = node
+                U[col] = node
+                self.S[col] += 1
+                # Liên kết vòng trong hàng
+                L[node] = node - 1
+                R[node] = node + 1
+                node += 1
+            L[first] = node - 1
+            R[node - 1] = first
+
+        self.solution: List[int] = []
+        self._givens: List[int] = []
+        self._partial: List[int] = []
+        self._count = 0
+        self._limit = 1
+
+    # ----- Thao tác cover / uncover -----
+
+    def _cover(self, c: int) -> None:
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        L[R[c]] = L[c]
+        R[L[c]] = R[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def _uncover(self, c: int) -> None:
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        L[R[c]] = c
+        R[L[c]] = c
+
+    # ----- Tìm kiếm -----
+
+    def _search(self) -> bool:
+        """Trả về True khi đã đủ self._limit lời giải (dừng sớm)."""
+        R, D, S, C = self.R, self.D, self.S, self.C
+
+        if R[0] == 0:
+            if self._count == 0:
+                self.solution = self._givens + self._partial
+            self._count += 1
+            return self._count >= self._limit
+
+        # Chọn cột có ít hàng nhất
+        c = R[0]
+        best = S[c]
+        j = R[c]
+        while j != 0 and best > 1:
+            if S[j] < best:
+                c = j
+                best = S[j]
+            j = R[j]
+        if best == 0:
+            return False
+
+        self._cover(c)
+        r = D[c]
+        stop = False
+        while r != c:
+            self._partial.append(self.ROW[r])
+            j = R[r]
+            while j != r:
+                self._cover(C[j])
+                j = R[j]
+
+            stop = self._search()
+
+            j = self.L[r]
+            while j != r:
+                self._uncover(C[j])
+                j = self.L[j]
+            self._partial.pop()
+
+            if stop:
+                break
+            r = D[r]
+        self._uncover(c)
+        return stop
+
+    def _run(self, board: Board, limit: int) -> int:
+        """
+        Chọn sẵn các ô đề cho, tìm tối đa limit lời giải rồi khôi phục ma trận.
+        Trả về số lời giải tìm được (0 nếu đề ban đầu mâu thuẫn).
+        """
+        self.solution = []
+        self._partial = []
+        self._count = 0
+        self._limit = limit
+
+        covered: List[int] = []
+        givens = self._cover_givens(board, covered)
+        if givens is not None:
+            self._givens = givens
+            self._search()
+
+        for col in reversed(covered):
+            self._uncover(col)
+        return self._count
+
+    def _cover_givens(self, board: Board, covered: List[int]) -> Optional[List[int]]:
+        """
+        Phủ các cột của những ô đề cho (ghi vào covered để _run gỡ lại).
+        Trả về danh sách ứng viên đã chọn, hoặc None ngay ở ô đầu tiên trùng số.
+        """
+        R, C, L = self.R, self.C, self.L
+        givens: List[int] = []
+        for r in range(9):
+            for c in range(9):
+                num = board[r][c]
+                if num == 0:
+                    continue
+                cand = (r * 9 + c) * 9 + num - 1
+                node = self.first_node[cand]
+                # Cả 4 cột của ứng viên phải còn chưa bị phủ, nếu không là trùng số
+                j = node
+                while True:
+                    col = C[j]
+                    if L[R[col]] != col:
+                        return None
+                    j = R[j]
+                    if j == node:
+                        break
+                j = node
+                while True:
+                    self._cover(C[j])
+                    covered.append(C[j])
+                    j = R[j]
+                    if j == node:
+                        break
+                givens.append(cand)
+        return givens
+
+    def solve(self, board: Board) -> Optional[Board]:
+        """Trả về một lời giải (board mới) hoặc None nếu vô nghiệm."""
+        if self._run(board, 1) == 0:
+            return None
+        return self.solution_board()
+
+    def solution_board(self) -> Optional[Board]:
+        """Lời giải đầu tiên của lần chạy gần nhất (board mới), hoặc None."""
+        if self._count == 0:
+            return None
+        result: Board = [[0] * 9 for _ in range(9)]
+        for cand in self.solution:
+            i, d0 = divmod(cand, 9)
+            result[i // 9][i % 9] = d0 + 1
+        return result
+
+    def count(self, board: Board, limit: int = 2) -> int:
+        """Đếm số lời giải, dừng khi đạt limit. Không thay đổi board."""
+        return self._run(board, limit)
+
+
+class InstrumentedDLXSolver(DLXSolver):
+    """
+    DLXSolver có đếm vào self.stats. Mỗi lần gọi _search là một nút; mọi
+    nút trừ gốc đi sau đúng một lần chọn hàng (đặt một ô), và mọi hàng đã
+    chọn đều được gỡ khi khôi phục ma trận (backtracks thì không tính các
+    hàng trên đường tới lời giải khi chỉ tìm một lời giải). DLX không có lan
+    truyền riêng (phủ cột đã loại ứng viên), nên propagations luôn là 0.
+    Khi self.budget báo dừng, _search trả True như "đã đủ lời giải" để mọi
+    tầng uncover bình thường (ma trận được khôi phục, instance dùng lại
+    được), rồi _run mới raise SolveInterrupted.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.stats = SolveStats()
+        self.budget = None
+        self._interrupted: Optional[SolveInterrupted] = None
+
+    def _run(self, board: Board, limit: int) -> int:
+        stats = self.stats
+        nodes = stats.nodes
+        self._interrupted = None
+        count = super()._run(board, limit)
+        placed = max(0, stats.nodes - nodes - 1)
+        stats.placements += placed
+        stats.undos += placed
+        if limit == 1 and count:
+            placed -= len(self.solution) - len(self._givens)
+        stats.backtracks += placed
+        if self._interrupted is not None:
+            self._count = 0
+            raise self._interrupted
+        return count
+
+    def _search(self) -> bool:
+        stats = self.stats
+        stats.nodes += 1
+        depth = stats.depth = len(self._partial)
+        if depth > stats.max_depth:
+            stats.max_depth = depth
+        if self.budget is not None:
+            try:
+                self.budget.tick()
+            except SolveInterrupted as e:
+                self._interrupted = e
+                return True
+        return super()._search()
+
+
+def solve_sudoku_dlx(board: Board) -> bool:
+    """
+    Giải Sudoku bằng Dancing Links, ghi lời giải vào board nếu giải được.
+    """
+    solution = DLXSolver().solve(board)
+    if solution is None:
+        return False
+    for r in range(9):
+        board[r][:] = solution[r]
+    return True
+
+
+def count_solutions_dlx(board: Board, limit: int = 2) -> int:
+    """Đếm số lời giải của board bằng Dancing Links (tối đa limit)."""
+    return DLXSolver().count(board, limit)
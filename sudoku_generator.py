@@ -0,0 +1,173 @@
+import argparse
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+from sudoku_utils import Board, board_to_string, write_board_to_file
+from sudoku_bitmask import BitmaskSolver
+
+SYMMETRIES = ("none", "rot180", "rot90", "mirror", "diagonal")
+
+
+def _symmetry_group(i: int, symmetry: str) -> List[int]:
+    """Các ô (chỉ số phẳng) phải xoá cùng ô i để giữ đối xứng."""
+    r, c = divmod(i, 9)
+    if symmetry == "none":
+        cells = [(r, c)]
+    elif symmetry == "rot180":
+        cells = [(r, c), (8 - r, 8 - c)]
+    elif symmetry == "rot90":
+        cells = [(r, c), (c, 8 - r), (8 - r, 8 - c), (8 - c, r)]
+    elif symmetry == "mirror":
+        cells = [(r, c), (r, 8 - c)]
+    elif symmetry == "diagonal":
+        cells = [(r, c), (c, r)]
+    else:
+        raise ValueError(f"Kiểu đối xứng không hợp lệ: {symmetry}")
+    return sorted({rr * 9 + cc for rr, cc in cells})
+
+
+class PuzzleGenerator:
+    """
+    Sinh đề Sudoku có nghiệm duy nhất bằng cách "đục lỗ" một lời giải đầy đủ.
+    Dùng chung một BitmaskSolver cho mọi lần kiểm tra (load() xoá và dùng lại
+    bộ nhớ), và kiểm tra duy nhất kiểu tăng dần: đề trước khi xoá đã duy nhất,
+    nên lời giải khác (nếu có) phải khác ở một ô vừa xoá => chỉ cần thử các
+    chữ số khác lời giải tại các ô đó, mỗi lần tìm tối đa 1 nghiệm.
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.rng = random.Random(seed)
+        self.solver = BitmaskSolver()
+
+    def random_solution(self) -> Board:
+        """Lời giải đầy đủ ngẫu nhiên: điền ngẫu nhiên 3 khối chéo rồi giải."""
+        board: Board = [[0] * 9 for _ in range(9)]
+        for b in (0, 4, 8):
+            digits = self.rng.sample(range(1, 10), 9)
+            br, bc = (b // 3) * 3, (b % 3) * 3
+            for k, d in enumerate(digits):
+                board[br + k // 3][bc + k % 3] = d
+        self.solver.load(board)
+        self.solver.solve("mrv", True)
+        self.solver.export(board)
+
+        # Hoán vị nhãn chữ số để không lệch về thứ tự thử 1..9 của solver
+        perm = [0] + self.rng.sample(range(1, 10), 9)
+        return [[perm[v] for v in row] for row in board]
+
+    def _has_other_solution(self, board: Board, removed: List[int], solution: Board) -> bool:
+        solver = self.solver
+        if not solver.load(board):
+            return False
+        for i in removed:
+            r, c = divmod(i, 9)
+            keep = solution[r][c]
+            for d in range(1, 10):
+                if d == keep or not solver.can_place(i, d):
+                    continue
+                solver.place(i, d)
+                # solve() thất bại thì trả engine về đúng trạng thái trước đó
+                if solver.solve("mrv", True):
+                    return True
+                solver.undo(i, d)
+        return False
+
+    def generate(self, clues: int = 26, symmetry: str = "none") -> Tuple[Board, Board]:
+        """
+        Sinh (đề, lời giải). Đục dần nhưng không xuống dưới clues ô; dừng khi
+        đạt clues hoặc không xoá thêm được ô nào mà vẫn giữ nghiệm duy nhất
+        (khi đó, hoặc khi nhóm đối xứng không khớp, đề có thể nhiều hơn clues ô).
+        """
+        if not 17 <= clues <= 81:
+            raise ValueError("clues phải trong khoảng 17..81.")
+        _symmetry_group(0, symmetry)  # kiểm tra tên đối xứng sớm
+
+        solution = self.random_solution()
+        board = [row[:] for row in solution]
+        filled = 81
+
+        order = list(range(81))
+        self.rng.shuffle(order)
+        seen = set()
+        for i in order:
+            if filled <= clues:
+                break
+            if i in seen:
+                continue
+            group = _symmetry_group(i, symmetry)
+            seen.update(group)
+            group = [j for j in group if board[j // 9][j % 9]]
+            if not group or filled - len(group) < clues:
+                continue
+
+            for j in group:
+                board[j // 9][j % 9] = 0
+            if self._has_other_solution(board, group, solution):
+                for j in group:
+                    board[j // 9][j % 9] = solution[j // 9][j % 9]
+            else:
+                filled -= len(group)
+
+        return board, solution
+
+
+def _generate_one(args: Tuple[int, int, str]) -> str:
+    seed, clues, symmetry = args
+    puzzle, _ = PuzzleGenerator(seed).generate(clues, symmetry)
+    return board_to_string(puzzle)
+
+
+def generate_many(
+    count: int,
+    clues: int = 26,
+    symmetry: str = "none",
+    seed: int = 0,
+    workers: int = 1,
+    chunksize: int = 16,
+) -> Iterator[str]:
+    """
+    Sinh count đề (chuỗi 81 ký tự), đề thứ k dùng seed + k nên kết quả
+    tái lập được và không phụ thuộc số worker. workers > 1 chia cho
+    ProcessPoolExecutor theo chunk.
+    """
+    tasks = ((seed + k, clues, symmetry) for k in range(count))
+    if workers <= 1:
+        yield from map(_generate_one, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_generate_one, tasks, chunksize=chunksize)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sinh đề Sudoku có nghiệm duy nhất.")
+    parser.add_argument("--count", type=int, default=10, help="Số đề cần sinh.")
+    parser.add_argument("--clues", type=int, default=26, help="Số ô gợi ý mục tiêu (17..81).")
+    parser.add_argument("--symmetry", choices=SYMMETRIES, default="none")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="Số process (mặc định: 1).")
+    out = parser.add_mutually_exclusive_group()
+    out.add_argument("--out", metavar="FILE", help="Ghi mỗi dòng một đề 81 ký tự.")
+    out.add_argument(
+        "--out-dir",
+        metavar="DIR",
+        help="Ghi mỗi đề ra một file 9 dòng (gen_00000.txt, ...), vd. input/.",
+    )
+    args = parser.parse_args()
+
+    puzzles = generate_many(
+        args.count, args.clues, args.symmetry, args.seed, args.workers
+    )
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        for k, text in enumerate(puzzles):
+            board = [[int(ch) for ch in text[r * 9:r * 9 + 9]] for r in range(9)]
+            write_board_to_file(board, os.path.join(args.out_dir, f"gen_{k:05d}.txt"))
+    elif args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            for text in puzzles:
+                f.write(text + "\n")
+    else:
+        for text in puzzles:
+            print(text)
@@ -0,0 +1,333 @@
+import argparse
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from sudoku_utils import Board, parse_board_string, read_board_from_file
+from sudoku_bitmask import (
+    BOX_OF,
+    COL_OF,
+    DIGIT_BITS,
+    PEERS,
+    POPCOUNT,
+    ROW_OF,
+    UNITS,
+    InstrumentedBitmaskSolver,
+)
+from sudoku_stats import SolveStats
+
+# Kỹ thuật "người giải" theo độ khó tăng dần; "backtracking" = phải đoán
+TECHNIQUES = (
+    "naked_single",
+    "hidden_single",
+    "locked_candidates",
+    "naked_pair",
+    "hidden_pair",
+    "x_wing",
+    "backtracking",
+)
+TECHNIQUE_LEVEL: Dict[str, int] = {name: k + 1 for k, name in enumerate(TECHNIQUES)}
+
+# Nhãn độ khó theo kỹ thuật khó nhất cần dùng; "invalid" = mâu thuẫn /
+# vô nghiệm, "not_unique" = nhiều lời giải (không chấm độ khó)
+RATINGS = ("easy", "medium", "hard", "expert", "invalid", "not_unique")
+_RATING_OF_LEVEL = {1: "easy", 2: "easy", 3: "medium", 4: "medium", 5: "hard", 6: "hard", 7: "expert"}
+
+# Mask 9 bit vị trí trong đơn vị -> vị trí (0..8) của bit thấp nhất
+_LOW_POS = [0] * (1 << 9)
+for _m in range(1, 1 << 9):
+    _LOW_POS[_m] = (_m & -_m).bit_length() - 1
+
+
+@dataclass(frozen=True)
+class Grade:
+    """
+    Kết quả chấm độ khó, không phụ thuộc máy / thời gian chạy.
+    - technique: kỹ thuật khó nhất cần dùng ("backtracking" nếu logic bế tắc).
+    - nodes / backtracks: số nút / số lần quay lui (SolveStats) của MRV +
+      lan truyền.
+    - score: level(technique) * 1000 + min(backtracks, 999), so sánh được.
+    - steps: số lần áp dụng từng kỹ thuật trong lời giải logic.
+    """
+
+    rating: str
+    score: int
+    technique: str
+    nodes: int
+    backtracks: int
+    steps: Dict[str, int] = field(default_factory=dict)
+
+
+INVALID = Grade("invalid", 0, "", 0, 0)
+NOT_UNIQUE = Grade("not_unique", 0, "", 0, 0)
+
+
+class Grader:
+    """
+    Chấm độ khó một đề bằng hai thước đo:
+    1. Giải logic như người: mỗi bước thử kỹ thuật dễ nhất còn áp dụng được
+       (naked / hidden single, locked candidates, naked / hidden pair, X-wing)
+       trên mask ứng viên 81 ô; ghi lại kỹ thuật khó nhất đã dùng.
+    2. Công sức tìm kiếm: số nút / số lần quay lui của engine bitmask.
+    Cả hai đều tất định nên cùng một đề luôn cho cùng một Grade.
+    Chỉ chấm đề có đúng một lời giải: đề nhiều lời giải trả NOT_UNIQUE,
+    đề vô nghiệm / mâu thuẫn trả INVALID.
+    Một instance dùng lại được cho nhiều đề (grade_many()).
+    """
+
+    def __init__(self) -> None:
+        self.cells: List[int] = [0] * 81
+        self.cand: List[int] = [0] * 81
+        self.search = InstrumentedBitmaskSolver()
+
+    def grade(self, board: Board) -> Grade:
+        if not self.search.load(board):
+            return INVALID
+        # Đếm tối đa 2 lời giải trên chính engine đã load (count() trả engine
+        # về trạng thái vừa load), không dựng session mới cho mỗi đề
+        count = self.search.count(2)
+        if count != 1:
+            return NOT_UNIQUE if count else INVALID
+        # Giải logic trước: cần ứng viên ban đầu, solve() sẽ điền kín engine
+        steps = self._solve_logically(board)
+        if steps is None:
+            return INVALID
+        # Chỉ đo công sức của lần giải, không tính lần đếm ở trên
+        stats = self.search.stats = SolveStats()
+        if not self.search.solve("mrv", True):
+            return INVALID
+        nodes, backtracks = stats.nodes, stats.backtracks
+
+        technique = TECHNIQUES[-1] if self._stuck else TECHNIQUES[0]
+        for name in steps:
+            if TECHNIQUE_LEVEL[name] > TECHNIQUE_LEVEL[technique]:
+                technique = name
+        level = TECHNIQUE_LEVEL[technique]
+        return Grade(
+            _RATING_OF_LEVEL[level],
+            level * 1000 + min(backtracks, 999),
+            technique,
+            nodes,
+            backtracks,
+            steps,
+        )
+
+    # ----- Giải logic -----
+
+    def _solve_logically(self, board: Board):
+        """Áp dụng kỹ thuật tới khi kín bảng hoặc bế tắc. None nếu mâu thuẫn."""
+        cells = self.cells
+        cand = self.cand
+        for i in range(81):
+            cells[i] = board[i // 9][i % 9]
+        for i in range(81):
+            cand[i] = 0 if cells[i] else self.search.candidates(i)
+
+        techniques = (
+            ("naked_single", self._naked_single),
+            ("hidden_single", self._hidden_single),
+            ("locked_candidates", self._locked_candidates),
+            ("naked_pair", self._naked_pair),
+            ("hidden_pair", self._hidden_pair),
+            ("x_wing", self._x_wing),
+        )
+        steps: Dict[str, int] = {}
+        self._stuck = False
+        while True:
+            empty = False
+            for i in range(81):
+                if cells[i] == 0:
+                    if cand[i] == 0:
+                        return None
+                    empty = True
+            if not empty:
+                return steps
+            for name, apply in techniques:
+                if apply():
+                    steps[name] = steps.get(name, 0) + 1
+                    break
+            else:
+                self._stuck = True
+                return steps
+
+    def _assign(self, i: int, bit: int) -> None:
+        self.cells[i] = bit.bit_length() - 1
+        self.cand[i] = 0
+        cand = self.cand
+        for p in PEERS[i]:
+            cand[p] &= ~bit
+
+    def _eliminate(self, cells: Iterable[int], mask: int) -> bool:
+        cand = self.cand
+        changed = False
+        for j in cells:
+            if cand[j] & mask:
+                cand[j] &= ~mask
+                changed = True
+        return changed
+
+    def _positions(self, unit: List[int], bit: int) -> int:
+        """Mask 9 bit các vị trí trong unit còn ứng viên bit."""
+        cand = self.cand
+        pos = 0
+        for k, j in enumerate(unit):
+            if cand[j] & bit:
+                pos |= 1 << k
+        return pos
+
+    def _naked_single(self) -> bool:
+        cand = self.cand
+        for i in range(81):
+            if POPCOUNT[cand[i]] == 1:
+                self._assign(i, cand[i])
+                return True
+        return False
+
+    def _hidden_single(self) -> bool:
+        cand = self.cand
+        for unit in UNITS:
+            seen1 = seen2 = 0
+            for j in unit:
+                seen2 |= seen1 & cand[j]
+                seen1 |= cand[j]
+            hidden = seen1 & ~seen2
+            if hidden:
+                bit = hidden & -hidden
+                for j in unit:
+                    if cand[j] & bit:
+                        self._assign(j, bit)
+                        return True
+        return False
+
+    def _locked_candidates(self) -> bool:
+        # Pointing: chữ số trong khối chỉ nằm trên một hàng / cột
+        for b in range(9):
+            box = UNITS[18 + b]
+            for d in range(1, 10):
+                bit = DIGIT_BITS[d]
+                where = [j for j in box if self.cand[j] & bit]
+                if len(where) < 2:
+                    continue
+                for line_of, base in ((ROW_OF, 0), (COL_OF, 9)):
+                    line = line_of[where[0]]
+                    if all(line_of[j] == line for j in where[1:]):
+                        others = [j for j in UNITS[base + line] if BOX_OF[j] != b]
+                        if self._eliminate(others, bit):
+                            return True
+        # Claiming: chữ số trong hàng / cột chỉ nằm trong một khối
+        for u in range(18):
+            unit = UNITS[u]
+            for d in range(1, 10):
+                bit = DIGIT_BITS[d]
+                where = [j for j in unit if self.cand[j] & bit]
+                if len(where) < 2:
+                    continue
+                b = BOX_OF[where[0]]
+                if all(BOX_OF[j] == b for j in where[1:]):
+                    others = [j for j in UNITS[18 + b] if j not in unit]
+                    if self._eliminate(others, bit):
+                        return True
+        return False
+
+    def _naked_pair(self) -> bool:
+        cand = self.cand
+        for unit in UNITS:
+            pairs = [j for j in unit if POPCOUNT[cand[j]] == 2]
+            for a in range(len(pairs)):
+                for b in range(a + 1, len(pairs)):
+                    mask = cand[pairs[a]]
+                    if cand[pairs[b]] != mask:
+                        continue
+                    others = [j for j in unit if j != pairs[a] and j != pairs[b]]
+                    if self._eliminate(others, mask):
+                        return True
+        return False
+
+    def _hidden_pair(self) -> bool:
+        cand = self.cand
+        for unit in UNITS:
+            pos = [0] + [self._positions(unit, DIGIT_BITS[d]) for d in range(1, 10)]
+            for d1 in range(1, 10):
+                if POPCOUNT[pos[d1] << 1] != 2:
+                    continue
+                for d2 in range(d1 + 1, 10):
+                    if pos[d2] != pos[d1]:
+                        continue
+                    keep = DIGIT_BITS[d1] | DIGIT_BITS[d2]
+                    p = pos[d1]
+                    changed = False
+                    while p:
+                        j = unit[_LOW_POS[p]]
+                        p &= p - 1
+                        if cand[j] & ~keep:
+                            cand[j] &= keep
+                            changed = True
+                    if changed:
+                        return True
+        return False
+
+    def _x_wing(self) -> bool:
+        # base 0: hàng là "base", loại ở cột; base 9: ngược lại
+        for base, cover in ((0, 9), (9, 0)):
+            for d in range(1, 10):
+                bit = DIGIT_BITS[d]
+                seen: Dict[int, int] = {}
+                for k in range(9):
+                    pos = self._positions(UNITS[base + k], bit)
+                    if POPCOUNT[pos << 1] != 2:
+                        continue
+                    if pos not in seen:
+                        seen[pos] = k
+                        continue
+                    lines = (seen[pos], k)
+                    p = pos
+                    changed = False
+                    while p:
+                        line = UNITS[cover + _LOW_POS[p]]
+                        p &= p - 1
+                        others = [line[m] for m in range(9) if m not in lines]
+                        changed |= self._eliminate(others, bit)
+                    if changed:
+                        return True
+        return False
+
+
+def grade(board: Board) -> Grade:
+    """Chấm độ khó một đề."""
+    return Grader().grade(board)
+
+
+def grade_many(boards: Iterable[Board]) -> Iterator[Grade]:
+    """Chấm nhiều đề, dùng chung một Grader (không cấp phát lại bộ nhớ)."""
+    grader = Grader()
+    for board in boards:
+        yield grader.grade(board)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chấm độ khó đề Sudoku.")
+    parser.add_argument("files", nargs="*", help="Các file đề 9 dòng.")
+    parser.add_argument(
+        "--batch",
+        metavar="PATH",
+        help="Thư mục file .txt hoặc file nhiều đề (mỗi dòng 81 ký tự).",
+    )
+    args = parser.parse_args()
+
+    # (nhãn, dữ liệu, dữ liệu là đường dẫn file?)
+    items: List[Tuple[str, str, bool]] = [(path, path, True) for path in args.files]
+    if args.batch:
+        from sudoku_batch import iter_batch_items
+
+        from_files, batch = iter_batch_items(args.batch)
+        items.extend((label, data, from_files) for label, data in batch)
+
+    grader = Grader()
+    print("puzzle\trating\tscore\ttechnique\tnodes\tbacktracks")
+    for label, data, from_files in items:
+        try:
+            board = read_board_from_file(data) if from_files else parse_board_string(data)
+        except ValueError as e:
+            print(f"{label}\tERROR: {e}")
+            continue
+        g = grader.grade(board)
+        print(f"{label}\t{g.rating}\t{g.score}\t{g.technique}\t{g.nodes}\t{g.backtracks}")
@@ -1,18 +1,25 @@
 import os
 import sys
-import time
 import subprocess
+import time
 import tkinter as tk
 from tkinter import messagebox, ttk
 
 from sudoku_utils import (
     Board,
-    is_valid,
+    CompactBoard,
     read_board_from_file,
     write_board_to_file,
-    find_empty,
 )
-from sudoku_solver import solve_sudoku
+from sudoku_cache import SolutionCache
+from sudoku_canvas import CanvasGrid
+from sudoku_conflicts import ConflictIndex
+from sudoku_solver import DEFAULT_ENGINE, SolveResult, SolveStatus, engine_names
+from sudoku_iterative import iter_steps
+from sudoku_stats import SolveStats
+from sudoku_store import SolutionStore
+from sudoku_trace import SearchTrace
+from sudoku_worker import SolveWorker
 
 # ===== THEME =====
 BG_MAIN = "#020817"
@@ -47,8 +54,11 @@ class SudokuGUI:
         self.root.configure(bg=BG_MAIN)
 
         # core state
-        self.entries: list[list[tk.Entry]] = [[None for _ in range(9)] for _ in range(9)]
+        self.board_grid: CanvasGrid | None = None
         self.selected_cell: tuple[int, int] | None = None
+        self.pencil_mode: bool = False  # numpad / phím số ghi chú thay vì điền
+        # đếm chữ số theo hàng / cột / khối, cập nhật ở mỗi lần sửa ô
+        self.conflicts = ConflictIndex()
         self.solve_info_label: tk.Label | None = None
 
         # file state
@@ -60,11 +70,40 @@ class SudokuGUI:
         self.output_var = tk.StringVar(value="")
         self.input_files: list[str] = []
         self.output_files: list[str] = []
+        self.engine_var = tk.StringVar(value=DEFAULT_ENGINE)
+
+        # kho lời giải trên đĩa, mở khi Solve lần đầu
+        self.solution_store: SolutionStore | None = None
+        # cache trong bộ nhớ (gộp đề đối xứng), tra trước store
+        self.solution_cache = SolutionCache(maxsize=256)
+
+        # Solve chạy trong process riêng, kết quả / tiến độ lấy bằng root.after
+        self.solve_worker = SolveWorker()
+        self.solve_engine: str = DEFAULT_ENGINE
+        self.solve_puzzle: Board | None = None  # đề đang giải, để lưu vào store
+        self.solve_cache_slot = None  # khoá cache đã tính của solve_puzzle
+        self.solve_poll_ms: int = 16  # ~60 fps
+        self.solve_started: float = 0.0
+        # Tiến độ chi tiết (số nút, độ sâu) bắt engine đếm từng nút nên mặc
+        # định tắt: engine chạy hết tốc độ, chỉ hiện thời gian đã chạy; bật thì
+        # cuối lần giải có thêm tổng kết SolveStats
+        self.solve_progress_var = tk.BooleanVar(value=False)
 
         # step-by-step state
         self.step_solver_running: bool = False
         self.step_gen = None
-        self.step_delay_ms: int = 80  # tốc độ mô phỏng Backtracking
+        self.step_delay_ms: int = 80  # tốc độ mô phỏng Backtracking (mức 0)
+        self.step_frame_ms: int = 16  # nhịp khung hình ở chế độ turbo (~60 fps)
+        self.step_frame_budget_s: float = 0.010  # thời gian xử lý bước tối đa / khung
+        self.step_speed_var = tk.IntVar(value=0)  # mức k: 2**k bước / khung
+        self.step_count: int = 0
+        self.step_skip: bool = False  # đang tua tới lần quay lui kế tiếp
+        self.step_hl_cell: tuple[int, int] | None = None
+
+        # trace của lần Step gần nhất: tua lại bằng timeline, không chạy lại
+        self.step_trace: SearchTrace | None = None
+        self.step_view: bytearray | None = None  # 81 ô đang hiển thị của trace
+        self.trace_pos_var = tk.IntVar(value=0)
 
         self._build_header()
         self._build_main()
@@ -103,6 +142,7 @@ class SudokuGUI:
         self.F_TEXT_B = ("Segoe UI", int(10 * self.S), "bold")
         self.F_NUMPAD = ("Segoe UI", int(10 * self.S), "bold")
         self.F_CELL = ("Segoe UI", int(20 * self.S), "bold")
+        self.F_PENCIL = ("Segoe UI", int(8 * self.S))
 
         # Layout
         self.WRAP_SIDE = int(340 * self.S)
@@ -111,8 +151,7 @@ class SudokuGUI:
         self.SIDE_W = int(360 * self.S)
 
         # Grid metrics
-        self.CELL_IPADX = int(8 * self.S)
-        self.CELL_IPADY = int(6 * self.S)
+        self.CELL_SIZE = int(46 * self.S)
         self.CELL_PAD_THIN = max(1, int(1 * self.S))
         self.CELL_PAD_THICK = max(3, int(3 * self.S))
 
@@ -231,84 +270,79 @@ class SudokuGUI:
         self._build_help_panel(side_panel)
 
     def _build_grid(self, parent: tk.Frame) -> None:
-        grid_frame = tk.Frame(parent, bg=CARD_BG)
-        grid_frame.pack()
-
-        for r in range(9):
-            for c in range(9):
-                pad_left = self.CELL_PAD_THICK if c in (0, 3, 6) else self.CELL_PAD_THIN
-                pad_top = self.CELL_PAD_THICK if r in (0, 3, 6) else self.CELL_PAD_THIN
-                pad_right = self.CELL_PAD_THICK if c == 8 else self.CELL_PAD_THIN
-                pad_bottom = self.CELL_PAD_THICK if r == 8 else self.CELL_PAD_THIN
-
-                e = tk.Entry(
-                    grid_frame,
-                    width=2,
-                    justify="center",
-                    font=self.F_CELL,
-                    bg=CELL_BG,
-                    fg=CELL_FG,
-                    bd=0,
-                    relief="flat",
-                    highlightthickness=1,
-                    highlightbackground=CELL_BORDER,
-                    insertbackground=ACCENT,
-                )
-                e.grid(
-                    row=r,
-                    column=c,
-                    padx=(pad_left, pad_right),
-                    pady=(pad_top, pad_bottom),
-                    ipadx=self.CELL_IPADX,
-                    ipady=self.CELL_IPADY,
-                )
-
-                e.bind("<FocusIn>", lambda ev, rr=r, cc=c: self._on_cell_focus(rr, cc))
-                self._bind_cell_navigation(e, r, c)
-                e.bind(
-                    "<KeyRelease>",
-                    lambda ev, rr=r, cc=c: self._on_cell_key(ev, rr, cc),
-                )
-
-                self.entries[r][c] = e
-
-    def _bind_cell_navigation(self, e: tk.Entry, r: int, c: int) -> None:
-        def go(dr: int, dc: int):
-            nr, nc = r + dr, c + dc
-            nr = max(0, min(8, nr))
-            nc = max(0, min(8, nc))
-            self._focus_cell(nr, nc)
-            return "break"
-
-        e.bind("<Up>", lambda ev: go(-1, 0))
-        e.bind("<Down>", lambda ev: go(1, 0))
-        e.bind("<Left>", lambda ev: go(0, -1))
-        e.bind("<Right>", lambda ev: go(0, 1))
-
-    def _on_cell_key(self, event: tk.Event, r: int, c: int) -> None:
+        self.board_grid = CanvasGrid(
+            parent,
+            cell=self.CELL_SIZE,
+            thin=self.CELL_PAD_THIN,
+            thick=self.CELL_PAD_THICK,
+            font=self.F_CELL,
+            pencil_font=self.F_PENCIL,
+            bg=CARD_BG,
+            cell_bg=CELL_BG,
+            cell_fg=CELL_FG,
+            border=CELL_BORDER,
+            pencil_fg=TEXT_MUTED,
+        )
+        canvas = self.board_grid.canvas
+        canvas.pack()
+        canvas.bind("<Button-1>", self._on_grid_click)
+        canvas.bind("<Key>", self._on_cell_key)
+        self._bind_cell_navigation(canvas)
+
+    def _on_grid_click(self, event: tk.Event) -> None:
+        cell = self.board_grid.cell_at(event.x, event.y)
+        if cell is not None:
+            self._focus_cell(*cell)
+
+    def _bind_cell_navigation(self, widget: tk.Widget) -> None:
         """
-        Giới hạn input: rỗng / 0 / '.' / 1-9. Khác -> xoá.
-        Giữ mỗi ô chỉ 1 ký tự hợp lệ => UI sạch, tránh lỗi vặt.
+        Mũi tên di chuyển ô chọn (dừng ở mép lưới); Tab / Shift-Tab đi tới
+        ô kế / ô trước theo thứ tự hàng, vòng lại đầu / cuối lưới như khi
+        còn 81 Entry. Trả "break" để Tab không chuyển focus ra khỏi canvas.
         """
-        e = self.entries[r][c]
-        val = e.get().strip()
+        widget.bind("<Up>", lambda ev: self._move_selection(-1, 0))
+        widget.bind("<Down>", lambda ev: self._move_selection(1, 0))
+        widget.bind("<Left>", lambda ev: self._move_selection(0, -1))
+        widget.bind("<Right>", lambda ev: self._move_selection(0, 1))
+        widget.bind("<Tab>", lambda ev: self._step_selection(1))
+        widget.bind("<Shift-Tab>", lambda ev: self._step_selection(-1))
+        # X11 gửi Shift-Tab dưới keysym ISO_Left_Tab.
+        if widget.tk.call("tk", "windowingsystem") == "x11":
+            widget.bind("<ISO_Left_Tab>", lambda ev: self._step_selection(-1))
+
+    def _move_selection(self, dr: int, dc: int) -> str:
+        r, c = self.selected_cell or (0, 0)
+        self._focus_cell(max(0, min(8, r + dr)), max(0, min(8, c + dc)))
+        return "break"
+
+    def _step_selection(self, step: int) -> str:
+        if self.selected_cell is None:
+            i = 0 if step > 0 else 80
+        else:
+            r, c = self.selected_cell
+            i = (r * 9 + c + step) % 81
+        self._focus_cell(*divmod(i, 9))
+        return "break"
 
-        if val == "":
+    def _on_cell_key(self, event: tk.Event) -> None:
+        """
+        Nhập vào ô đang chọn: 1-9 điền số (hoặc bật / tắt ghi chú ở chế độ
+        ghi chú); 0 / '.' / Backspace / Delete thì xoá ô. Mọi phím khác
+        (Enter, Esc, Space, Ctrl-..., chữ cái) bị bỏ qua, ô giữ nguyên; Tab
+        và mũi tên do _bind_cell_navigation xử lý.
+        """
+        if self.selected_cell is None:
             return
-
-        if len(val) > 1:
-            val = val[-1]
-
-        if val in ("0", "."):
-            e.delete(0, tk.END)
+        if event.keysym in ("BackSpace", "Delete"):
+            self._erase_selected()
             return
-
-        if not val.isdigit() or not (1 <= int(val) <= 9):
-            e.delete(0, tk.END)
+        val = event.char
+        if len(val) != 1 or not val.isprintable():
             return
-
-        e.delete(0, tk.END)
-        e.insert(0, val)
+        if val in "123456789":
+            self._input_number(int(val))
+        elif val in "0.":
+            self._erase_selected()
 
     def _build_numpad(self, parent: tk.Frame) -> None:
         pad_frame = tk.Frame(parent, bg=CARD_BG)
@@ -347,8 +381,11 @@ class SudokuGUI:
             b = make_btn(str(n), lambda v=n: self._input_number(v))
             b.pack(side="left", padx=int(3 * self.S))
 
+        tools = tk.Frame(pad_frame, bg=CARD_BG)
+        tools.pack(pady=(int(4 * self.S), 0))
+
         erase_btn = tk.Button(
-            pad_frame,
+            tools,
             text="Erase",
             command=self._erase_selected,
             font=self.F_SUB,
@@ -362,7 +399,24 @@ class SudokuGUI:
             relief="flat",
             cursor="hand2",
         )
-        erase_btn.pack(pady=(int(4 * self.S), 0))
+        erase_btn.pack(side="left")
+
+        self.pencil_btn = tk.Button(
+            tools,
+            text="Ghi chú: Tắt",
+            command=self._toggle_pencil_mode,
+            font=self.F_SUB,
+            fg=ACCENT_LIGHT,
+            bg=CARD_BG,
+            activebackground=ACCENT_DARK,
+            activeforeground=TEXT_PRIMARY,
+            bd=0,
+            padx=int(10 * self.S),
+            pady=int(4 * self.S),
+            relief="flat",
+            cursor="hand2",
+        )
+        self.pencil_btn.pack(side="left")
 
     def _build_play_info(self, parent: tk.Frame) -> None:
         info_frame = tk.Frame(parent, bg=CARD_BG)
@@ -393,6 +447,113 @@ class SudokuGUI:
         )
         self.solve_info_label.pack(anchor="w")
 
+        # Điều khiển Step: tốc độ (2**k bước / khung) + tua tới lần quay lui
+        step_bar = tk.Frame(info_frame, bg=CARD_BG)
+        step_bar.pack(anchor="w", pady=(int(4 * self.S), 0))
+        tk.Label(
+            step_bar,
+            text="Tốc độ Step:",
+            font=self.F_TEXT,
+            fg=TEXT_MUTED,
+            bg=CARD_BG,
+        ).pack(side="left")
+        self.step_speed_label = tk.Label(
+            step_bar,
+            text="",
+            font=self.F_TEXT,
+            fg=TEXT_MUTED,
+            bg=CARD_BG,
+            width=10,
+            anchor="w",
+        )
+        tk.Scale(
+            step_bar,
+            from_=0,
+            to=17,
+            orient="horizontal",
+            variable=self.step_speed_var,
+            command=lambda _: self._update_step_speed_label(),
+            showvalue=False,
+            length=int(160 * self.S),
+            bg=CARD_BG,
+            fg=TEXT_MUTED,
+            troughcolor="#111827",
+            highlightthickness=0,
+            bd=0,
+        ).pack(side="left", padx=(int(6 * self.S), int(4 * self.S)))
+        self.step_speed_label.pack(side="left")
+        tk.Button(
+            step_bar,
+            text="Tới lần quay lui",
+            command=self.on_step_skip,
+            font=self.F_TEXT,
+            fg=TEXT_MUTED,
+            bg="#111827",
+            activebackground="#1f2937",
+            activeforeground=TEXT_PRIMARY,
+            bd=0,
+            padx=int(8 * self.S),
+            pady=int(2 * self.S),
+            relief="flat",
+            cursor="hand2",
+        ).pack(side="left", padx=(int(6 * self.S), 0))
+        self._update_step_speed_label()
+
+        # Timeline: tua tới bước bất kỳ của trace đã ghi (keyframe + delta)
+        trace_bar = tk.Frame(info_frame, bg=CARD_BG)
+        trace_bar.pack(anchor="w", pady=(int(2 * self.S), 0))
+        tk.Label(
+            trace_bar,
+            text="Timeline:",
+            font=self.F_TEXT,
+            fg=TEXT_MUTED,
+            bg=CARD_BG,
+        ).pack(side="left")
+        for text, delta in (("◀", -1), ("▶", 1)):
+            tk.Button(
+                trace_bar,
+                text=text,
+                command=lambda d=delta: self.on_trace_step(d),
+                font=self.F_TEXT,
+                fg=TEXT_MUTED,
+                bg="#111827",
+                activebackground="#1f2937",
+                activeforeground=TEXT_PRIMARY,
+                bd=0,
+                padx=int(4 * self.S),
+                relief="flat",
+                cursor="hand2",
+            ).pack(side="left", padx=(int(4 * self.S), 0))
+        self.trace_scale = tk.Scale(
+            trace_bar,
+            from_=0,
+            to=0,
+            orient="horizontal",
+            variable=self.trace_pos_var,
+            command=lambda _: self._seek_trace(self.trace_pos_var.get()),
+            showvalue=False,
+            length=int(220 * self.S),
+            bg=CARD_BG,
+            fg=TEXT_MUTED,
+            troughcolor="#111827",
+            highlightthickness=0,
+            bd=0,
+        )
+        self.trace_scale.pack(side="left", padx=(int(6 * self.S), int(4 * self.S)))
+        self.trace_pos_label = tk.Label(
+            trace_bar,
+            text="chưa có trace",
+            font=self.F_TEXT,
+            fg=TEXT_MUTED,
+            bg=CARD_BG,
+        )
+        self.trace_pos_label.pack(side="left")
+
+    def _update_step_speed_label(self) -> None:
+        level = self.step_speed_var.get()
+        text = "1 bước" if level == 0 else f"{1 << level:,} bước/khung"
+        self.step_speed_label.config(text=text)
+
     def _build_help_panel(self, parent: tk.Frame) -> None:
         guide_card = tk.Frame(
             parent,
@@ -604,9 +765,32 @@ class SudokuGUI:
         small_btn("Clear", self.on_clear).pack(
             side="left", padx=(0, int(4 * self.S)), pady=int(6 * self.S)
         )
-        small_btn("Solve", self.on_solve, primary=True).pack(
-            side="left", padx=(0, int(4 * self.S)), pady=int(6 * self.S)
+        self.engine_menu = ttk.Combobox(
+            bar,
+            textvariable=self.engine_var,
+            values=engine_names(),
+            state="readonly",
+            width=int(11 * self.S),
         )
+        self.engine_menu.pack(side="left", padx=(0, int(4 * self.S)))
+        tk.Checkbutton(
+            bar,
+            text="Tiến độ",
+            variable=self.solve_progress_var,
+            font=self.F_TEXT,
+            fg=TEXT_MUTED,
+            bg=BG_MAIN,
+            activebackground=BG_MAIN,
+            activeforeground=TEXT_PRIMARY,
+            selectcolor="#111827",
+            bd=0,
+            highlightthickness=0,
+        ).pack(side="left", padx=(0, int(4 * self.S)))
+        self.solve_btn = small_btn("Solve", self.on_solve, primary=True)
+        self.solve_btn.pack(side="left", padx=(0, int(4 * self.S)), pady=int(6 * self.S))
+        self.cancel_btn = small_btn("Cancel", self.on_cancel_solve)
+        self.cancel_btn.config(state="disabled")
+        self.cancel_btn.pack(side="left", padx=(0, int(4 * self.S)), pady=int(6 * self.S))
         small_btn("Exit", self.root.destroy).pack(
             side="right", padx=(int(6 * self.S), 0), pady=int(6 * self.S)
         )
@@ -634,186 +818,128 @@ class SudokuGUI:
             self.solve_info_label.config(text=text, fg=color)
 
     def _reset_cell_colors(self) -> None:
-        for r in range(9):
-            for c in range(9):
-                self.entries[r][c].config(
-                    bg=CELL_BG,
-                    fg=CELL_FG,
-                    highlightbackground=CELL_BORDER,
-                )
+        """Trả màu mặc định, giữ màu đỏ cho các ô đang trùng số."""
+        self.board_grid.reset_styles()
+        for i in self.conflicts.bad:
+            self._style_cell(i)
+
+    def _style_cell(self, i: int) -> None:
+        """Tô một ô theo trạng thái: trùng số > đang chọn > mặc định."""
+        r, c = divmod(i, 9)
+        if i in self.conflicts.bad:
+            self.board_grid.set_style(r, c, bg="#fee2e2", fg=ACCENT_DARK, border=ACCENT)
+        elif self.selected_cell == (r, c):
+            self.board_grid.set_style(r, c, bg=CELL_HL, fg=ACCENT_DARK, border=ACCENT)
+        else:
+            self.board_grid.set_style(r, c, bg=CELL_BG, fg=CELL_FG, border=CELL_BORDER)
+
+    def _set_cell_value(self, r: int, c: int, num: int) -> None:
+        """
+        Sửa một ô từ bàn phím / numpad: cập nhật lưới + chỉ mục xung đột,
+        chỉ tô lại các ô đổi trạng thái trùng số.
+        """
+        was_valid = self.conflicts.valid
+        self.board_grid.set_value(r, c, num)
+        for i in self.conflicts.set(r * 9 + c, num):
+            self._style_cell(i)
+        if self.conflicts.valid != was_valid:
+            if self.conflicts.valid:
+                self._set_status("Board hợp lệ trở lại.", STATUS_NORMAL)
+            else:
+                self._set_status("Có ô trùng số (tô đỏ).", STATUS_ERR)
 
     def _focus_cell(self, r: int, c: int) -> None:
         r = max(0, min(8, r))
         c = max(0, min(8, c))
-        e = self.entries[r][c]
-        e.focus_set()
+        self.board_grid.canvas.focus_set()
         self._on_cell_focus(r, c)
 
     def _on_cell_focus(self, r: int, c: int) -> None:
-        self._reset_cell_colors()
-        e = self.entries[r][c]
-        e.config(bg=CELL_HL, fg=ACCENT_DARK, highlightbackground=ACCENT)
         self.selected_cell = (r, c)
+        self._reset_cell_colors()
+        self._style_cell(r * 9 + c)
 
     def _input_number(self, num: int) -> None:
         if self.selected_cell is None:
             return
         r, c = self.selected_cell
-        e = self.entries[r][c]
-        e.delete(0, tk.END)
-        e.insert(0, str(num))
+        grid = self.board_grid
+        if self.pencil_mode:
+            if grid.get_value(r, c) == 0:
+                grid.set_pencil(r, c, grid.get_pencil(r, c) ^ (1 << num))
+            return
+        self._set_cell_value(r, c, num)
 
     def _erase_selected(self) -> None:
         if self.selected_cell is None:
             return
         r, c = self.selected_cell
-        self.entries[r][c].delete(0, tk.END)
+        self._set_cell_value(r, c, 0)
+        self.board_grid.set_pencil(r, c, 0)
+
+    def _toggle_pencil_mode(self) -> None:
+        self.pencil_mode = not self.pencil_mode
+        self.pencil_btn.config(
+            text="Ghi chú: Bật" if self.pencil_mode else "Ghi chú: Tắt",
+            fg=TEXT_PRIMARY if self.pencil_mode else ACCENT_LIGHT,
+        )
 
     # ========= BOARD DATA =========
 
     def get_board_from_entries(self) -> Board:
-        board: Board = []
-        for r in range(9):
-            row = []
-            for c in range(9):
-                val = self.entries[r][c].get().strip()
-                if val in ("", "0", "."):
-                    row.append(0)
-                elif val.isdigit() and 1 <= int(val) <= 9:
-                    row.append(int(val))
-                else:
-                    raise ValueError(
-                        f"Giá trị không hợp lệ tại ô ({r+1}, {c+1}). Chỉ nhập 1–9, 0 hoặc để trống."
-                    )
-            if len(row) != 9:
-                raise ValueError("Mỗi hàng Sudoku phải có đúng 9 ô.")
-            board.append(row)
-        if len(board) != 9:
-            raise ValueError("Bảng Sudoku phải có đúng 9 hàng.")
-        return board
+        # Lưới canvas chỉ nhận 0-9 qua _on_cell_key / numpad nên không còn
+        # giá trị lỗi; giữ tên hàm để các handler cũ không đổi
+        return self.board_grid.board()
 
     def fill_entries_from_board(self, board: Board) -> None:
+        self.conflicts.load(board)
         self._reset_cell_colors()
-        for r in range(9):
-            for c in range(9):
-                e = self.entries[r][c]
-                e.delete(0, tk.END)
-                if board[r][c] != 0:
-                    e.insert(0, str(board[r][c]))
+        self.board_grid.clear_pencil()
+        self.board_grid.set_board(board)
 
     # ========= VALIDATION =========
 
-    def _check_initial_valid(self, board: Board, announce: bool = True) -> bool:
+    def _check_initial_valid(self, announce: bool = True) -> bool:
         """
-        Kiểm tra đề ban đầu có vi phạm luật Sudoku không.
-        Dùng chung cho Solve & Step.
+        Kiểm tra đề hiện tại có vi phạm luật Sudoku không (dùng chung cho
+        Solve & Step). Đọc thẳng chỉ mục xung đột đã được cập nhật ở mỗi
+        lần sửa ô, không quét lại bảng.
         """
-        for r in range(9):
-            for c in range(9):
-                num = board[r][c]
-                if num != 0:
-                    board[r][c] = 0
-                    if not is_valid(board, r, c, num):
-                        board[r][c] = num
-                        if announce:
-                            msg = f"Giá trị ban đầu không hợp lệ tại ô ({r+1}, {c+1})."
-                            messagebox.showerror("Lỗi Sudoku", msg)
-                            self._set_status("Sudoku ban đầu không hợp lệ.", STATUS_ERR)
-                            self._set_solve_info(msg, STATUS_ERR)
-                            self._mark_single_error(r, c)
-                        return False
-                    board[r][c] = num
-        return True
-
-    def _mark_single_error(self, r: int, c: int) -> None:
-        self._reset_cell_colors()
-        self.entries[r][c].config(
-            bg="#fee2e2",
-            fg=ACCENT_DARK,
-            highlightbackground=ACCENT,
-        )
-        self._flash_board("#ffe4e6", CELL_BG, 4)
-        self._shake_grid()
+        if self.conflicts.valid:
+            return True
+        if announce:
+            r, c = divmod(min(self.conflicts.bad), 9)
+            msg = f"Giá trị ban đầu không hợp lệ tại ô ({r+1}, {c+1})."
+            messagebox.showerror("Lỗi Sudoku", msg)
+            self._set_status("Sudoku ban đầu không hợp lệ.", STATUS_ERR)
+            self._set_solve_info(msg, STATUS_ERR)
+            self._flash_board("#ffe4e6", CELL_BG, 4)
+            self._shake_grid()
+        return False
 
-    def _collect_violations(self, board: Board):
+    def _collect_violations(self):
         """
-        Thu thập chi tiết lỗi: trùng hàng, cột, ô 3x3.
+        Chi tiết lỗi trùng hàng, cột, khối 3x3 lấy từ chỉ mục xung đột.
         Trả về (list_message, set_cells_invalid).
         """
         errors = []
-        bad = set()
-
-        # hàng
-        for r in range(9):
-            seen = {}
-            for c in range(9):
-                v = board[r][c]
-                if v == 0:
-                    continue
-                if v in seen:
-                    c2 = seen[v]
-                    errors.append(
-                        f"Trùng số {v} trên hàng {r+1} (cột {c2+1} và {c+1})."
-                    )
-                    bad.add((r, c))
-                    bad.add((r, c2))
-                else:
-                    seen[v] = c
-
-        # cột
-        for c in range(9):
-            seen = {}
-            for r in range(9):
-                v = board[r][c]
-                if v == 0:
-                    continue
-                if v in seen:
-                    r2 = seen[v]
-                    errors.append(
-                        f"Trùng số {v} trên cột {c+1} (hàng {r2+1} và {r+1})."
-                    )
-                    bad.add((r, c))
-                    bad.add((r2, c))
-                else:
-                    seen[v] = r
-
-        # box
-        for br in range(0, 9, 3):
-            for bc in range(0, 9, 3):
-                seen = {}
-                for dr in range(3):
-                    for dc in range(3):
-                        r = br + dr
-                        c = bc + dc
-                        v = board[r][c]
-                        if v == 0:
-                            continue
-                        if v in seen:
-                            r2, c2 = seen[v]
-                            errors.append(
-                                f"Trùng số {v} trong khối 3x3 tại hàng {br+1}-{br+3}, cột {bc+1}-{bc+3} "
-                                f"({r2+1},{c2+1}) và ({r+1},{c+1})."
-                            )
-                            bad.add((r, c))
-                            bad.add((r2, c2))
-                        else:
-                            seen[v] = (r, c)
-
+        for u, v, cells in self.conflicts.violations():
+            where = ", ".join(f"({j // 9 + 1},{j % 9 + 1})" for j in cells)
+            if u < 9:
+                errors.append(f"Trùng số {v} trên hàng {u + 1}: {where}.")
+            elif u < 18:
+                errors.append(f"Trùng số {v} trên cột {u - 8}: {where}.")
+            else:
+                br, bc = (u - 18) // 3 * 3, (u - 18) % 3 * 3
+                errors.append(
+                    f"Trùng số {v} trong khối 3x3 tại hàng {br+1}-{br+3}, cột {bc+1}-{bc+3}: {where}."
+                )
+        bad = {divmod(i, 9) for i in self.conflicts.bad}
         return errors, bad
 
     def on_validate(self) -> None:
-        try:
-            board = self.get_board_from_entries()
-        except ValueError as e:
-            messagebox.showerror("Lỗi dữ liệu", str(e))
-            self._set_status("Lỗi dữ liệu đầu vào.", STATUS_ERR)
-            self._set_solve_info("Lỗi dữ liệu: kiểm tra lại các ô nhập.", STATUS_ERR)
-            self._flash_board("#ffe4e6", CELL_BG, 4)
-            self._shake_grid()
-            return
-
-        self._reset_cell_colors()
-        errors, bad = self._collect_violations(board)
+        self._reset_cell_colors()  # các ô trùng đã được tô đỏ sẵn
+        errors, _ = self._collect_violations()
 
         if not errors:
             self._set_status("Board hiện tại hợp lệ theo luật Sudoku.", STATUS_OK)
@@ -823,12 +949,6 @@ class SudokuGUI:
             )
             messagebox.showinfo("Hợp lệ", "Board hiện tại hợp lệ theo luật Sudoku.")
         else:
-            for (r, c) in bad:
-                self.entries[r][c].config(
-                    bg="#fee2e2",
-                    fg=ACCENT_DARK,
-                    highlightbackground=ACCENT,
-                )
             msg = "Phát hiện một số lỗi:\n\n" + "\n".join(errors)
             messagebox.showerror("Board có lỗi", msg)
             self._set_status("Board có lỗi. Các ô đỏ vi phạm luật Sudoku.", STATUS_ERR)
@@ -842,35 +962,14 @@ class SudokuGUI:
 
     def _generate_backtracking_steps(self, board: Board):
         """
-        Generator mô phỏng Backtracking.
-        Yield:
-          ("place", r, c, num, board_snapshot)
-          ("remove", r, c, 0, board_snapshot)
-          ("solved", board_snapshot)
-          ("nosolution", board_snapshot)
+        Generator mô phỏng Backtracking, chỉ phát delta của một ô (bộ nhớ
+        O(1) mỗi bước, không chụp lại bảng):
+          ("place", r, c, num)
+          ("remove", r, c, 0)
+          ("solved",)
+          ("nosolution",)
         """
-        work = [row[:] for row in board]
-
-        def backtrack():
-            pos = find_empty(work)
-            if pos is None:
-                yield ("solved", [row[:] for row in work])
-                return True
-            r, c = pos
-            for num in range(1, 10):
-                if is_valid(work, r, c, num):
-                    work[r][c] = num
-                    yield ("place", r, c, num, [row[:] for row in work])
-                    res = yield from backtrack()
-                    if res:
-                        return True
-                    work[r][c] = 0
-                    yield ("remove", r, c, 0, [row[:] for row in work])
-            return False
-
-        solved = yield from backtrack()
-        if not solved:
-            yield ("nosolution", [row[:] for row in work])
+        return iter_steps(board)
 
     def on_step_solve(self) -> None:
         if self.step_solver_running:
@@ -879,6 +978,9 @@ class SudokuGUI:
                 "Đang mô phỏng Backtracking. Vui lòng đợi hoàn tất.",
             )
             return
+        if self.solve_worker.running:
+            messagebox.showinfo("Đang giải", "Đang Solve. Đợi xong hoặc bấm Cancel.")
+            return
         try:
             board = self.get_board_from_entries()
         except ValueError as e:
@@ -892,11 +994,18 @@ class SudokuGUI:
             self._shake_grid()
             return
 
-        if not self._check_initial_valid(board, announce=True):
+        if not self._check_initial_valid(announce=True):
             return
 
         self.step_gen = self._generate_backtracking_steps(board)
         self.step_solver_running = True
+        self.step_count = 0
+        self.step_skip = False
+        self.step_hl_cell = None
+        self.step_trace = SearchTrace(board)
+        self.step_view = bytearray(self.step_trace.initial.cells)
+        self._update_trace_timeline()
+        self._reset_cell_colors()
 
         self._set_status("Mô phỏng Backtracking từng bước...", ACCENT)
         self._set_solve_info(
@@ -906,55 +1015,146 @@ class SudokuGUI:
 
         self._run_step_visual()
 
-    def _run_step_visual(self) -> None:
-        if not self.step_solver_running or self.step_gen is None:
+    def _update_trace_timeline(self) -> None:
+        trace = self.step_trace
+        n = len(trace) if trace is not None else 0
+        self.trace_scale.config(to=n)
+        self.trace_pos_var.set(n)
+        self.trace_pos_label.config(
+            text=f"{n:,} / {n:,}" if trace is not None else "chưa có trace"
+        )
+
+    def on_trace_step(self, delta: int) -> None:
+        """Lùi / tiến một bước trên timeline."""
+        self._seek_trace(self.trace_pos_var.get() + delta)
+
+    def _seek_trace(self, pos: int) -> None:
+        """
+        Hiển thị bảng sau pos bước của trace: keyframe gần nhất + delta, chỉ
+        ghi lại các ô khác với đang hiển thị. Bỏ qua khi đang mô phỏng.
+        """
+        trace = self.step_trace
+        if trace is None or self.step_solver_running:
             return
+        # Lưới đã bị sửa tay / load đề khác sau khi ghi => trace không còn khớp
         try:
-            step = next(self.step_gen)
-        except StopIteration:
-            self.step_solver_running = False
-            self.step_gen = None
+            shown = CompactBoard.from_rows(self.get_board_from_entries()).cells
+        except ValueError:
+            shown = None
+        if shown != self.step_view:
+            self.step_trace = self.step_view = None
+            self._update_trace_timeline()
+            self._set_status("Lưới đã thay đổi: trace cũ bị bỏ, chạy Step để ghi lại.", STATUS_NORMAL)
             return
 
-        kind = step[0]
-
-        if kind == "place":
-            _, r, c, num, board_snapshot = step
-            self.fill_entries_from_board(board_snapshot)
-            self.entries[r][c].config(
-                bg="#fef9c3",
+        pos = max(0, min(len(trace), pos))
+        if self.trace_pos_var.get() != pos:
+            self.trace_pos_var.set(pos)
+        cells = trace.board_at(pos).cells
+        grid = self.board_grid
+        view = self.step_view
+        for i in range(81):
+            if view[i] != cells[i]:
+                view[i] = cells[i]
+                grid.set_value(i // 9, i % 9, cells[i])
+                self.conflicts.set(i, cells[i])
+
+        if self.step_hl_cell is not None:
+            r, c = self.step_hl_cell
+            self.board_grid.set_style(r, c, bg=CELL_BG, fg=CELL_FG, border=CELL_BORDER)
+            self.step_hl_cell = None
+        if pos > 0:
+            kind, r, c, _ = trace.event(pos - 1)
+            self.board_grid.set_style(
+                r,
+                c,
+                bg="#fef9c3" if kind == "place" else "#fee2e2",
                 fg=ACCENT_DARK,
-                highlightbackground=ACCENT,
+                border=ACCENT,
             )
-        elif kind == "remove":
-            _, r, c, _, board_snapshot = step
-            self.fill_entries_from_board(board_snapshot)
-            self.entries[r][c].config(
-                bg="#fee2e2",
-                fg=ACCENT_DARK,
-                highlightbackground=ACCENT,
-            )
-        elif kind == "solved":
-            _, board_snapshot = step
-            self.fill_entries_from_board(board_snapshot)
+            self.step_hl_cell = (r, c)
+        self.trace_pos_label.config(text=f"{pos:,} / {len(trace):,}")
+
+    def on_step_skip(self) -> None:
+        """Tua nhanh tới bước gỡ số (quay lui) kế tiếp rồi chạy tiếp như cũ."""
+        if self.step_solver_running:
+            self.step_skip = True
+
+    def _run_step_visual(self) -> None:
+        """
+        Một khung hình của mô phỏng: lấy tối đa 2**mức bước (mức 0: 1 bước
+        mỗi step_delay_ms), gộp delta theo ô rồi chỉ cập nhật các ô bị chạm.
+        Mỗi khung không xử lý quá step_frame_budget_s để GUI vẫn mượt.
+        """
+        if not self.step_solver_running or self.step_gen is None:
+            return
+
+        level = self.step_speed_var.get()
+        limit = 1 << level
+        skip = self.step_skip
+        deadline = time.perf_counter() + self.step_frame_budget_s
+        touched: dict[tuple[int, int], int] = {}
+        record = self.step_trace.append
+        last = None
+        end = None
+        n = 0
+
+        for step in self.step_gen:
+            kind = step[0]
+            if kind not in ("place", "remove"):
+                end = kind
+                break
+            _, r, c, num = step
+            touched[(r, c)] = num
+            record(r, c, num)
+            last = step
+            n += 1
+            if skip:
+                if kind == "remove":
+                    self.step_skip = skip = False
+                    break
+                if not n & 1023 and time.perf_counter() > deadline:
+                    break
+            elif n >= limit or (not n & 1023 and time.perf_counter() > deadline):
+                break
+        else:
+            end = "nosolution"
+
+        self.step_count += n
+        view = self.step_view
+        for (r, c), num in touched.items():
+            if view[r * 9 + c] != num:
+                view[r * 9 + c] = num
+                self.board_grid.set_value(r, c, num)
+                self.conflicts.set(r * 9 + c, num)
+
+        if self.step_hl_cell is not None:
+            r, c = self.step_hl_cell
+            self.board_grid.set_style(r, c, bg=CELL_BG, fg=CELL_FG, border=CELL_BORDER)
+            self.step_hl_cell = None
+
+        if end is not None:
+            self.step_trace.finish(end)
+        self._update_trace_timeline()
+
+        if end == "solved":
             self._set_status("Backtracking: đã tìm thấy lời giải.", STATUS_OK)
             self._set_solve_info(
-                "Mô phỏng Backtracking hoàn tất: đã tìm thấy lời giải.",
+                f"Mô phỏng Backtracking hoàn tất sau {self.step_count:,} bước: "
+                "đã tìm thấy lời giải.",
                 STATUS_OK,
             )
             self._flash_board("#bbf7d0", CELL_BG, 4)
             self.step_solver_running = False
             self.step_gen = None
             return
-        elif kind == "nosolution":
-            _, board_snapshot = step
-            self.fill_entries_from_board(board_snapshot)
+        if end == "nosolution":
             self._set_status(
                 "Backtracking: không tìm được lời giải cho board này.",
                 STATUS_ERR,
             )
             self._set_solve_info(
-                "Mô phỏng Backtracking chạy hết mà không tìm thấy lời giải.",
+                f"Mô phỏng Backtracking chạy hết {self.step_count:,} bước mà không tìm thấy lời giải.",
                 STATUS_ERR,
             )
             self._flash_board("#ffe4e6", CELL_BG, 4)
@@ -963,7 +1163,21 @@ class SudokuGUI:
             self.step_gen = None
             return
 
-        self.root.after(self.step_delay_ms, self._run_step_visual)
+        if last is not None:
+            kind, r, c, _ = last
+            self.board_grid.set_style(
+                r,
+                c,
+                bg="#fef9c3" if kind == "place" else "#fee2e2",
+                fg=ACCENT_DARK,
+                border=ACCENT,
+            )
+            self.step_hl_cell = (r, c)
+        if level > 0 or skip:
+            self._set_solve_info(f"Đang mô phỏng Backtracking... bước {self.step_count:,}", ACCENT)
+
+        delay = self.step_delay_ms if level == 0 and not skip else self.step_frame_ms
+        self.root.after(delay, self._run_step_visual)
 
     # ========= ANIMATIONS =========
 
@@ -972,10 +1186,7 @@ class SudokuGUI:
             if n <= 0:
                 self._reset_cell_colors()
                 return
-            bg = color1 if n % 2 == 0 else color2
-            for r in range(9):
-                for c in range(9):
-                    self.entries[r][c].config(bg=bg)
+            self.board_grid.fill_bg(color1 if n % 2 == 0 else color2)
             self.root.after(80, step, n - 1)
 
         step(times)
@@ -1173,6 +1384,8 @@ class SudokuGUI:
                 "Đang chạy Step-by-step. Đợi xong hoặc Clear rồi Solve lại.",
             )
             return
+        if self.solve_worker.running:
+            return
         try:
             board = self.get_board_from_entries()
         except ValueError as e:
@@ -1186,19 +1399,108 @@ class SudokuGUI:
             self._shake_grid()
             return
 
-        if not self._check_initial_valid(board, announce=True):
+        if not self._check_initial_valid(announce=True):
             return
 
-        self._set_status("Đang giải bằng Backtracking...", ACCENT)
-        self._set_solve_info("Đang giải...", ACCENT)
-        self.root.update_idletasks()
-
+        engine = self.engine_var.get() or DEFAULT_ENGINE
+        self.solve_engine = engine
+        self.solve_puzzle = board
         start = time.perf_counter()
-        solved = solve_sudoku(board)
-        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        result, self.solve_cache_slot = self.solution_cache.lookup(
+            board, engine, collect_stats=True
+        )
+        if result is not None:
+            # Đề (hoặc đề đối xứng với nó) vừa giải trong phiên này
+            result.elapsed_ms = (time.perf_counter() - start) * 1000.0
+            self._finish_solve(result)
+            return
+        store = self._get_store()
+        cached = store.get(board) if store is not None else None
+        if cached is not None:
+            # Trùng đề đã giải: lấy từ store ngay, không cần process con
+            stats = SolveStats()
+            stats.cache_hits = 1
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            self._finish_solve(SolveResult(engine, 1, cached, elapsed_ms, True, stats))
+            return
+
+        self.solve_started = time.perf_counter()
+        progress = self.solve_progress_var.get()
+        self.solve_worker.start(board, engine=engine, progress=progress, collect_stats=progress)
+        self.solve_btn.config(state="disabled")
+        self.cancel_btn.config(state="normal")
+        self._set_status(f"Đang giải bằng {engine}...", ACCENT)
+        self._set_solve_info("Đang giải... (Cancel để dừng)", ACCENT)
+        self.root.after(self.solve_poll_ms, self._poll_solve)
+
+    def _poll_solve(self) -> None:
+        """Đọc tin nhắn của process giải; chỉ hiển thị tiến độ mới nhất."""
+        if not self.solve_worker.running:
+            return
+        progress = None
+        for msg in self.solve_worker.poll():
+            kind = msg[0]
+            if kind == "progress":
+                progress = msg
+            elif kind == "done":
+                self._finish_solve(msg[1])
+                return
+            elif kind == "error":
+                self._solve_controls_idle()
+                self._set_status("Lỗi khi giải.", STATUS_ERR)
+                self._set_solve_info(msg[1], STATUS_ERR)
+                messagebox.showerror("Lỗi khi giải", msg[1])
+                return
+        if progress is not None:
+            _, nodes, depth, elapsed_ms = progress
+            self._set_solve_info(
+                f"Đang giải ({self.solve_engine})... {nodes:,} nút • "
+                f"độ sâu {depth} • {elapsed_ms:.0f} ms",
+                ACCENT,
+            )
+        elif not self.solve_progress_var.get():
+            elapsed_ms = (time.perf_counter() - self.solve_started) * 1000.0
+            self._set_solve_info(
+                f"Đang giải ({self.solve_engine})... {elapsed_ms:.0f} ms (Cancel để dừng)",
+                ACCENT,
+            )
+        self.root.after(self.solve_poll_ms, self._poll_solve)
 
-        if solved:
+    def on_cancel_solve(self) -> None:
+        if not self.solve_worker.running:
+            return
+        self._cancel_solve_worker()
+        self._set_status("Đã huỷ giải.", STATUS_NORMAL)
+        self._set_solve_info("Đã huỷ. Có thể sửa đề rồi Solve lại.", TEXT_MUTED)
+
+    def _cancel_solve_worker(self) -> None:
+        """Terminate process giải (không chờ), reap dần bằng root.after."""
+        self.solve_worker.cancel()
+        self._solve_controls_idle()
+        self.root.after(self.solve_poll_ms, self._reap_solve_worker)
+
+    def _reap_solve_worker(self) -> None:
+        if not self.solve_worker.reap():
+            self.root.after(self.solve_poll_ms, self._reap_solve_worker)
+
+    def _solve_controls_idle(self) -> None:
+        self.solve_btn.config(state="normal")
+        self.cancel_btn.config(state="disabled")
+
+    def _finish_solve(self, result: SolveResult) -> None:
+        self._solve_controls_idle()
+        engine = self.solve_engine if not result.from_store else f"{result.engine}, từ store"
+        elapsed_ms = result.elapsed_ms
+        summary = result.stats.summary() if result.stats is not None else ""
+        self.solution_cache.put(self.solve_puzzle, result, self.solve_cache_slot)
+
+        if result.solved:
+            board = result.board
             self.fill_entries_from_board(board)
+            store = self._get_store()
+            from_cache = result.stats is not None and result.stats.cache_hits
+            if store is not None and not result.from_store and not from_cache:
+                store.put(self.solve_puzzle, board)
 
             base = os.path.dirname(os.path.abspath(__file__))
             out_dir = os.path.join(base, "output")
@@ -1217,7 +1519,9 @@ class SudokuGUI:
 
             self._set_status("Đã giải xong Sudoku.", STATUS_OK)
             self._set_solve_info(
-                f"Đã giải. Thời gian: {elapsed_ms:.3f} ms • Đã lưu: output/{fname}",
+                f"Đã giải ({engine}). Thời gian: {elapsed_ms:.3f} ms • "
+                + (f"{summary} • " if summary else "")
+                + f"Đã lưu: output/{fname}",
                 STATUS_OK,
             )
             self._flash_board("#bbf7d0", CELL_BG, 4)
@@ -1229,23 +1533,39 @@ class SudokuGUI:
             self.refresh_file_lists()
             if fname in self.output_files:
                 self.output_var.set(fname)
-        else:
+        elif result.status is SolveStatus.NO_SOLUTION:
             txt = "Không tìm được lời giải hợp lệ cho Sudoku này."
             self._set_status("Không tìm được lời giải.", STATUS_ERR)
-            self._set_solve_info(txt, STATUS_ERR)
+            self._set_solve_info(f"{txt} ({summary})" if summary else txt, STATUS_ERR)
             self._flash_board("#ffe4e6", CELL_BG, 4)
             self._shake_grid()
             messagebox.showwarning("Không có lời giải", txt)
+        else:
+            # TIMEOUT / BUDGET_EXHAUSTED nếu solve() được truyền giới hạn
+            self._set_status(f"Dừng giải: {result.status}.", STATUS_NORMAL)
+            self._set_solve_info(summary, TEXT_MUTED)
+
+    def _get_store(self) -> SolutionStore | None:
+        """Mở output/solution_store.sqlite3; lỗi mở store thì giải bình thường."""
+        if self.solution_store is None:
+            base = os.path.dirname(os.path.abspath(__file__))
+            path = os.path.join(base, "output", "solution_store.sqlite3")
+            try:
+                self.solution_store = SolutionStore(path)
+            except Exception:
+                return None
+        return self.solution_store
 
     def on_clear(self) -> None:
         if self.step_solver_running:
             self.step_solver_running = False
             self.step_gen = None
-        for r in range(9):
-            for c in range(9):
-                self.entries[r][c].delete(0, tk.END)
-        self._reset_cell_colors()
+        if self.solve_worker.running:
+            self._cancel_solve_worker()
+        self.step_trace = self.step_view = None
+        self._update_trace_timeline()
         self.selected_cell = None
+        self.fill_entries_from_board([[0] * 9 for _ in range(9)])
         self.current_input_file = None
         self.original_board = None
         self._set_status("Đã xoá toàn bộ lưới.", STATUS_NORMAL)
@@ -0,0 +1,225 @@
+from typing import Iterator, List, Tuple
+
+from sudoku_utils import Board
+from sudoku_bitmask import BitmaskSolver, InstrumentedBitmaskSolver, ROW_OF, COL_OF, BOX_OF
+
+# Sự kiện của steps():
+#   ("place", r, c, num)   đặt num vào ô (r, c)
+#   ("remove", r, c, 0)    gỡ số ở ô (r, c) khi quay lui
+#   ("solved",)            tìm thấy lời giải
+#   ("nosolution",)        đã thử hết, không có lời giải
+Step = Tuple
+
+
+class IterativeSolver(BitmaskSolver):
+    """
+    Engine bitmask không đệ quy: thay call stack bằng các mảng cấp phát sẵn
+    81 phần tử (ô đang xét, mask ứng viên còn lại, chữ số đã đặt, mốc trail).
+    - Không tạo frame / generator lồng nhau ở mỗi nút => bớt overhead.
+    - Độ sâu không phụ thuộc recursion limit, an toàn trong thread stack nhỏ.
+    - solve() giải nhanh, steps() phát từng bước place / remove cho GUI.
+    Hỗ trợ cùng các chế độ với BitmaskSolver: branching "row" / "mrv" và
+    propagate (naked / hidden single, chỉ với "mrv").
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.stack_cell: List[int] = [0] * 81
+        self.stack_cand: List[int] = [0] * 81
+        self.stack_bit: List[int] = [0] * 81
+        self.stack_mark: List[int] = [0] * 81
+
+    def solve(self, branching: str = "mrv", propagate: bool = True) -> bool:
+        """Giải tới lời giải đầu tiên, kết quả nằm trong self.cells."""
+        run = self._run(branching, propagate, emit=False)
+        try:
+            next(run)
+        except StopIteration as stop:
+            return stop.value
+        raise RuntimeError("Engine lặp phát sự kiện khi emit=False.")
+
+    def steps(self, branching: str = "row", propagate: bool = False) -> Iterator[Step]:
+        """
+        Generator phát từng bước Backtracking (mặc định giống find_empty +
+        thử 1..9), kết thúc bằng ("solved",) hoặc ("nosolution",).
+        """
+        solved = yield from self._run(branching, propagate, emit=True)
+        yield ("solved",) if solved else ("nosolution",)
+
+    def _run(self, branching: str, propagate: bool, emit: bool):
+        if branching == "row":
+            if propagate:
+                raise ValueError("propagate chỉ dùng được với branching='mrv'.")
+            mrv = False
+            empties = [i for i in range(81) if self.cells[i] == 0]
+        elif branching == "mrv":
+            mrv = True
+            empties = []
+            self._init_buckets()
+            self.propagate = propagate
+            self.trail.clear()
+        else:
+            raise ValueError(f"Chế độ rẽ nhánh không hợp lệ: {branching}")
+
+        stack_cell = self.stack_cell
+        stack_cand = self.stack_cand
+        stack_bit = self.stack_bit
+        stack_mark = self.stack_mark
+        cells = self.cells
+        rows = self.rows
+        cols = self.cols
+        boxes = self.boxes
+        place_mrv = self._place_mrv
+        undo_mrv = self._undo_mrv
+        trail = self.trail if mrv else []
+        n_empty = len(empties)
+
+        depth = 0
+        descend = True
+        while True:
+            if descend:
+                # ----- Vào một nút mới ở độ sâu depth -----
+                mark = len(trail)
+                dead = False
+                if mrv:
+                    if propagate:
+                        dead = not self._propagate()
+                        if emit:
+                            for i, _ in trail[mark:]:
+                                yield ("place", ROW_OF[i], COL_OF[i], cells[i])
+                    if not dead:
+                        i = self._pick_mrv()
+                        if i == -1:
+                            return True
+                        if i == -2:
+                            dead = True
+                else:
+                    if depth == n_empty:
+                        return True
+                    i = empties[depth]
+
+                if dead:
+                    if emit:
+                        yield from self._rewind(mark)
+                    else:
+                        self._undo_trail(mark)
+                else:
+                    stack_cell[depth] = i
+                    stack_cand[depth] = self.candidates(i)
+                    stack_bit[depth] = 0
+                    stack_mark[depth] = mark
+                    depth += 1
+                descend = False
+
+            # ----- Thử ứng viên tiếp theo của nút trên cùng -----
+            if depth == 0:
+                return False
+            top = depth - 1
+            i = stack_cell[top]
+            bit = stack_bit[top]
+            if bit:
+                if mrv:
+                    undo_mrv(i, bit)
+                else:
+                    cells[i] = 0
+                    rows[ROW_OF[i]] ^= bit
+                    cols[COL_OF[i]] ^= bit
+                    boxes[BOX_OF[i]] ^= bit
+                stack_bit[top] = 0
+                if emit:
+                    yield ("remove", ROW_OF[i], COL_OF[i], 0)
+
+            cand = stack_cand[top]
+            if cand:
+                bit = cand & -cand
+                stack_cand[top] = cand ^ bit
+                stack_bit[top] = bit
+                if mrv:
+                    place_mrv(i, bit)
+                else:
+                    cells[i] = bit.bit_length() - 1
+                    rows[ROW_OF[i]] |= bit
+                    cols[COL_OF[i]] |= bit
+                    boxes[BOX_OF[i]] |= bit
+                if emit:
+                    yield ("place", ROW_OF[i], COL_OF[i], bit.bit_length() - 1)
+                descend = True
+            else:
+                # Hết ứng viên: gỡ các ô lan truyền của nút này rồi quay lui
+                depth = top
+                if not mrv:
+                    continue
+                if emit:
+                    yield from self._rewind(stack_mark[top])
+                else:
+                    self._undo_trail(stack_mark[top])
+
+    def _rewind(self, mark: int) -> Iterator[Step]:
+        """Như _undo_trail nhưng phát "remove" cho từng ô được gỡ."""
+        trail = self.trail
+        while len(trail) > mark:
+            i, bit = trail.pop()
+            self._undo_mrv(i, bit)
+            yield ("remove", ROW_OF[i], COL_OF[i], 0)
+
+
+class InstrumentedIterativeSolver(IterativeSolver, InstrumentedBitmaskSolver):
+    """
+    IterativeSolver có đếm vào self.stats. Chế độ "mrv" dùng chung các hàm
+    bọc của InstrumentedBitmaskSolver (_run gọi qua self._place_mrv, ...);
+    chế độ "row" đặt / gỡ inline nên đếm qua các sự kiện của steps().
+    """
+
+    def solve(self, branching: str = "mrv", propagate: bool = True) -> bool:
+        stats = self.stats
+        self._live = stats.placements - stats.undos
+        if branching != "row":
+            return super().solve(branching, propagate)
+
+        depth = 0
+        stats.nodes += 1
+        for event in self.steps("row", propagate):
+            kind = event[0]
+            if kind == "place":
+                stats.placements += 1
+                stats.nodes += 1
+                if self.budget is not None:
+                    self.budget.tick()
+                depth += 1
+                stats.depth = depth
+                if depth > stats.max_depth:
+                    stats.max_depth = depth
+            elif kind == "remove":
+                stats.undos += 1
+                stats.backtracks += 1
+                depth -= 1
+            else:
+                return kind == "solved"
+        return False
+
+
+def solve_sudoku_iterative(
+    board: Board, branching: str = "mrv", propagate: bool = True
+) -> bool:
+    """
+    Giải Sudoku bằng engine lặp (không đệ quy), ghi lời giải vào board.
+    """
+    solver = IterativeSolver()
+    if not solver.load(board):
+        return False
+    if not solver.solve(branching, propagate and branching == "mrv"):
+        return False
+    solver.export(board)
+    return True
+
+
+def iter_steps(board: Board) -> Iterator[Step]:
+    """
+    Các bước Backtracking theo đúng thứ tự của solve_sudoku_backtracking
+    (ô trống theo hàng, thử 1..9), không đệ quy. Không thay đổi board.
+    """
+    solver = IterativeSolver()
+    if not solver.load(board):
+        yield ("nosolution",)
+        return
+    yield from solver.steps("row", propagate=False)
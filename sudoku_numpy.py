@@ -0,0 +1,186 @@
+from typing import Iterable, Iterator, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy là phụ thuộc tuỳ chọn, chỉ cần cho engine vector hoá
+    np = None
+
+from sudoku_utils import Board
+from sudoku_bitmask import BOX_OF, COL_OF, FULL_MASK, POPCOUNT, ROW_OF, UNITS
+from sudoku_solver import DEFAULT_ENGINE, SolveResult, solve_many
+
+# Trạng thái từng board sau lan truyền vector hoá
+STATUS_SOLVED = 1  # điền kín chỉ bằng naked / hidden single
+STATUS_STUCK = 0  # còn ô trống, cần engine vô hướng rẽ nhánh
+STATUS_DEAD = -1  # mâu thuẫn => vô nghiệm
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "Engine vector hoá cần numpy. Cài bằng: pip install numpy"
+        )
+
+
+class _Tables:
+    """Bảng tra dạng mảng numpy, tạo một lần khi dùng lần đầu."""
+
+    def __init__(self) -> None:
+        self.units = np.array(UNITS, dtype=np.intp)  # (27, 9)
+        # 3 đơn vị (hàng, cột, khối) của mỗi ô, đánh số trong 0..26
+        self.cell_units = np.array(
+            [[ROW_OF[i], 9 + COL_OF[i], 18 + BOX_OF[i]] for i in range(81)],
+            dtype=np.intp,
+        )  # (81, 3)
+        self.digit_bit = np.array([0] + [1 << d for d in range(1, 10)], dtype=np.uint16)
+        self.popcount = np.array(POPCOUNT, dtype=np.int8)
+        # Mask 1 bit -> chữ số, mask khác -> 0
+        single = np.zeros(1 << 10, dtype=np.int8)
+        for d in range(1, 10):
+            single[1 << d] = d
+        self.single_digit = single
+        self.bits = np.array([1 << d for d in range(1, 10)], dtype=np.uint16)  # (9,)
+
+
+_tables = None
+
+
+def _get_tables() -> _Tables:
+    global _tables
+    if _tables is None:
+        _require_numpy()
+        _tables = _Tables()
+    return _tables
+
+
+def boards_to_array(boards: Iterable[Board]) -> "np.ndarray":
+    """Chuyển list board 9x9 thành mảng (N, 81) int8."""
+    _require_numpy()
+    flat = [num for board in boards for row in board for num in row]
+    return np.array(flat, dtype=np.int8).reshape(-1, 81)
+
+
+def propagate_array(grid: "np.ndarray") -> "np.ndarray":
+    """
+    Lan truyền naked single + hidden single cho cả N board cùng lúc.
+    grid: (N, 81) int8, sửa tại chỗ. Trả về mảng trạng thái (N,)
+    gồm STATUS_SOLVED / STATUS_STUCK / STATUS_DEAD.
+    Mỗi vòng chỉ xử lý các board còn thay đổi được, nên board dễ rơi khỏi
+    vòng lặp sớm và chi phí dồn vào số ít board khó.
+    """
+    t = _get_tables()
+    n = grid.shape[0]
+    status = np.full(n, STATUS_STUCK, dtype=np.int8)
+    active = np.arange(n)
+
+    while active.size:
+        g = grid[active]  # (A, 81)
+        bits = t.digit_bit[g]  # (A, 81) uint16
+
+        # Mask chữ số đã dùng của 27 đơn vị + phát hiện trùng số:
+        # các bit là luỹ thừa 2 khác nhau nên tổng == OR <=> không trùng.
+        unit_bits = bits[:, t.units]  # (A, 27, 9)
+        used = np.bitwise_or.reduce(unit_bits, axis=2)  # (A, 27)
+        dup = (unit_bits.sum(axis=2, dtype=np.int32) != used).any(axis=1)
+
+        cell_used = np.bitwise_or.reduce(used[:, t.cell_units], axis=2)  # (A, 81)
+        empty = g == 0
+        cand = np.where(empty, ~cell_used & FULL_MASK, 0).astype(np.uint16)
+
+        # Ô trống hết ứng viên / chữ số không còn chỗ trong đơn vị => mâu thuẫn
+        no_cand = (empty & (cand == 0)).any(axis=1)
+        unit_cand = np.bitwise_or.reduce(cand[:, t.units], axis=2)  # (A, 27)
+        missing = ((unit_cand | used) != FULL_MASK).any(axis=1)
+        dead = dup | no_cand | missing
+
+        solved = ~dead & ~empty.any(axis=1)
+        status[active[dead]] = STATUS_DEAD
+        status[active[solved]] = STATUS_SOLVED
+
+        live = ~dead & ~solved
+        if not live.any():
+            break
+        g = g[live]
+        cand = cand[live]
+        empty = empty[live]
+        idx = active[live]
+
+        # Naked single
+        naked = t.single_digit[cand]  # (L, 81), 0 nếu không phải single
+        has_naked = (naked > 0).any(axis=1)
+        g = np.where(naked > 0, naked, g)
+
+        # Hidden single, chỉ cho board chưa có naked single ở vòng này
+        # (tránh gán chồng hai kết luận lên cùng ô trong một lượt)
+        rest = ~has_naked
+        has_hidden = np.zeros_like(has_naked)
+        if rest.any():
+            cr = cand[rest]  # (R, 81)
+            uc = cr[:, t.units]  # (R, 27, 9)
+            # hit[r, u, k, d] = ô thứ k của đơn vị u có ứng viên d
+            hit = (uc[..., None] & t.bits) != 0  # (R, 27, 9, 9)
+            once = hit.sum(axis=2) == 1  # (R, 27, 9)
+            place = hit & once[:, :, None, :]  # (R, 27, 9, 9)
+            r_i, u_i, k_i, d_i = np.nonzero(place)
+            gr = g[rest]
+            gr[r_i, t.units[u_i, k_i]] = (d_i + 1).astype(np.int8)
+            g[rest] = gr
+            has_hidden[np.flatnonzero(rest)[np.unique(r_i)]] = True
+
+        grid[idx] = g
+        progress = has_naked | has_hidden
+        active = idx[progress]
+
+    return status
+
+
+def solve_array(
+    grid: "np.ndarray", engine: str = DEFAULT_ENGINE
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Giải N board dạng (N, 81). Trả về (lời giải (N, 81), solved (N,) bool).
+    Bước 1 lan truyền vector hoá cho cả lô; bước 2 chỉ các board còn kẹt
+    mới chuyển sang engine vô hướng (solve_many) để rẽ nhánh.
+    """
+    grid = np.array(grid, dtype=np.int8).reshape(-1, 81)
+    status = propagate_array(grid)
+    solved = status == STATUS_SOLVED
+
+    stuck = np.flatnonzero(status == STATUS_STUCK)
+    if stuck.size:
+        boards = ([row.tolist() for row in grid[i].reshape(9, 9)] for i in stuck)
+        for i, result in zip(stuck, solve_many(boards, engine=engine)):
+            if result.solved:
+                grid[i] = np.array(result.board, dtype=np.int8).reshape(81)
+                solved[i] = True
+    return grid, solved
+
+
+def solve_many_vectorized(
+    boards: Iterable[Board],
+    batch_size: int = 4096,
+    engine: str = DEFAULT_ENGINE,
+) -> Iterator[SolveResult]:
+    """
+    Như solve_many() nhưng gom board thành lô batch_size để lan truyền bằng
+    numpy. Kết quả vẫn trả theo thứ tự đầu vào; bộ nhớ chỉ tỉ lệ với batch_size.
+    """
+    _require_numpy()
+    batch: List[Board] = []
+    for board in boards:
+        batch.append(board)
+        if len(batch) >= batch_size:
+            yield from _solve_batch(batch, engine)
+            batch = []
+    if batch:
+        yield from _solve_batch(batch, engine)
+
+
+def _solve_batch(batch: List[Board], engine: str) -> Iterator[SolveResult]:
+    grid, solved = solve_array(boards_to_array(batch), engine)
+    for k in range(len(batch)):
+        if solved[k]:
+            board = grid[k].reshape(9, 9).tolist()
+            yield SolveResult("numpy", 1, board)
+        else:
+            yield SolveResult("numpy", 0, None)
@@ -0,0 +1,129 @@
+from typing import List, Optional
+
+from sudoku_utils import Board, box_size_of
+from sudoku_bitmask import BitmaskSolver, InstrumentedBitmaskSolver
+
+
+class NxNSolver(BitmaskSolver):
+    """
+    Engine MRV + naked / hidden single cho Sudoku n×n (4×4, 9×9, 16×16,
+    25×25, 36×36, ...). Đặt / gỡ số, bucket MRV, trail và hàng đợi đơn vị
+    bẩn dùng chung với BitmaskSolver (tham số box); chỉ phần tìm kiếm khác:
+    không đệ quy mà đi bằng các mảng stack cấp phát sẵn n*n phần tử (ô đang
+    xét, mask ứng viên còn lại, chữ số đã đặt, mốc trail), như
+    IterativeSolver, nên độ sâu không bị recursion limit chặn (bảng 36×36
+    trống cần hơn 1000 mức rẽ nhánh).
+    Một instance dùng lại được cho nhiều đề cùng kích thước.
+    """
+
+    def __init__(self, box: int) -> None:
+        super().__init__(box)
+        size = self.geo.size
+        self.stack_cell: List[int] = [0] * size
+        self.stack_cand: List[int] = [0] * size
+        self.stack_bit: List[int] = [0] * size
+        self.stack_mark: List[int] = [0] * size
+        self.solution: Optional[List[int]] = None
+
+    def solve(self) -> bool:
+        """Tìm một lời giải, kết quả nằm trong self.cells."""
+        self.solution = None
+        return self._run(1, keep=True) > 0
+
+    def count(self, limit: int = 2) -> int:
+        """
+        Đếm số lời giải, dừng khi đạt limit. Lời giải đầu tiên lưu ở
+        self.solution; self.cells trở về trạng thái vừa load().
+        """
+        self.solution = None
+        return self._run(limit, keep=False)
+
+    def solution_board(self) -> Optional[Board]:
+        if self.solution is None:
+            return None
+        n = self.n
+        return [self.solution[r * n:r * n + n] for r in range(n)]
+
+    def _run(self, limit: int, keep: bool) -> int:
+        """
+        MRV + lan truyền bằng stack tường minh, dừng khi tìm đủ limit lời giải.
+        keep=True: dừng ngay ở lời giải đầu tiên, để nguyên nó trong self.cells.
+        keep=False: gỡ hết về trạng thái vừa load() trước khi trả về.
+        """
+        self._init_buckets()
+        self.propagate = True
+        self.trail.clear()
+
+        stack_cell = self.stack_cell
+        stack_cand = self.stack_cand
+        stack_bit = self.stack_bit
+        stack_mark = self.stack_mark
+        trail = self.trail
+        place_mrv = self._place_mrv
+        undo_mrv = self._undo_mrv
+
+        found = 0
+        depth = 0
+        while True:
+            # ----- Vào một nút mới ở độ sâu depth -----
+            mark = len(trail)
+            i = self._pick_mrv() if self._propagate() else -2
+            if i == -1:
+                found += 1
+                if found == 1:
+                    self.solution = self.cells[:]
+                if keep:
+                    return found
+                self._undo_trail(mark)
+            elif i == -2:
+                self._undo_trail(mark)
+            else:
+                stack_cell[depth] = i
+                stack_cand[depth] = self.candidates(i)
+                stack_bit[depth] = 0
+                stack_mark[depth] = mark
+                depth += 1
+
+            # ----- Quay lui tới nút còn ứng viên, thử ứng viên tiếp theo -----
+            while depth:
+                top = depth - 1
+                i = stack_cell[top]
+                bit = stack_bit[top]
+                if bit:
+                    undo_mrv(i, bit)
+                cand = stack_cand[top] if found < limit else 0
+                if cand:
+                    bit = cand & -cand
+                    stack_cand[top] = cand ^ bit
+                    stack_bit[top] = bit
+                    place_mrv(i, bit)
+                    break
+                # Hết ứng viên (hoặc đã đủ limit): gỡ các ô lan truyền của nút này
+                depth = top
+                self._undo_trail(stack_mark[top])
+            else:
+                return found
+
+
+class InstrumentedNxNSolver(NxNSolver, InstrumentedBitmaskSolver):
+    """
+    NxNSolver có đếm vào self.stats và kiểm tra self.budget, dùng chung các
+    hàm bọc của InstrumentedBitmaskSolver (_run gọi qua self._pick_mrv, ...).
+    """
+
+    def solve(self) -> bool:
+        self._live = self.stats.placements - self.stats.undos
+        return super().solve()
+
+    def count(self, limit: int = 2) -> int:
+        self._live = self.stats.placements - self.stats.undos
+        return super().count(limit)
+
+
+def solve_sudoku_nxn(board: Board) -> bool:
+    """Giải bảng n×n bất kỳ (n chính phương), ghi lời giải vào board."""
+    solver = NxNSolver(box_size_of(len(board)))
+    if not solver.load(board) or not solver.solve():
+        return False
+    solver.export(board)
+    return True
@@ -0,0 +1,60 @@
+import cProfile
+import pstats
+import sys
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Cột sắp xếp của báo cáo hàm nóng (xem pstats.SortKey)
+DEFAULT_SORT = "tottime"
+DEFAULT_TOP = 25
+
+
+def add_profile_arguments(parser) -> None:
+    """Thêm --profile / --profile-out vào một argparse.ArgumentParser."""
+    group = parser.add_argument_group("profiling")
+    group.add_argument(
+        "--profile",
+        action="store_true",
+        help="Chạy dưới cProfile và in các hàm tốn thời gian nhất.",
+    )
+    group.add_argument(
+        "--profile-out",
+        metavar="FILE",
+        help="Ghi dữ liệu pstats ra FILE (xem bằng snakeviz / flameprof / "
+        "gprof2dot); tự bật --profile.",
+    )
+
+
+@contextmanager
+def profiled(
+    enabled: bool,
+    out_path: Optional[str] = None,
+    sort: str = DEFAULT_SORT,
+    top: int = DEFAULT_TOP,
+    stream=None,
+) -> Iterator[Optional[cProfile.Profile]]:
+    """
+    Bọc một đoạn code bằng cProfile khi enabled (hoặc có out_path).
+    Khi kết thúc: in top hàm theo sort (mặc định tottime = thời gian trong
+    chính hàm đó, vd. is_valid vs find_empty) ra stream (mặc định stderr để
+    không lẫn với kết quả trên stdout), và dump_stats ra out_path nếu có.
+    Tắt thì không cài hook nào, code chạy như bình thường.
+    """
+    if not enabled and not out_path:
+        yield None
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        stream = stream or sys.stderr
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.strip_dirs().sort_stats(sort).print_stats(top)
+        if out_path:
+            # dump_stats dùng dữ liệu gốc (chưa strip_dirs) để công cụ ngoài
+            # còn đường dẫn file đầy đủ
+            profiler.dump_stats(out_path)
+            print(f"Đã ghi pstats: {out_path}", file=stream)
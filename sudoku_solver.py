@@ -1,18 +1,542 @@
+import argparse
 import os
 import sys
+import threading
 import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from sudoku_utils import (
     Board,
+    CompactBoard,
+    box_size_of,
     read_board_from_file,
+    read_board_nxn,
     write_board_to_file,
+    write_board_nxn,
     print_board,
+    print_board_nxn,
     find_empty,
     is_valid,
+    _validate_initial_board,
 )
+from sudoku_bitmask import BitmaskSolver, InstrumentedBitmaskSolver
+from sudoku_dlx import DLXSolver, InstrumentedDLXSolver
+from sudoku_iterative import InstrumentedIterativeSolver, IterativeSolver
+from sudoku_nxn import InstrumentedNxNSolver, NxNSolver
+from sudoku_budget import Budget, CancelToken, SolveInterrupted, SolveStatus
+from sudoku_stats import SolveStats
 
+if TYPE_CHECKING:
+    from sudoku_cache import SolutionCache
+    from sudoku_store import SolutionStore
 
-def solve_sudoku(board: Board) -> bool:
+
+# ========= ENGINE REGISTRY =========
+
+# Hàm chạy của một engine: run(board, limit, **options) -> (số lời giải, lời giải đầu tiên)
+# - Không được thay đổi board đầu vào.
+# - limit: số lời giải tối đa cần tìm (chỉ engine counting mới hỗ trợ limit > 1).
+# - stats: SolveStats cần điền, chỉ được truyền khi solve(..., collect_stats=True).
+# - budget: Budget cần tick() ở mỗi nút, chỉ được truyền khi có timeout_ms /
+#   max_nodes / cancel; engine raise SolveInterrupted khi phải dừng.
+EngineRun = Callable[..., Tuple[int, Optional[Board]]]
+# Tạo một hàm run giữ sẵn bộ nhớ tạm (mask, stack, ma trận DLX...) để dùng lại
+# cho nhiều đề liên tiếp trong solve_many().
+EngineSession = Callable[[], EngineRun]
+
+
+@dataclass(frozen=True)
+class EngineInfo:
+    """Mô tả một engine giải và các khả năng của nó."""
+
+    name: str
+    run: EngineRun
+    description: str = ""
+    counting: bool = False  # đếm được nhiều lời giải (limit > 1)
+    stepping: bool = False  # phát được từng bước place / remove
+    nxn: bool = False  # giải được bảng N×N (16×16, 25×25, ...)
+    session: Optional[EngineSession] = None
+
+
+ENGINE_REGISTRY: Dict[str, EngineInfo] = {}
+DEFAULT_ENGINE = "bitmask"
+
+
+def register_engine(info: EngineInfo) -> None:
+    """Đăng ký (hoặc thay thế) một engine theo tên."""
+    ENGINE_REGISTRY[info.name] = info
+
+
+def get_engine(name: str) -> EngineInfo:
+    try:
+        return ENGINE_REGISTRY[name]
+    except KeyError:
+        raise ValueError(
+            f"Engine không hợp lệ: {name}. Có: {', '.join(ENGINE_REGISTRY)}."
+        ) from None
+
+
+def engine_names() -> List[str]:
+    return list(ENGINE_REGISTRY)
+
+
+class SolveResult:
+    """
+    Kết quả của solve():
+    - solved: có ít nhất một lời giải.
+    - status: SolveStatus (SOLVED, NO_SOLUTION, TIMEOUT, BUDGET_EXHAUSTED,
+      CANCELLED).
+    - count: số lời giải tìm được (tối đa limit).
+    - board: lời giải đầu tiên (board mới) hoặc None.
+    - elapsed_ms: thời gian giải (chỉ đo khi stats=True, ngược lại là None).
+    - from_store: lời giải lấy từ SolutionStore, không phải tìm kiếm lại.
+    - stats: SolveStats (chỉ khi collect_stats=True, ngược lại là None).
+    """
+
+    __slots__ = ("engine", "count", "board", "elapsed_ms", "from_store", "stats", "status")
+
+    def __init__(
+        self,
+        engine: str,
+        count: int,
+        board: Optional[Board],
+        elapsed_ms: Optional[float] = None,
+        from_store: bool = False,
+        stats: Optional[SolveStats] = None,
+        status: Optional[SolveStatus] = None,
+    ) -> None:
+        self.engine = engine
+        self.count = count
+        self.board = board
+        self.elapsed_ms = elapsed_ms
+        self.from_store = from_store
+        self.stats = stats
+        if status is None:
+            status = SolveStatus.SOLVED if count > 0 else SolveStatus.NO_SOLUTION
+        self.status = status
+
+    @property
+    def solved(self) -> bool:
+        return self.count > 0
+
+    def __repr__(self) -> str:
+        return (
+            f"SolveResult(engine={self.engine!r}, status={self.status}, "
+            f"count={self.count}, elapsed_ms={self.elapsed_ms})"
+        )
+
+
+def solve(
+    board: Board,
+    engine: str = DEFAULT_ENGINE,
+    limit: int = 1,
+    stats: bool = False,
+    store: Optional["SolutionStore"] = None,
+    collect_stats: bool = False,
+    timeout_ms: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    cancel: Optional[CancelToken] = None,
+    progress: Optional[Callable[[Budget], None]] = None,
+    cache: Optional["SolutionCache"] = None,
+    **options: Any,
+) -> SolveResult:
+    """
+    Điểm vào chung cho mọi engine. Không thay đổi board đầu vào.
+    - engine: tên engine trong ENGINE_REGISTRY.
+    - limit: số lời giải tối đa cần tìm (> 1 cần engine counting).
+    - stats: đo thời gian giải.
+    - store: SolutionStore tra trước khi tìm kiếm và ghi sau khi giải được
+      (chỉ dùng khi limit == 1 và bảng 9×9).
+    - collect_stats: trả thêm SolveStats (nút, đặt / gỡ, độ sâu, lan truyền,
+      thời gian từng pha) trong result.stats; bật luôn đo thời gian.
+    - timeout_ms / max_nodes / cancel: dừng tìm kiếm khi quá deadline, quá
+      số nút, hoặc CancelToken bị cancel(); result.status cho biết lý do
+      (TIMEOUT / BUDGET_EXHAUSTED / CANCELLED), result.board là None.
+    - progress: hàm progress(budget) được gọi định kỳ trong lúc tìm kiếm
+      (cùng nhịp kiểm tra của Budget), đọc budget.nodes / budget.stats.
+    - cache: SolutionCache (trong bộ nhớ, gộp đề đối xứng) tra trước cả
+      store; tự bỏ qua khi limit != 1 hoặc có timeout_ms / max_nodes /
+      cancel / progress.
+    - options: tham số riêng của engine (vd. branching, propagate).
+    """
+    if cache is not None:
+        return cache.solve(
+            board,
+            engine=engine,
+            limit=limit,
+            stats=stats,
+            store=store,
+            collect_stats=collect_stats,
+            timeout_ms=timeout_ms,
+            max_nodes=max_nodes,
+            cancel=cancel,
+            progress=progress,
+            **options,
+        )
+    info = _checked_engine(engine, limit)
+    limits = (timeout_ms, max_nodes, cancel, progress)
+    if store is None or limit != 1 or len(board) != 9:
+        return _run_once(info, info.run, board, limit, stats, options, collect_stats, limits)
+
+    stats = stats or collect_stats
+    start = time.perf_counter() if stats else 0.0
+    cached = store.get(board)
+    if cached is not None:
+        elapsed_ms = (time.perf_counter() - start) * 1000.0 if stats else None
+        solve_stats = None
+        if collect_stats:
+            solve_stats = SolveStats()
+            solve_stats.cache_hits = 1
+            solve_stats.add_phase("store", start)
+        return SolveResult(info.name, 1, cached, elapsed_ms, True, solve_stats)
+
+    lookup_ms = (time.perf_counter() - start) * 1000.0 if stats else 0.0
+    result = _run_once(info, info.run, board, limit, stats, options, collect_stats, limits)
+    if collect_stats:
+        result.stats.phase_ms["store"] = lookup_ms
+    if result.solved:
+        store.put(board, result.board)
+    return result
+
+
+def solve_many(
+    boards: Iterable[Board],
+    engine: str = DEFAULT_ENGINE,
+    limit: int = 1,
+    stats: bool = False,
+    collect_stats: bool = False,
+    timeout_ms: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    cancel: Optional[CancelToken] = None,
+    cache: Optional["SolutionCache"] = None,
+    **options: Any,
+) -> Iterator[SolveResult]:
+    """
+    Giải lần lượt nhiều đề, yield SolveResult theo đúng thứ tự đầu vào.
+    - Lười: chỉ đọc đề tiếp theo khi kết quả trước đã được lấy => bộ nhớ
+      không phụ thuộc số lượng đề (dùng được với generator hàng triệu đề).
+    - Engine có session dùng lại cùng một bộ nhớ tạm cho mọi đề thay vì
+      cấp phát lại mask / stack / ma trận DLX ở mỗi đề.
+    - timeout_ms / max_nodes áp cho từng đề (như solve()); cancel dừng đề
+      đang giải, các đề sau trả ngay CANCELLED.
+    - cache: như solve(); đề trúng cache không chạy engine, đề trượt được
+      giải bằng session rồi ghi vào cache.
+    """
+    info = _checked_engine(engine, limit)
+    run = info.session() if info.session is not None else info.run
+    limits = (timeout_ms, max_nodes, cancel, None)
+    if limit != 1 or limits != (None, None, None, None):
+        cache = None
+    for board in boards:
+        cacheable = cache is not None and len(board) == 9
+        if cacheable:
+            start = time.perf_counter()
+            cached, slot = cache.lookup(board, engine, collect_stats)
+            if cached is not None:
+                if stats or collect_stats:
+                    cached.elapsed_ms = (time.perf_counter() - start) * 1000.0
+                yield cached
+                continue
+        result = _run_once(info, run, board, limit, stats, options, collect_stats, limits)
+        if cacheable:
+            cache.put(board, result, slot)
+        yield result
+
+
+def _checked_engine(engine: str, limit: int) -> EngineInfo:
+    info = get_engine(engine)
+    if limit < 1:
+        raise ValueError("limit phải >= 1.")
+    if limit > 1 and not info.counting:
+        raise ValueError(f"Engine {engine} không hỗ trợ đếm nhiều lời giải.")
+    return info
+
+
+def _run_once(
+    info: EngineInfo,
+    run: EngineRun,
+    board: Board,
+    limit: int,
+    stats: bool,
+    options: Dict[str, Any],
+    collect_stats: bool = False,
+    limits: Tuple[
+        Optional[float], Optional[int], Optional[CancelToken], Optional[Callable[[Budget], None]]
+    ] = (None, None, None, None),
+) -> SolveResult:
+    if len(board) != 9 and not info.nxn:
+        raise ValueError(
+            f"Engine {info.name} chỉ giải bảng 9×9, dùng engine nxn cho bảng "
+            f"{len(board)}×{len(board)}."
+        )
+    solve_stats = None
+    if collect_stats:
+        solve_stats = SolveStats()
+        options = dict(options, stats=solve_stats)
+        stats = True
+    budget = None
+    if limits != (None, None, None, None):
+        budget = Budget(*limits)
+        budget.stats = solve_stats
+        options = dict(options, budget=budget)
+
+    status = None
+    start = time.perf_counter() if stats else 0.0
+    try:
+        if budget is not None:
+            budget.start()
+        count, solution = run(board, limit, **options)
+    except SolveInterrupted as e:
+        count, solution, status = 0, None, e.status
+    elapsed_ms = (time.perf_counter() - start) * 1000.0 if stats else None
+    return SolveResult(info.name, count, solution, elapsed_ms, stats=solve_stats, status=status)
+
+
+def _bitmask_session(
+    cls: type = BitmaskSolver, counted_cls: type = InstrumentedBitmaskSolver
+) -> EngineRun:
+    solver = cls()
+    counted = None  # solver có đếm, chỉ tạo khi có lần giải cần SolveStats / Budget
+
+    def run(
+        board: Board,
+        limit: int,
+        branching: str = "mrv",
+        propagate: bool = True,
+        stats: Optional[SolveStats] = None,
+        budget: Optional[Budget] = None,
+    ) -> Tuple[int, Optional[Board]]:
+        nonlocal counted
+        if stats is None and budget is None:
+            return _bitmask_run(solver, board, limit, branching, propagate)
+        if counted is None:
+            counted = counted_cls()
+        counted.stats = stats if stats is not None else SolveStats()
+        counted.budget = budget
+        return _bitmask_run(counted, board, limit, branching, propagate, stats)
+
+    return run
+
+
+def _bitmask_run(
+    solver: BitmaskSolver,
+    board: Board,
+    limit: int,
+    branching: str,
+    propagate: bool,
+    stats: Optional[SolveStats] = None,
+) -> Tuple[int, Optional[Board]]:
+    t = time.perf_counter() if stats is not None else 0.0
+    ok = solver.load(board)
+    if stats is not None:
+        t = stats.add_phase("load", t)
+    if not ok:
+        return 0, None
+    if limit > 1:
+        count = solver.count(limit, propagate)
+        if stats is not None:
+            stats.add_phase("search", t)
+        if count == 0:
+            return 0, None
+        cells = solver.solution
+        return count, [cells[r * 9:r * 9 + 9] for r in range(9)]
+    solved = solver.solve(branching, propagate and branching == "mrv")
+    if stats is not None:
+        t = stats.add_phase("search", t)
+    if not solved:
+        return 0, None
+    solution: Board = [[0] * 9 for _ in range(9)]
+    solver.export(solution)
+    if stats is not None:
+        stats.add_phase("export", t)
+    return 1, solution
+
+
+def _iterative_session() -> EngineRun:
+    return _bitmask_session(IterativeSolver, InstrumentedIterativeSolver)
+
+
+def _dlx_session() -> EngineRun:
+    dlx = DLXSolver()
+    counted = None
+
+    def run(
+        board: Board,
+        limit: int,
+        stats: Optional[SolveStats] = None,
+        budget: Optional[Budget] = None,
+    ) -> Tuple[int, Optional[Board]]:
+        nonlocal counted
+        if stats is None and budget is None:
+            count = dlx.count(board, limit)
+            return count, dlx.solution_board()
+        if counted is None:
+            counted = InstrumentedDLXSolver()
+        counted.stats = stats if stats is not None else SolveStats()
+        counted.budget = budget
+        t = time.perf_counter()
+        count = counted.count(board, limit)
+        if stats is not None:
+            t = stats.add_phase("search", t)
+        solution = counted.solution_board()
+        if stats is not None:
+            stats.add_phase("export", t)
+        return count, solution
+
+    return run
+
+
+def _nxn_session() -> EngineRun:
+    # Mỗi kích thước khối một solver (bảng tra và bộ nhớ tạm khác nhau)
+    solvers: Dict[Tuple[int, bool], NxNSolver] = {}
+
+    def run(
+        board: Board,
+        limit: int,
+        stats: Optional[SolveStats] = None,
+        budget: Optional[Budget] = None,
+    ) -> Tuple[int, Optional[Board]]:
+        box = box_size_of(len(board))
+        counted = stats is not None or budget is not None
+        solver = solvers.get((box, counted))
+        if solver is None:
+            cls = InstrumentedNxNSolver if counted else NxNSolver
+            solver = solvers[(box, counted)] = cls(box)
+        if counted:
+            solver.stats = stats if stats is not None else SolveStats()
+            solver.budget = budget
+        t = 0.0
+        if stats is not None:
+            t = time.perf_counter()
+        ok = solver.load(board)
+        if stats is not None:
+            t = stats.add_phase("load", t)
+        if not ok:
+            return 0, None
+        if limit > 1:
+            count = solver.count(limit)
+            if stats is not None:
+                stats.add_phase("search", t)
+            return count, solver.solution_board()
+        solved = solver.solve()
+        if stats is not None:
+            t = stats.add_phase("search", t)
+        if not solved:
+            return 0, None
+        solution: Board = [[0] * solver.n for _ in range(solver.n)]
+        solver.export(solution)
+        if stats is not None:
+            stats.add_phase("export", t)
+        return 1, solution
+
+    return run
+
+
+# Session dùng chung cho các lần giải lẻ (solve(), count_solutions(),
+# is_unique()...), mỗi thread một bộ: không dựng lại ma trận DLX 729×324 /
+# bảng tra ở mỗi lần gọi như solve_many() vẫn làm.
+_shared_sessions = threading.local()
+
+
+def _run_shared(
+    name: str, factory: Callable[[], EngineRun], board: Board, limit: int, options: Dict[str, Any]
+) -> Tuple[int, Optional[Board]]:
+    """
+    Chạy board trên session dùng chung của engine name. Session được lấy ra
+    trong lúc chạy, nên lời gọi lồng nhau (vd. từ progress) tự tạo session
+    riêng; lỗi bất thường giữa chừng thì bỏ session (có thể còn dở trạng thái).
+    """
+    run = getattr(_shared_sessions, name, None) or factory()
+    setattr(_shared_sessions, name, None)
+    try:
+        result = run(board, limit, **options)
+    except SolveInterrupted:
+        setattr(_shared_sessions, name, run)
+        raise
+    setattr(_shared_sessions, name, run)
+    return result
+
+
+def _run_bitmask(board: Board, limit: int, **options: Any) -> Tuple[int, Optional[Board]]:
+    return _run_shared("bitmask", _bitmask_session, board, limit, options)
+
+
+def _run_iterative(board: Board, limit: int, **options: Any) -> Tuple[int, Optional[Board]]:
+    return _run_shared("iterative", _iterative_session, board, limit, options)
+
+
+def _run_dlx(board: Board, limit: int, **options: Any) -> Tuple[int, Optional[Board]]:
+    return _run_shared("dlx", _dlx_session, board, limit, options)
+
+
+def _run_nxn(board: Board, limit: int, **options: Any) -> Tuple[int, Optional[Board]]:
+    return _run_shared("nxn", _nxn_session, board, limit, options)
+
+
+def _run_backtracking(
+    board: Board,
+    limit: int,
+    stats: Optional[SolveStats] = None,
+    budget: Optional[Budget] = None,
+) -> Tuple[int, Optional[Board]]:
+    work = [list(row) for row in board]
+    # Như load() của các engine khác: đề trùng số là vô nghiệm, không tìm kiếm
+    try:
+        _validate_initial_board(work)
+    except ValueError:
+        return 0, None
+    if stats is None and budget is None:
+        solved = solve_sudoku_backtracking(work)
+    else:
+        counted = stats if stats is not None else SolveStats()
+        t = time.perf_counter()
+        solved = _backtracking_counted(work, counted, 0, budget)
+        counted.add_phase("search", t)
+    if solved:
+        return 1, work
+    return 0, None
+
+
+def count_solutions(board: Board, limit: int = 2, engine: str = DEFAULT_ENGINE) -> int:
+    """
+    Đếm số lời giải của board, dừng ngay khi đạt limit.
+    Không thay đổi board. Trả về 0 nếu đề mâu thuẫn / vô nghiệm.
+    """
+    return solve(board, engine=engine, limit=limit).count
+
+
+def is_unique(board: Board, engine: str = DEFAULT_ENGINE) -> bool:
+    """Đề có đúng một lời giải (đề "chuẩn") hay không."""
+    return count_solutions(board, 2, engine) == 1
+
+
+def solve_sudoku(board: Board, engine: str = DEFAULT_ENGINE, **options: Any) -> bool:
+    """
+    Giải Sudoku, ghi lời giải vào board nếu giải được (đi qua solve()).
+    Trả về True / False như trước; cần biết lý do thất bại (NO_SOLUTION,
+    TIMEOUT, ...) thì dùng solve(...).status. options nhận cả timeout_ms,
+    max_nodes, cancel như solve().
+    - engine="bitmask": Backtracking dùng bitmask hàng/cột/khối (mặc định, nhanh).
+      branching="mrv" chọn ô ít ứng viên nhất, "row" chọn theo thứ tự hàng.
+      propagate=True điền naked / hidden single trước mỗi lần rẽ nhánh (với "mrv").
+    - engine="iterative": như "bitmask" nhưng dùng stack tường minh, không đệ quy.
+    - engine="dlx": Dancing Links (exact cover 324 ràng buộc).
+    - engine="nxn": MRV + lan truyền cho bảng n×n bất kỳ (9×9, 16×16, 25×25...).
+    - engine="backtracking": Backtracking gốc dùng find_empty + is_valid.
+    """
+    result = solve(board, engine, **options)
+    if not result.solved:
+        return False
+    if isinstance(board, CompactBoard):
+        board.cells[:] = CompactBoard.from_rows(result.board).cells
+    else:
+        for r in range(len(board)):
+            board[r][:] = result.board[r]
+    return True
+
+
+def solve_sudoku_backtracking(board: Board) -> bool:
     """
     Thuật toán giải Sudoku bằng quay lui (Backtracking).
     """
@@ -27,7 +551,7 @@ def solve_sudoku(board: Board) -> bool:
         if is_valid(board, row, col, num):
             board[row][col] = num  
 
-            if solve_sudoku(board):
+            if solve_sudoku_backtracking(board):
                 return True 
 
            
@@ -37,51 +561,259 @@ def solve_sudoku(board: Board) -> bool:
     return False
 
 
-def solve_file(input_path: str, output_path: str) -> None:
+def _backtracking_counted(
+    board: Board, stats: SolveStats, depth: int, budget: Optional[Budget] = None
+) -> bool:
+    """
+    solve_sudoku_backtracking có đếm vào stats và tick budget
+    (bản riêng để bản gốc không tốn thêm gì).
+    """
+    stats.nodes += 1
+    stats.depth = depth
+    if depth > stats.max_depth:
+        stats.max_depth = depth
+    if budget is not None:
+        budget.tick()
+    empty_pos = find_empty(board)
+    if empty_pos is None:
+        return True
+
+    row, col = empty_pos
+    for num in range(1, 10):
+        if is_valid(board, row, col, num):
+            board[row][col] = num
+            stats.placements += 1
+            if _backtracking_counted(board, stats, depth + 1, budget):
+                return True
+            board[row][col] = 0
+            stats.undos += 1
+            stats.backtracks += 1
+    return False
+
+
+register_engine(EngineInfo(
+    "bitmask",
+    _run_bitmask,
+    "Backtracking bitmask + MRV + naked/hidden single.",
+    counting=True,
+    session=_bitmask_session,
+))
+register_engine(EngineInfo(
+    "iterative",
+    _run_iterative,
+    "Như bitmask, dùng stack tường minh (không đệ quy).",
+    stepping=True,
+    session=_iterative_session,
+))
+register_engine(EngineInfo(
+    "dlx",
+    _run_dlx,
+    "Dancing Links (Algorithm X) trên 324 ràng buộc.",
+    counting=True,
+    session=_dlx_session,
+))
+register_engine(EngineInfo(
+    "nxn",
+    _run_nxn,
+    "MRV + naked/hidden single cho bảng N×N (16×16, 25×25...).",
+    counting=True,
+    nxn=True,
+    session=_nxn_session,
+))
+register_engine(EngineInfo(
+    "backtracking",
+    _run_backtracking,
+    "Backtracking gốc: find_empty + is_valid.",
+))
+
+
+def solve_file(
+    input_path: str,
+    output_path: str,
+    engine: str = DEFAULT_ENGINE,
+    store: Optional["SolutionStore"] = None,
+    cache: Optional["SolutionCache"] = None,
+    **limits: Any,
+) -> None:
     """
-    - Đọc Sudoku từ input_path (kèm kiểm tra lỗi đầu vào).
+    - Đọc Sudoku từ input_path (kèm kiểm tra lỗi đầu vào); engine N×N
+      đọc được cả bảng 16×16, 25×25... (ký hiệu 1–9, A–Z).
     - In đề.
-    - Giải + đo thời gian.
+    - Giải bằng engine đã chọn (tra cache / store trước nếu có) + đo thời gian;
+      limits là timeout_ms / max_nodes / cancel như solve().
     - Ghi kết quả ra output_path nếu giải được.
     """
+    nxn = get_engine(engine).nxn
+    read, write, show = (
+        (read_board_nxn, write_board_nxn, print_board_nxn)
+        if nxn
+        else (read_board_from_file, write_board_to_file, print_board)
+    )
     try:
-        board = read_board_from_file(input_path)
+        board = read(input_path)
     except ValueError as e:
         # Trường hợp 3 file lỗi sẽ rơi vào đây
         print("Lỗi dữ liệu đầu vào:", e)
         return
 
     print("===== SUDOKU BAN ĐẦU =====")
-    print_board(board)
+    show(board)
 
-    start = time.time()
-    solved = solve_sudoku(board)
-    end = time.time()
+    result = solve(board, engine=engine, stats=True, store=store, cache=cache, **limits)
+    elapsed_ms = result.elapsed_ms
 
-    if solved:
+    if result.solved:
+        board = result.board
         print("\n===== SUDOKU ĐÃ GIẢI =====")
-        print_board(board)
-        elapsed_ms = (end - start) * 1000
-        print(f"\nThời gian giải: {elapsed_ms:.3f} ms")
+        show(board)
+        source = " (lấy từ store)" if result.from_store else ""
+        print(f"\nThời gian giải: {elapsed_ms:.3f} ms{source}")
 
         # Đảm bảo thư mục output tồn tại
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        write_board_to_file(board, output_path)
+        write(board, output_path)
         print(f"Lời giải đã được ghi vào: {output_path}")
-    else:
-        elapsed_ms = (end - start) * 1000
+    elif result.status is SolveStatus.NO_SOLUTION:
         print("\nKhông tìm được lời giải cho Sudoku.")
         print(f"Thời gian chạy: {elapsed_ms:.3f} ms")
+    else:
+        print(f"\nDừng giải giữa chừng: {result.status}.")
+        print(f"Thời gian chạy: {elapsed_ms:.3f} ms")
 
 
 if __name__ == "__main__":
+    from sudoku_profile import add_profile_arguments, profiled
+
     # Cho phép truyền file qua command line, nếu không thì dùng mặc định
     base_dir = os.path.dirname(os.path.abspath(__file__))
 
     default_input = os.path.join(base_dir, "input", "puzzle1.txt")
     default_output = os.path.join(base_dir, "output", "solved1.txt")
 
-    input_path = sys.argv[1] if len(sys.argv) >= 2 else default_input
-    output_path = sys.argv[2] if len(sys.argv) >= 3 else default_output
+    parser = argparse.ArgumentParser(description="Giải Sudoku từ file text.")
+    parser.add_argument("input", nargs="?", default=default_input)
+    parser.add_argument("output", nargs="?", default=default_output)
+    parser.add_argument(
+        "--engine",
+        choices=engine_names(),
+        default=DEFAULT_ENGINE,
+        help=f"Engine giải (mặc định: {DEFAULT_ENGINE}).",
+    )
+    parser.add_argument(
+        "--store",
+        metavar="DB",
+        help=(
+            "File SQLite lưu lời giải để dùng lại giữa các lần chạy "
+            "(với --batch: ghi lời giải theo từng chunk)."
+        ),
+    )
+    parser.add_argument(
+        "--cache",
+        type=int,
+        default=0,
+        metavar="SIZE",
+        help="Cache lời giải trong bộ nhớ, gộp đề đối xứng (số mục; 0 = tắt).",
+    )
+    parser.add_argument(
+        "--timeout-ms",
+        type=float,
+        default=None,
+        help="Dừng mỗi đề sau số ms này (trạng thái TIMEOUT).",
+    )
+    parser.add_argument(
+        "--max-nodes",
+        type=int,
+        default=None,
+        help="Dừng mỗi đề sau số nút tìm kiếm này (trạng thái BUDGET_EXHAUSTED).",
+    )
+    batch = parser.add_argument_group("batch (nhiều đề, chạy song song)")
+    batch.add_argument(
+        "--batch",
+        metavar="PATH",
+        help=(
+            "Thư mục các file .txt 9 dòng, hoặc file mỗi dòng một đề 81 ký tự "
+            "(với --engine nxn: N dòng / N*N ký tự)."
+        ),
+    )
+    batch.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Số process worker (mặc định: số CPU).",
+    )
+    batch.add_argument(
+        "--chunksize",
+        type=int,
+        default=256,
+        help="Số đề gửi cho worker mỗi lần (mặc định: 256).",
+    )
+    batch.add_argument(
+        "--unordered",
+        action="store_true",
+        help="Trả kết quả theo thứ tự hoàn thành thay vì thứ tự đầu vào.",
+    )
+    batch.add_argument(
+        "--vectorized",
+        action="store_true",
+        help="Lan truyền cả chunk bằng numpy trước khi rẽ nhánh (cần numpy).",
+    )
+    batch.add_argument(
+        "--out",
+        metavar="FILE",
+        help="Ghi kết quả batch ra file (mặc định: stdout).",
+    )
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    limits = {"timeout_ms": args.timeout_ms, "max_nodes": args.max_nodes}
+    cache = None
+    if args.cache > 0 and not args.batch:
+        from sudoku_cache import SolutionCache
+
+        cache = SolutionCache(args.cache, engine=args.engine)
+
+    # Profile batch nhiều process chỉ thấy process chính: dùng --workers 1
+    with profiled(args.profile, args.profile_out):
+        if args.batch:
+            from sudoku_batch import NXN_BATCH_ERROR, solve_batch
+
+            if get_engine(args.engine).nxn and (args.vectorized or args.store):
+                parser.error(NXN_BATCH_ERROR)
+
+            store = None
+            if args.store:
+                from sudoku_store import SolutionStore
+
+                store = SolutionStore(args.store)
+            out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+            try:
+                for label, text in solve_batch(
+                    args.batch,
+                    engine=args.engine,
+                    workers=args.workers,
+                    chunksize=args.chunksize,
+                    ordered=not args.unordered,
+                    vectorized=args.vectorized,
+                    cache_size=args.cache,
+                    store=store,
+                    **limits,
+                ):
+                    out.write(f"{label}\t{text}\n")
+            finally:
+                if out is not sys.stdout:
+                    out.close()
+                if store is not None:
+                    store.close()
+        elif args.store:
+            from sudoku_store import SolutionStore
 
-    solve_file(input_path, output_path)
+            with SolutionStore(args.store) as store:
+                solve_file(
+                    args.input,
+                    args.output,
+                    engine=args.engine,
+                    store=store,
+                    cache=cache,
+                    **limits,
+                )
+        else:
+            solve_file(args.input, args.output, engine=args.engine, cache=cache, **limits)
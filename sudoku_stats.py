@@ -0,0 +1,64 @@
+import time
+from typing import Dict
+
+
+class SolveStats:
+    """
+    Số liệu của một lần giải (chỉ thu khi solve(..., collect_stats=True)):
+    - nodes: số nút tìm kiếm đã vào (mỗi lần chọn ô / cột để rẽ nhánh).
+    - placements / undos: số lần đặt / gỡ một chữ số (gồm cả ô do lan truyền).
+    - backtracks: số lần gỡ một lựa chọn rẽ nhánh (không tính ô do lan truyền).
+    - max_depth: độ sâu rẽ nhánh lớn nhất.
+    - depth: độ sâu rẽ nhánh của nút vừa vào (giảm khi quay lui; để báo
+      tiến độ trong lúc giải).
+    - propagations: số vòng lan truyền naked / hidden single.
+    - phase_ms: thời gian từng pha ("store", "load", "search", "export").
+    - cache_hits: số lần lấy lời giải từ store / cache thay vì tìm kiếm.
+    Engine chỉ đếm khi được truyền một SolveStats (dùng lớp con có đếm),
+    nên đường giải thường không tốn thêm chi phí nào.
+    """
+
+    __slots__ = (
+        "nodes",
+        "placements",
+        "undos",
+        "backtracks",
+        "max_depth",
+        "depth",
+        "propagations",
+        "phase_ms",
+        "cache_hits",
+    )
+
+    def __init__(self) -> None:
+        self.nodes = 0
+        self.placements = 0
+        self.undos = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.depth = 0
+        self.propagations = 0
+        self.phase_ms: Dict[str, float] = {}
+        self.cache_hits = 0
+
+    def add_phase(self, name: str, start: float) -> float:
+        """Cộng thời gian từ start tới hiện tại vào pha name, trả về thời điểm hiện tại."""
+        now = time.perf_counter()
+        self.phase_ms[name] = self.phase_ms.get(name, 0.0) + (now - start) * 1000.0
+        return now
+
+    def as_dict(self) -> Dict[str, object]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def summary(self) -> str:
+        """Dòng ngắn để in report / GUI."""
+        text = (
+            f"nodes={self.nodes} place={self.placements} undo={self.undos} "
+            f"back={self.backtracks} depth={self.max_depth} prop={self.propagations}"
+        )
+        if self.cache_hits:
+            text += f" cache={self.cache_hits}"
+        return text
+
+    def __repr__(self) -> str:
+        return f"SolveStats({self.summary()})"
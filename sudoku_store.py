@@ -0,0 +1,135 @@
+import hashlib
+import os
+import sqlite3
+from typing import Iterable, Optional, Tuple
+
+from sudoku_utils import AnyBoard, Board, board_to_string, parse_board_string
+
+
+def puzzle_key(board: AnyBoard) -> bytes:
+    """Hash gọn 8 byte (blake2b) của đề, dùng làm khoá trong store."""
+    return hashlib.blake2b(board_to_string(board).encode("ascii"), digest_size=8).digest()
+
+
+class BloomFilter:
+    """
+    Bloom filter trên bytearray để loại nhanh các đề chắc chắn chưa có
+    trong store mà không cần truy vấn SQLite.
+    k vị trí bit lấy bằng double hashing từ khoá 8 byte sẵn có.
+    """
+
+    def __init__(self, n_bits: int, n_hashes: int = 7) -> None:
+        self.n_bits = max(8, n_bits)
+        self.n_hashes = n_hashes
+        self.bits = bytearray((self.n_bits + 7) // 8)
+
+    def _positions(self, key: bytes):
+        value = int.from_bytes(key, "little")
+        h1 = value & 0xFFFFFFFF
+        h2 = (value >> 32) | 1
+        for i in range(self.n_hashes):
+            yield (h1 + i * h2) % self.n_bits
+
+    def add(self, key: bytes) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: bytes) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+_INSERT = "INSERT OR REPLACE INTO solutions (key, puzzle, solution) VALUES (?, ?, ?)"
+
+
+class SolutionStore:
+    """
+    Kho lời giải trên đĩa (SQLite), khoá = puzzle_key(đề).
+    - Lưu kèm chuỗi đề để loại trừ va chạm hash.
+    - Khi mở, nạp mọi khoá vào BloomFilter; get() với đề chưa từng thấy
+      thường trả về ngay mà không chạm tới đĩa.
+    - Chỉ lưu đề giải được.
+    - Ghi nhiều đề một lần bằng put_many() (một transaction, một lần
+      commit), hoặc put(..., commit=False) rồi commit() / close().
+    Dùng được như context manager: with SolutionStore(path) as store: ...
+    """
+
+    def __init__(self, path: str, expected_items: int = 1 << 20) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS solutions ("
+            " key BLOB PRIMARY KEY,"
+            " puzzle TEXT NOT NULL,"
+            " solution TEXT NOT NULL)"
+        )
+        self.conn.commit()
+
+        self.bloom = BloomFilter(10 * expected_items)
+        for (key,) in self.conn.execute("SELECT key FROM solutions"):
+            self.bloom.add(bytes(key))
+
+        self.hits = 0
+        self.misses = 0
+        self.bloom_rejects = 0
+
+    def get(self, board: AnyBoard) -> Optional[Board]:
+        """Lời giải đã lưu của đề (board mới), hoặc None nếu chưa có."""
+        key = puzzle_key(board)
+        if key not in self.bloom:
+            self.bloom_rejects += 1
+            self.misses += 1
+            return None
+
+        row = self.conn.execute(
+            "SELECT puzzle, solution FROM solutions WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[0] != board_to_string(board):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return parse_board_string(row[1])
+
+    def put(self, board: AnyBoard, solution: AnyBoard, commit: bool = True) -> None:
+        """
+        Ghi (hoặc ghi đè) lời giải của đề.
+        commit=False: chưa ghi xuống đĩa, đợi commit() / close() (ghi hàng
+        loạt mà không tốn một lần fsync mỗi đề).
+        """
+        key = puzzle_key(board)
+        self.conn.execute(_INSERT, (key, board_to_string(board), board_to_string(solution)))
+        if commit:
+            self.conn.commit()
+        self.bloom.add(key)
+
+    def put_many(self, items: Iterable[Tuple[AnyBoard, AnyBoard]]) -> int:
+        """Ghi nhiều cặp (đề, lời giải) bằng executemany + một lần commit; trả về số cặp."""
+        rows = []
+        for board, solution in items:
+            rows.append((puzzle_key(board), board_to_string(board), board_to_string(solution)))
+        if rows:
+            self.conn.executemany(_INSERT, rows)
+            self.conn.commit()
+            for key, _, _ in rows:
+                self.bloom.add(key)
+        return len(rows)
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def close(self) -> None:
+        """Commit các put(..., commit=False) còn chờ rồi đóng kết nối."""
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self) -> "SolutionStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
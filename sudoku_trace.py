@@ -0,0 +1,184 @@
+import argparse
+import struct
+import sys
+from array import array
+from typing import List, Optional, Tuple
+
+from sudoku_utils import Board, CompactBoard, read_board_from_file
+from sudoku_iterative import iter_steps
+
+# Mỗi sự kiện là một số 16 bit: (chữ số << 7) | ô, ô = r * 9 + c (0..80),
+# chữ số 0 = gỡ số (quay lui). 2 byte / sự kiện thay vì một tuple + snapshot.
+_CELL_BITS = 7
+_CELL_MASK = (1 << _CELL_BITS) - 1
+
+DEFAULT_KEYFRAME_INTERVAL = 1024
+
+# File .trace: header | 81 byte đề | sự kiện (uint16 little-endian)
+_MAGIC = b"SDKT"
+_HEADER = struct.Struct("<4sBBIQ")  # magic, version, kết quả, khoảng keyframe, số sự kiện
+_VERSION = 1
+_RESULTS = ("", "solved", "nosolution")  # "" = đang ghi / bị cắt giữa chừng
+
+
+class SearchTrace:
+    """
+    Bản ghi gọn chuỗi đặt / gỡ số của một lần Backtracking, tua được tới
+    bước bất kỳ mà không phải chạy lại tìm kiếm:
+    - events: array('H'), mỗi sự kiện 2 byte (xem _CELL_BITS).
+    - keyframes[k]: 81 byte trạng thái bảng sau k * interval sự kiện;
+      board_at(i) lấy keyframe gần nhất rồi áp tối đa interval - 1 delta.
+    Ghi dần bằng append() (vd. trong lúc GUI đang mô phỏng) hoặc record().
+    """
+
+    def __init__(self, board: Board, interval: int = DEFAULT_KEYFRAME_INTERVAL) -> None:
+        if interval < 1:
+            raise ValueError("interval phải >= 1.")
+        self.initial = CompactBoard.from_rows(board)
+        self.interval = interval
+        self.events = array("H")
+        self.keyframes: List[bytes] = [bytes(self.initial.cells)]
+        self.result = ""
+        self._cells = bytearray(self.initial.cells)  # trạng thái sau sự kiện cuối
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def append(self, r: int, c: int, num: int) -> None:
+        """Thêm một sự kiện: đặt num vào (r, c), num = 0 là gỡ số."""
+        i = r * 9 + c
+        self.events.append((num << _CELL_BITS) | i)
+        self._cells[i] = num
+        if not len(self.events) % self.interval:
+            self.keyframes.append(bytes(self._cells))
+
+    def finish(self, result: str) -> None:
+        """Đánh dấu kết thúc: "solved" hoặc "nosolution"."""
+        if result not in _RESULTS:
+            raise ValueError(f"Kết quả không hợp lệ: {result}")
+        self.result = result
+
+    def event(self, k: int) -> Tuple[str, int, int, int]:
+        """Sự kiện thứ k dạng bước của iter_steps: ("place" | "remove", r, c, num)."""
+        code = self.events[k]
+        i = code & _CELL_MASK
+        num = code >> _CELL_BITS
+        return ("place" if num else "remove", i // 9, i % 9, num)
+
+    def board_at(self, step: int) -> CompactBoard:
+        """Bảng sau step sự kiện đầu tiên (0 = đề ban đầu, len(self) = cuối)."""
+        if not 0 <= step <= len(self.events):
+            raise IndexError(f"step ngoài khoảng 0..{len(self.events)}.")
+        k = step // self.interval
+        cells = bytearray(self.keyframes[k])
+        events = self.events
+        for j in range(k * self.interval, step):
+            code = events[j]
+            cells[code & _CELL_MASK] = code >> _CELL_BITS
+        return CompactBoard(cells)
+
+    def nbytes(self) -> int:
+        """Dung lượng dữ liệu (sự kiện + keyframe), không tính overhead object."""
+        return len(self.events) * self.events.itemsize + 81 * len(self.keyframes)
+
+    # ----- File -----
+
+    def save(self, path: str) -> None:
+        """Ghi ra file nhị phân; keyframe không được lưu, load() dựng lại."""
+        events = self.events
+        if sys.byteorder == "big":
+            events = array("H", events)
+            events.byteswap()
+        with open(path, "wb") as f:
+            f.write(
+                _HEADER.pack(
+                    _MAGIC, _VERSION, _RESULTS.index(self.result), self.interval, len(events)
+                )
+            )
+            f.write(self.initial.cells)
+            events.tofile(f)
+
+    @classmethod
+    def load(cls, path: str) -> "SearchTrace":
+        """Đọc file của save(); file sai định dạng / bị cắt cụt -> ValueError."""
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"{path} bị cắt cụt (thiếu header).")
+            magic, version, result, interval, count = _HEADER.unpack(header)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"{path} không phải file trace hợp lệ.")
+            if result >= len(_RESULTS) or interval < 1:
+                raise ValueError(f"{path} có header hỏng.")
+            initial = f.read(81)
+            if len(initial) < 81:
+                raise ValueError(f"{path} bị cắt cụt (thiếu đề ban đầu).")
+            if any(v > 9 for v in initial):
+                raise ValueError(f"{path} có đề ban đầu hỏng.")
+            events = array("H")
+            try:
+                events.fromfile(f, count)
+            except EOFError:
+                raise ValueError(
+                    f"{path} bị cắt cụt: cần {count} sự kiện, chỉ có {len(events)}."
+                ) from None
+        if sys.byteorder == "big":
+            events.byteswap()
+
+        trace = cls(CompactBoard(initial).to_rows(), interval)
+        cells = trace._cells
+        for k, code in enumerate(events, start=1):
+            i = code & _CELL_MASK
+            num = code >> _CELL_BITS
+            if i > 80 or num > 9:
+                raise ValueError(f"{path} có sự kiện hỏng ở vị trí {k - 1}.")
+            cells[i] = num
+            if not k % interval:
+                trace.keyframes.append(bytes(cells))
+        trace.events = events
+        trace.result = _RESULTS[result]
+        return trace
+
+
+def record(
+    board: Board,
+    max_events: Optional[int] = None,
+    interval: int = DEFAULT_KEYFRAME_INTERVAL,
+) -> SearchTrace:
+    """
+    Chạy Backtracking (cùng thứ tự với Step trong GUI) và ghi mọi bước.
+    max_events: dừng ghi sau từng ấy sự kiện (trace.result = "").
+    """
+    trace = SearchTrace(board, interval)
+    append = trace.append
+    for step in iter_steps(board):
+        kind = step[0]
+        if kind in ("place", "remove"):
+            if max_events is not None and len(trace) >= max_events:
+                break
+            append(step[1], step[2], step[3])
+        else:
+            trace.finish(kind)
+            break
+    return trace
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ghi trace Backtracking của một đề ra file.")
+    parser.add_argument("input", help="File đề 9 dòng.")
+    parser.add_argument("output", help="File .trace cần ghi.")
+    parser.add_argument("--max-events", type=int, default=None, help="Giới hạn số sự kiện.")
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=DEFAULT_KEYFRAME_INTERVAL,
+        help=f"Số sự kiện giữa hai keyframe (mặc định: {DEFAULT_KEYFRAME_INTERVAL}).",
+    )
+    args = parser.parse_args()
+
+    trace = record(read_board_from_file(args.input), args.max_events, args.interval)
+    trace.save(args.output)
+    print(
+        f"{len(trace)} sự kiện, {len(trace.keyframes)} keyframe, "
+        f"{trace.nbytes()} byte, kết quả: {trace.result or 'bị cắt'} -> {args.output}"
+    )
@@ -1,11 +1,78 @@
-from typing import List, Tuple, Optional
+from typing import Iterable, List, Tuple, Optional, Union
 
 Board = List[List[int]]  # Kiểu dữ liệu bảng Sudoku
 
+# Bảng dịch byte 0..9 -> ký tự '0'..'9' (dùng cho CompactBoard.to_string)
+_DIGIT_CHARS = bytes(48 + (b if b < 10 else 0) for b in range(256))
 
-def read_board_from_file(path: str) -> Board:
+
+class CompactBoard:
+    """
+    Bảng Sudoku gọn: 81 ô lưu trong một bytearray, chỉ số phẳng i = r * 9 + c.
+    - copy() chỉ sao chép 81 byte (1 object) thay vì 10 list như Board.
+    - board[r] trả về memoryview của hàng r (không sao chép), nên code cũ
+      dùng board[r][c] để đọc / ghi vẫn chạy được.
+    - board.cells[i] truy cập phẳng, memoryview() xuất buffer không sao chép.
+    - Hash / so sánh theo nội dung; không sửa board khi đang làm key của dict.
+    """
+
+    __slots__ = ("cells",)
+
+    def __init__(self, cells: Union[bytes, bytearray, Iterable[int], None] = None) -> None:
+        if cells is None:
+            self.cells = bytearray(81)
+        else:
+            self.cells = bytearray(cells)
+            if len(self.cells) != 81:
+                raise ValueError("CompactBoard cần đúng 81 ô.")
+
+    @classmethod
+    def from_rows(cls, board: Board) -> "CompactBoard":
+        return cls(num for row in board for num in row)
+
+    def to_rows(self) -> Board:
+        cells = self.cells
+        return [list(cells[r * 9:r * 9 + 9]) for r in range(9)]
+
+    def to_string(self) -> str:
+        return self.cells.translate(_DIGIT_CHARS).decode("ascii")
+
+    def copy(self) -> "CompactBoard":
+        return CompactBoard(self.cells)
+
+    def memoryview(self) -> memoryview:
+        return memoryview(self.cells)
+
+    def __getitem__(self, r: int) -> memoryview:
+        return memoryview(self.cells)[r * 9:r * 9 + 9]
+
+    def __len__(self) -> int:
+        return 9
+
+    def __iter__(self):
+        view = memoryview(self.cells)
+        for r in range(9):
+            yield view[r * 9:r * 9 + 9]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompactBoard):
+            return self.cells == other.cells
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(bytes(self.cells))
+
+    def __repr__(self) -> str:
+        return f"CompactBoard({self.to_string()!r})"
+
+
+AnyBoard = Union[Board, CompactBoard]
+
+
+def read_board_from_file(path: str, compact: bool = False) -> AnyBoard:
     """
     Đọc Sudoku từ file text.
+    - compact=True: trả về CompactBoard thay vì List[List[int]].
     - Mỗi dòng (không rỗng) phải có đúng 9 ký tự.
     - Ký tự '0' hoặc '.' được hiểu là ô trống.
     - Ký tự '1'..'9' là số hợp lệ.
@@ -64,6 +131,8 @@ def read_board_from_file(path: str) -> Board:
     # - Không trùng số (1..9) trong cùng ô 3x3
     _validate_initial_board(board)
 
+    if compact:
+        return CompactBoard.from_rows(board)
     return board
 
 
@@ -121,9 +190,43 @@ def _validate_initial_board(board: Board) -> None:
                     seen.add(val)
 
 
-def write_board_to_file(board: Board, path: str) -> None:
+def parse_board_string(text: str) -> Board:
     """
-    Ghi Sudoku ra file, mỗi dòng 9 số.
+    Đọc Sudoku từ chuỗi 81 ký tự trên một dòng (định dạng file nhiều đề).
+    Quy ước ký tự giống read_board_from_file: '0' hoặc '.' là ô trống.
+    """
+    text = text.strip()
+    if len(text) != 81:
+        raise ValueError(
+            f"Dữ liệu Sudoku không hợp lệ: cần đúng 81 ký tự, nhận {len(text)}."
+        )
+
+    board: Board = []
+    for r in range(9):
+        row: List[int] = []
+        for ch in text[r * 9:r * 9 + 9]:
+            if ch in ("0", "."):
+                row.append(0)
+            elif "1" <= ch <= "9":
+                row.append(ord(ch) - 48)
+            else:
+                raise ValueError(f"Ký tự không hợp lệ '{ch}'.")
+        board.append(row)
+
+    _validate_initial_board(board)
+    return board
+
+
+def board_to_string(board: AnyBoard) -> str:
+    """Chuỗi 81 ký tự (ô trống là '0'), ngược với parse_board_string."""
+    if isinstance(board, CompactBoard):
+        return board.to_string()
+    return "".join(str(num) for row in board for num in row)
+
+
+def write_board_to_file(board: AnyBoard, path: str) -> None:
+    """
+    Ghi Sudoku ra file, mỗi dòng 9 số (nhận cả Board và CompactBoard).
     """
     with open(path, "w", encoding="utf-8") as f:
         for row in board:
@@ -131,9 +234,9 @@ def write_board_to_file(board: Board, path: str) -> None:
             f.write(line + "\n")
 
 
-def print_board(board: Board) -> None:
+def print_board(board: AnyBoard) -> None:
     """
-    In Sudoku ra console với định dạng dễ nhìn.
+    In Sudoku ra console với định dạng dễ nhìn (nhận cả Board và CompactBoard).
     Ô trống (0) sẽ in là '.'.
     """
     for r in range(9):
@@ -191,3 +294,153 @@ def is_valid(board: Board, row: int, col: int, num: int) -> bool:
                 return False
 
     return True
+
+
+# ========= BẢNG N×N (box × box, vd. 16×16, 25×25) =========
+
+# Ký hiệu một ký tự cho chữ số 1..35: '1'..'9' rồi 'A'..'Z'
+# (16×16: 1–9, A–G; 25×25: 1–9, A–P). Bảng lớn hơn dùng số thập phân cách nhau.
+SYMBOLS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+EMPTY_TOKENS = ("0", ".")
+
+
+def box_size_of(n: int) -> int:
+    """Cạnh khối của bảng n×n (n phải là số chính phương >= 1)."""
+    box = int(round(n ** 0.5))
+    if box < 1 or box * box != n:
+        raise ValueError(f"Kích thước bảng {n} không phải số chính phương.")
+    return box
+
+
+def _parse_token(token: str, n: int, line_num: int) -> int:
+    if token in EMPTY_TOKENS:
+        return 0
+    if token.isdigit():
+        value = int(token)
+    elif len(token) == 1 and token.upper() in SYMBOLS:
+        value = SYMBOLS.index(token.upper())
+    else:
+        raise ValueError(f"Ký tự không hợp lệ '{token}' tại dòng {line_num}.")
+    if not 1 <= value <= n:
+        raise ValueError(
+            f"Giá trị '{token}' ngoài khoảng 1..{n} tại dòng {line_num}."
+        )
+    return value
+
+
+def _split_tokens(line: str) -> List[str]:
+    """Dòng có khoảng trắng: tách theo khoảng trắng (ký hiệu nhiều ký tự);
+    ngược lại mỗi ký tự là một ô."""
+    return line.split() if any(ch.isspace() for ch in line) else list(line)
+
+
+def read_board_nxn(path: str) -> Board:
+    """
+    Đọc bảng N×N từ file text; N = số dòng dữ liệu (4, 9, 16, 25, ...).
+    - Mỗi dòng một hàng, gồm N ô. Ô trống là '0' hoặc '.'.
+    - Ô là một ký tự ('1'..'9', 'A'..'Z', không phân biệt hoa thường),
+      hoặc các token cách nhau bởi khoảng trắng để dùng số nhiều chữ số
+      (vd. "10 . 16 3 ..."), cần cho bảng lớn hơn 35×35.
+    - Kiểm tra trùng số trong hàng / cột / khối như đề 9×9.
+    """
+    board: Board = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_num, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            board.append([(line_num, token) for token in _split_tokens(line)])
+
+    n = len(board)
+    box_size_of(n)
+    rows: Board = []
+    for tokens in board:
+        line_num = tokens[0][0]
+        if len(tokens) != n:
+            raise ValueError(
+                f"Dữ liệu Sudoku không hợp lệ tại dòng {line_num}: "
+                f"cần đúng {n} ô, nhận {len(tokens)}."
+            )
+        rows.append([_parse_token(token, n, line_num) for _, token in tokens])
+
+    validate_board_nxn(rows)
+    return rows
+
+
+def parse_board_nxn_string(text: str) -> Board:
+    """Bảng N×N trên một dòng N*N ký tự (ký hiệu một ký tự, '0'/'.' là trống)."""
+    text = text.strip()
+    n = box_size_of(len(text))  # len = n * n
+    board = [
+        [_parse_token(ch, n, 1) for ch in text[r * n:r * n + n]] for r in range(n)
+    ]
+    validate_board_nxn(board)
+    return board
+
+
+def validate_board_nxn(board: Board) -> None:
+    """Như _validate_initial_board nhưng cho bảng N×N bất kỳ."""
+    n = len(board)
+    box = box_size_of(n)
+    for r in range(n):
+        if len(board[r]) != n:
+            raise ValueError(f"Hàng {r + 1} cần đúng {n} ô.")
+    seen = set()
+    for r in range(n):
+        for c in range(n):
+            val = board[r][c]
+            if val == 0:
+                continue
+            b = (r // box) * box + c // box
+            for key, where in (
+                (("r", r, val), f"hàng {r + 1}"),
+                (("c", c, val), f"cột {c + 1}"),
+                (("b", b, val), f"khối {b + 1}"),
+            ):
+                if key in seen:
+                    raise ValueError(
+                        f"Dữ liệu không hợp lệ: trùng số {val} trên {where}."
+                    )
+                seen.add(key)
+
+
+def format_cell_nxn(val: int, n: int) -> str:
+    if val == 0:
+        return "."
+    return SYMBOLS[val] if n < len(SYMBOLS) else str(val)
+
+
+def board_to_string_nxn(board: AnyBoard) -> str:
+    """Chuỗi N*N ký hiệu (ô trống là '0'), ngược với parse_board_nxn_string."""
+    n = len(board)
+    if n >= len(SYMBOLS):
+        raise ValueError(f"Bảng {n}×{n} không ghi được trên một dòng ký hiệu.")
+    return "".join(format_cell_nxn(v, n) if v else "0" for row in board for v in row)
+
+
+def write_board_nxn(board: AnyBoard, path: str) -> None:
+    """
+    Ghi bảng N×N theo định dạng read_board_nxn đọc được: ký hiệu một ký tự
+    nếu N <= 35, ngược lại các số cách nhau bởi khoảng trắng.
+    """
+    n = len(board)
+    sep = "" if n < len(SYMBOLS) else " "
+    with open(path, "w", encoding="utf-8") as f:
+        for row in board:
+            f.write(sep.join(format_cell_nxn(v, n) if v else "0" for v in row) + "\n")
+
+
+def print_board_nxn(board: AnyBoard) -> None:
+    """In bảng N×N, kẻ vạch giữa các khối như print_board."""
+    n = len(board)
+    box = box_size_of(n)
+    width = max(len(format_cell_nxn(n, n)), 1)
+    for r in range(n):
+        if r != 0 and r % box == 0:
+            print("-" * (n * (width + 1) + 2 * (box - 1) - 1))
+        row_vals = []
+        for c in range(n):
+            if c != 0 and c % box == 0:
+                row_vals.append("|")
+            row_vals.append(format_cell_nxn(board[r][c], n).rjust(width))
+        print(" ".join(row_vals))
@@ -0,0 +1,164 @@
+import multiprocessing as mp
+import queue
+import time
+from typing import Any, List, Optional, Tuple
+
+from sudoku_utils import Board
+from sudoku_solver import DEFAULT_ENGINE, solve
+
+# Tin nhắn process con gửi về (qua multiprocessing.Queue):
+# - ("progress", nodes, depth, elapsed_ms): chỉ khi start(progress=True),
+#   gửi tối đa mỗi PROGRESS_MS ms; depth là độ sâu hiện tại (giảm khi quay lui).
+# - ("done", SolveResult): kết thúc (SOLVED / NO_SOLUTION / TIMEOUT ...);
+#   result.stats chỉ có khi start(progress=True) hoặc collect_stats=True.
+# - ("error", text): engine raise lỗi.
+WorkerMessage = Tuple[Any, ...]
+
+PROGRESS_MS = 50
+# Process đã terminate() mà sau chừng này vẫn sống thì kill()
+KILL_AFTER_S = 1.0
+
+
+def _worker_main(
+    board: Board,
+    engine: str,
+    options: dict,
+    out: "mp.Queue",
+    report: bool,
+) -> None:
+    """
+    Hàm chạy trong process con.
+    - report=False: engine trần chạy hết tốc độ (chỉ đo thời gian, không đếm
+      nút), trừ khi options có collect_stats=True.
+    - report=True: solve() có thu stats, báo (số nút, độ sâu hiện tại) qua out.
+    Huỷ không đi qua cờ mà do process cha terminate(), nên không cần Budget.
+    """
+    if report:
+        start = time.perf_counter()
+        last = [0.0]
+
+        def progress(budget) -> None:
+            now = time.perf_counter()
+            if now - last[0] < PROGRESS_MS / 1000.0:
+                return
+            last[0] = now
+            depth = budget.stats.depth if budget.stats is not None else 0
+            out.put(("progress", budget.nodes, depth, (now - start) * 1000.0))
+
+        options = dict(options, collect_stats=True, progress=progress)
+
+    try:
+        result = solve(board, engine=engine, stats=True, **options)
+    except Exception as e:  # lỗi engine không được làm treo GUI
+        out.put(("error", f"{type(e).__name__}: {e}"))
+        return
+    out.put(("done", result))
+
+
+class SolveWorker:
+    """
+    Chạy solve() trong một process riêng để luồng Tk không bị chặn (và
+    không tranh GIL với tìm kiếm). Dùng kiểu:
+        worker.start(board, engine, progress=True)
+        ... root.after(16, poll) -> for msg in worker.poll(): ...
+        worker.cancel()  # dừng ngay
+    Mỗi start() tạo một process mới (daemon, tự chết theo GUI); chỉ một lần
+    giải chạy cùng lúc. Không hàm nào chặn chờ process con: process đã
+    xong / bị huỷ được thu dọn (reap) dần ở poll() / reap().
+    """
+
+    def __init__(self) -> None:
+        self._ctx = mp.get_context()
+        self._process: Optional[mp.process.BaseProcess] = None
+        self._queue: Optional["mp.Queue"] = None
+        # Process đã tách khỏi worker nhưng chưa được reap: (process, hạn kill)
+        self._exiting: List[Tuple[mp.process.BaseProcess, float]] = []
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None
+
+    def start(
+        self,
+        board: Board,
+        engine: str = DEFAULT_ENGINE,
+        progress: bool = False,
+        **options: Any,
+    ) -> None:
+        """
+        progress=True: gửi tin "progress" (engine có đếm, chậm hơn chút);
+        False: engine trần, chỉ nhận "done" / "error".
+        options chuyển thẳng cho solve() (timeout_ms, max_nodes,
+        collect_stats, ...).
+        """
+        if self.running:
+            raise RuntimeError("Đang có một lần giải chạy.")
+        self.reap()
+        self._queue = self._ctx.Queue()
+        self._process = self._ctx.Process(
+            target=_worker_main,
+            args=([row[:] for row in board], engine, options, self._queue, progress),
+            daemon=True,
+        )
+        self._process.start()
+
+    def poll(self) -> List[WorkerMessage]:
+        """
+        Lấy mọi tin nhắn đang chờ (không chặn). Khi có "done" / "error"
+        hoặc process con chết bất thường, worker tự dọn và running = False.
+        """
+        self.reap()
+        if self._queue is None:
+            return []
+        # Xem process còn sống trước khi đọc: nếu đã chết thì mọi tin nó gửi
+        # đã nằm sẵn trong pipe, đọc hết mà không có "done" là chết bất thường
+        alive = self._process.is_alive()
+        messages: List[WorkerMessage] = []
+        while True:
+            try:
+                msg = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            messages.append(msg)
+            if msg[0] in ("done", "error"):
+                self._detach(terminate=False)
+                return messages
+
+        if not alive:
+            code = self._process.exitcode
+            messages.append(("error", f"Process giải kết thúc bất thường (exitcode={code})."))
+            self._detach(terminate=False)
+        return messages
+
+    def cancel(self) -> None:
+        """Dừng ngay: terminate() process con, reap sau ở poll() / reap()."""
+        if self._process is not None:
+            self._detach(terminate=True)
+
+    def reap(self) -> bool:
+        """
+        Thu dọn (không chặn) các process đã xong / bị huỷ; kill() process
+        quá KILL_AFTER_S vẫn chưa thoát. True nếu không còn process nào chờ.
+        GUI gọi lặp lại bằng root.after sau cancel().
+        """
+        now = time.monotonic()
+        pending = []
+        for process, kill_at in self._exiting:
+            if process.is_alive():  # is_alive() tự waitpid(WNOHANG)
+                if now >= kill_at:
+                    process.kill()
+                pending.append((process, kill_at))
+            else:
+                process.close()
+        self._exiting = pending
+        return not pending
+
+    def _detach(self, terminate: bool) -> None:
+        if terminate and self._process.is_alive():
+            self._process.terminate()
+        self._exiting.append((self._process, time.monotonic() + KILL_AFTER_S))
+        self._queue.close()
+        self._queue.cancel_join_thread()
+        self._process = None
+        self._queue = None
+        self.reap()
@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+
+import sudoku_solver
+from sudoku_solver import engine_names, get_engine, solve, solve_many
+from sudoku_utils import board_to_string, board_to_string_nxn, parse_board_string, read_board_nxn
+
+with open("bench/easy.txt", encoding="utf-8") as f:
+    EASY = [line.strip() for line in f if line.strip() and not line.startswith("#")][:40]
+BOARDS = [parse_board_string(text) for text in EASY]
+
+
+def expected_solutions():
+    return [board_to_string(solve(board).board) for board in BOARDS]
+
+
+@pytest.mark.parametrize("engine", [e for e in engine_names() if get_engine(e).session])
+def test_solve_many_matches_solve(engine):
+    results = list(solve_many(BOARDS, engine=engine))
+    assert [board_to_string(r.board) for r in results] == expected_solutions()
+
+
+def test_solve_many_is_lazy():
+    taken = []
+
+    def boards():
+        for board in BOARDS:
+            taken.append(board)
+            yield board
+
+    results = solve_many(boards())
+    next(results)
+    assert len(taken) == 1
+
+
+def test_one_shot_solves_reuse_a_session_per_thread():
+    solve(BOARDS[0], engine="bitmask")
+    run = sudoku_solver._shared_sessions.bitmask
+    solve(BOARDS[1], engine="bitmask")
+    assert sudoku_solver._shared_sessions.bitmask is run
+
+    other = []
+
+    def worker():
+        solve(BOARDS[2], engine="bitmask")
+        other.append(sudoku_solver._shared_sessions.bitmask)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert other and other[0] is not run
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_batch_pool_matches_solve(ordered):
+    from sudoku_batch import solve_batch
+
+    results = list(solve_batch("bench/easy.txt", workers=2, chunksize=8, ordered=ordered))
+    with open("bench/easy.txt", encoding="utf-8") as f:
+        lines = [
+            (f"dòng {k}", line.strip())
+            for k, line in enumerate(f, start=1)
+            if line.strip() and not line.startswith("#")
+        ]
+    expected = [
+        (label, board_to_string(solve(parse_board_string(text)).board)) for label, text in lines
+    ]
+    if ordered:
+        assert results == expected
+    else:
+        assert sorted(results) == sorted(expected)
+
+
+def test_batch_nxn_engine_reads_nxn_boards():
+    from sudoku_batch import solve_batch
+
+    board = read_board_nxn("input/nxn/puzzle_16x16.txt")
+    [(label, text)] = solve_batch("input/nxn", engine="nxn", workers=1)
+    assert label == "puzzle_16x16.txt"
+    assert text == board_to_string_nxn(solve(board, engine="nxn").board)
+    with pytest.raises(ValueError):
+        list(solve_batch("input/nxn", engine="nxn", workers=1, vectorized=True))
+
+
+def test_numpy_vectorized_matches_solve():
+    pytest.importorskip("numpy")
+    from sudoku_numpy import solve_many_vectorized
+
+    results = list(solve_many_vectorized(BOARDS, batch_size=16))
+    assert all(r.solved for r in results)
+    assert [board_to_string(r.board) for r in results] == expected_solutions()
@@ -0,0 +1,54 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmark import compare
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_compare(nodes, median_ms, calibration_ms=1.0):
+    current = {"hard": {"bitmask": {"nodes": nodes, "median_ms": median_ms}}}
+    baseline = {"hard": {"bitmask": {"nodes": 100, "median_ms": 10.0}}}
+    return compare(current, baseline, "median_ms", 0.20, calibration_ms, 1.0, 0.50)
+
+
+@pytest.mark.parametrize(
+    "nodes, median_ms, calibration_ms, failed",
+    [
+        (119, 10.0, 1.0, []),
+        (121, 10.0, 1.0, ["hard/bitmask (nodes)"]),
+        (100, 14.0, 1.0, []),
+        (100, 16.0, 1.0, ["hard/bitmask (median_ms/calib)"]),
+        # Máy chậm gấp đôi: thời gian gấp đôi nhưng thời gian tương đối không đổi
+        (100, 20.0, 2.0, []),
+    ],
+)
+def test_compare_thresholds(nodes, median_ms, calibration_ms, failed):
+    assert run_compare(nodes, median_ms, calibration_ms) == failed
+
+
+def run_benchmark(*args):
+    return subprocess.run(
+        [sys.executable, "benchmark.py", "--corpus", "input", "--engine", "bitmask",
+         "--repeat", "1", "--warmup", "0", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+
+
+@pytest.mark.parametrize("nodes, returncode", [(10 ** 6, 0), (1, 1)])
+def test_cli_exit_status_against_baseline(tmp_path, nodes, returncode):
+    path = tmp_path / "baseline.json"
+    # Không có calibration_ms: chỉ so số nút, không phụ thuộc tốc độ máy
+    path.write_text(json.dumps({"meta": {}, "results": {"input": {"bitmask": {"nodes": nodes}}}}))
+    assert run_benchmark("--baseline", str(path)).returncode == returncode
+
+
+def test_cli_rejects_missing_explicit_baseline(tmp_path):
+    proc = run_benchmark("--baseline", str(tmp_path / "missing.json"))
+    assert proc.returncode == 2 and "baseline" in proc.stderr
@@ -0,0 +1,63 @@
+import pytest
+
+from sudoku_bitmask import BitmaskSolver, solve_sudoku_bitmask
+from sudoku_solver import solve_sudoku, solve_sudoku_backtracking
+from sudoku_utils import read_board_from_file
+
+UNIQUE = ["input/puzzle1.txt", "input/puzzle2.txt", "input/puzzle3.txt", "input/puzzle6.txt"]
+
+
+def backtracking_solution(path):
+    board = read_board_from_file(path)
+    assert solve_sudoku_backtracking(board)
+    return board
+
+
+@pytest.mark.parametrize("path", UNIQUE)
+@pytest.mark.parametrize(
+    "branching, propagate", [("row", False), ("mrv", False), ("mrv", True)]
+)
+def test_bitmask_matches_backtracking(path, branching, propagate):
+    board = read_board_from_file(path)
+    assert solve_sudoku_bitmask(board, branching, propagate) is True
+    assert board == backtracking_solution(path)
+
+
+def test_solve_sudoku_defaults_to_bitmask():
+    board = read_board_from_file("input/puzzle1.txt")
+    assert solve_sudoku(board) is True
+    assert board == backtracking_solution("input/puzzle1.txt")
+
+
+def test_load_rejects_duplicate_givens_and_leaves_board():
+    board = read_board_from_file("input/puzzle1.txt")
+    r, c = next((r, c) for r in range(9) for c in range(9) if board[r][c] == 0)
+    board[r][c] = next(v for v in board[r] if v)  # trùng số trên hàng r
+    before = [row[:] for row in board]
+    assert BitmaskSolver().load(board) is False
+    assert solve_sudoku_bitmask(board) is False
+    assert board == before
+
+
+def test_masks_track_place_and_undo():
+    solver = BitmaskSolver()
+    assert solver.load([[0] * 9 for _ in range(9)])
+    i = 4 * 9 + 4  # ô giữa bảng
+    solver.place(i, 5)
+    assert not solver.can_place(4 * 9 + 0, 5)  # cùng hàng
+    assert not solver.can_place(0 * 9 + 4, 5)  # cùng cột
+    assert not solver.can_place(3 * 9 + 3, 5)  # cùng khối
+    assert solver.can_place(0, 5)
+    assert solver.candidates(4 * 9 + 0) == 0b1111011110
+    solver.undo(i, 5)
+    assert solver.can_place(4 * 9 + 0, 5) and solver.cells[i] == 0
+
+
+def test_solver_is_reusable_across_loads():
+    solver = BitmaskSolver()
+    for path in UNIQUE:
+        assert solver.load(read_board_from_file(path))
+        assert solver.solve()
+        board = [[0] * 9 for _ in range(9)]
+        solver.export(board)
+        assert board == backtracking_solution(path)
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+from sudoku_budget import Budget, CancelToken, SolveInterrupted, SolveStatus
+from sudoku_solver import engine_names, solve
+from sudoku_utils import read_board_from_file
+
+HARD = read_board_from_file("input/puzzle6.txt")
+
+
+def test_status_truthiness():
+    assert SolveStatus.SOLVED
+    assert not any(
+        status for status in SolveStatus if status is not SolveStatus.SOLVED
+    )
+    assert str(SolveStatus.TIMEOUT) == "TIMEOUT"
+
+
+def test_cancel_token():
+    token = CancelToken()
+    assert not token.is_set() and not token.cancelled
+    token.cancel()
+    assert token.is_set() and token.cancelled
+
+
+def test_budget_max_nodes_is_exact():
+    budget = Budget(max_nodes=10, check_every=256)
+    budget.start()
+    for _ in range(10):
+        budget.tick()
+    with pytest.raises(SolveInterrupted) as info:
+        budget.tick()
+    assert info.value.status is SolveStatus.BUDGET_EXHAUSTED
+    assert budget.nodes == 11
+
+
+def test_budget_timeout_and_cancel():
+    budget = Budget(timeout_ms=0)
+    with pytest.raises(SolveInterrupted) as info:
+        budget.start()
+        time.sleep(0.001)
+        budget.check()
+    assert info.value.status is SolveStatus.TIMEOUT
+
+    token = CancelToken()
+    budget = Budget(cancel=token, check_every=1)
+    budget.start()
+    budget.tick()
+    token.cancel()
+    with pytest.raises(SolveInterrupted) as info:
+        budget.tick()
+    assert info.value.status is SolveStatus.CANCELLED
+
+
+def test_budget_rejects_bad_check_every():
+    with pytest.raises(ValueError):
+        Budget(check_every=0)
+
+
+@pytest.mark.parametrize("engine", engine_names())
+def test_engines_honour_max_nodes(engine):
+    result = solve(HARD, engine=engine, max_nodes=1)
+    assert result.status is SolveStatus.BUDGET_EXHAUSTED and result.board is None
+
+
+@pytest.mark.parametrize("engine", engine_names())
+def test_engines_honour_cancel(engine):
+    token = CancelToken()
+    token.cancel()
+    result = solve(HARD, engine=engine, cancel=token)
+    assert result.status is SolveStatus.CANCELLED and result.board is None
+
+
+def test_progress_can_cancel_mid_search():
+    token = CancelToken()
+    seen = []
+
+    def progress(budget):
+        seen.append(budget.nodes)
+        if budget.nodes >= 20:
+            token.cancel()
+
+    result = solve(HARD, engine="backtracking", cancel=token, progress=progress)
+    assert result.status is SolveStatus.CANCELLED
+    assert seen == sorted(seen) and seen[-1] >= 20
+
+
+def test_generous_budget_still_solves():
+    result = solve(HARD, timeout_ms=60_000, max_nodes=10_000_000)
+    assert result.status is SolveStatus.SOLVED
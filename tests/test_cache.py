@@ -0,0 +1,90 @@
+from sudoku_cache import SolutionCache
+from sudoku_solver import SolveStatus, solve, solve_many
+from sudoku_utils import read_board_from_file
+
+PUZZLE = read_board_from_file("input/puzzle1.txt")
+HARD = read_board_from_file("input/puzzle6.txt")
+
+
+def transposed(board):
+    return [list(col) for col in zip(*board)]
+
+
+def test_solve_with_cache_hits_on_repeat_and_symmetric_puzzle():
+    cache = SolutionCache(maxsize=16)
+    first = solve(PUZZLE, cache=cache)
+    assert first.solved and cache.misses == 1
+
+    again = solve(PUZZLE, cache=cache, collect_stats=True)
+    assert again.board == first.board
+    assert again.stats.cache_hits == 1 and cache.hits == 1
+
+    mirror = solve(transposed(PUZZLE), cache=cache)
+    assert mirror.board == transposed(first.board)
+    assert cache.canonical_hits == 1
+
+
+def test_cache_skipped_with_budget_or_limit():
+    cache = SolutionCache(maxsize=16)
+    result = solve(HARD, cache=cache, max_nodes=1)
+    assert result.status is SolveStatus.BUDGET_EXHAUSTED
+    assert (cache.hits, cache.misses) == (0, 0)
+
+    result = solve(HARD, engine="dlx", limit=2, cache=cache)
+    assert result.count == 1
+    assert (cache.hits, cache.misses) == (0, 0)
+
+    # Kết quả bị ngắt không được ghi vào cache
+    assert solve(HARD, cache=cache).solved
+    assert cache.misses == 1
+
+
+def test_solve_many_with_cache():
+    cache = SolutionCache(maxsize=16)
+    results = list(solve_many([PUZZLE, PUZZLE, transposed(PUZZLE)], cache=cache))
+    assert all(r.solved for r in results)
+    assert (cache.misses, cache.hits, cache.canonical_hits) == (1, 1, 1)
+
+
+def test_cached_solution_is_not_aliased():
+    cache = SolutionCache(maxsize=16)
+    first = solve(PUZZLE, cache=cache)
+    expected = [row[:] for row in first.board]
+    first.board[0][0] = 0  # người gọi sửa lời giải trả về
+
+    again = solve(PUZZLE, cache=cache)
+    assert again.board == expected
+    again.board[1][1] = 0
+    assert solve(PUZZLE, cache=cache).board == expected
+
+
+def test_miss_computes_canonical_form_once(monkeypatch):
+    import sudoku_cache
+
+    calls = []
+    real = sudoku_cache.canonical_form
+
+    def counting(board):
+        calls.append(1)
+        return real(board)
+
+    monkeypatch.setattr(sudoku_cache, "canonical_form", counting)
+    cache = SolutionCache(maxsize=16)
+    solve(HARD, cache=cache)
+    list(solve_many([PUZZLE], cache=cache))
+    assert len(calls) == 2
+
+
+def test_put_after_exact_hit_skips_canonical_form(monkeypatch):
+    import sudoku_cache
+
+    cache = SolutionCache(maxsize=16)
+    solve(PUZZLE, cache=cache)
+    result, slot = cache.lookup(PUZZLE)
+    assert result.solved and cache.hits == 1
+
+    calls = []
+    monkeypatch.setattr(sudoku_cache, "canonical_form", lambda board: calls.append(1))
+    cache.put(PUZZLE, result, slot)  # GUI ghi lại kết quả vừa lấy từ cache
+    assert calls == []
+    assert cache.get(PUZZLE).board == result.board
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from sudoku_bitmask import UNITS
+from sudoku_conflicts import ConflictIndex
+from sudoku_utils import read_board_from_file
+
+
+def brute_violations(values):
+    """Quét lại cả 27 đơn vị, cùng thứ tự với ConflictIndex.violations()."""
+    out = []
+    for u, unit in enumerate(UNITS):
+        for d in range(1, 10):
+            cells = [j for j in unit if values[j] == d]
+            if len(cells) > 1:
+                out.append((u, d, cells))
+    return out
+
+
+def check(index, values):
+    violations = brute_violations(values)
+    assert index.violations() == violations
+    assert index.bad == {j for _, _, cells in violations for j in cells}
+    assert index.valid == (not violations)
+
+
+def apply(index, values, i, num):
+    before = set(index.bad)
+    changed = index.set(i, num)
+    values[i] = num
+    assert len(changed) == len(set(changed))
+    assert set(changed) == before ^ index.bad
+    check(index, values)
+    return changed
+
+
+def test_set_and_clear_sequence():
+    index = ConflictIndex()
+    values = [0] * 81
+    assert apply(index, values, 0, 5) == []
+    # Cùng hàng, cùng khối
+    assert sorted(apply(index, values, 1, 5)) == [0, 1]
+    assert index.violations() == [(0, 5, [0, 1]), (18, 5, [0, 1])]
+    # Cùng cột với ô 0: ô 0 đã xung đột, chỉ ô 72 đổi trạng thái
+    assert apply(index, values, 72, 5) == [72]
+    # Đổi chữ số ô 1: ô 1 hết xung đột, ô 0 vẫn trùng với ô 72
+    assert apply(index, values, 1, 6) == [1]
+    assert sorted(apply(index, values, 0, 0)) == [0, 72]
+    assert index.valid and index.bad == set()
+    # Đặt lại đúng giá trị cũ: không đổi gì
+    assert apply(index, values, 72, 5) == []
+
+
+def test_load_matches_brute_force():
+    board = read_board_from_file("input/puzzle1.txt")
+    r, c = next((r, c) for r in range(9) for c in range(9) if board[r][c] == 0)
+    board[r][c] = next(v for v in board[r] if v)
+    index = ConflictIndex()
+    index.load(board)
+    values = [board[i // 9][i % 9] for i in range(81)]
+    assert not index.valid
+    check(index, values)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_edits_match_brute_force(seed):
+    rng = random.Random(seed)
+    index = ConflictIndex()
+    values = [0] * 81
+    for _ in range(400):
+        apply(index, values, rng.randrange(81), rng.choice((0, 0, *range(1, 10))))
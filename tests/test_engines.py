@@ -0,0 +1,141 @@
+import pytest
+
+from sudoku_solver import (
+    SolveStatus,
+    count_solutions,
+    engine_names,
+    get_engine,
+    is_unique,
+    solve,
+    solve_sudoku,
+)
+from sudoku_utils import CompactBoard, parse_board_string, read_board_from_file, read_board_nxn
+
+NINE_BY_NINE = [f"input/puzzle{k}.txt" for k in range(1, 7)]
+# puzzle4 / puzzle5 có nhiều lời giải, các đề còn lại là đề chuẩn
+MULTI = {"input/puzzle4.txt", "input/puzzle5.txt"}
+EXPECTED_COUNT = {path: 2 if path in MULTI else 1 for path in NINE_BY_NINE}
+
+
+def is_solution_of(solution, puzzle):
+    n = len(puzzle)
+    box = int(n ** 0.5)
+    digits = set(range(1, n + 1))
+    units = [solution[r] for r in range(n)]
+    units += [[solution[r][c] for r in range(n)] for c in range(n)]
+    units += [
+        [solution[br + r][bc + c] for r in range(box) for c in range(box)]
+        for br in range(0, n, box)
+        for bc in range(0, n, box)
+    ]
+    return all(set(unit) == digits for unit in units) and all(
+        puzzle[r][c] in (0, solution[r][c]) for r in range(n) for c in range(n)
+    )
+
+
+def contradictory():
+    board = read_board_from_file("input/puzzle1.txt")
+    r, c = next((r, c) for r in range(9) for c in range(9) if board[r][c] == 0)
+    board[r][c] = next(v for v in board[r] if v)  # trùng số trên hàng r
+    return board
+
+
+@pytest.mark.parametrize("engine", engine_names())
+def test_contradictory_givens_have_no_solution(engine):
+    board = contradictory()
+    result = solve(board, engine=engine)
+    assert result.status is SolveStatus.NO_SOLUTION and result.board is None
+    assert solve(board, engine=engine, collect_stats=True).count == 0
+
+
+def test_solve_sudoku_returns_bool():
+    board = read_board_from_file("input/puzzle1.txt")
+    assert solve_sudoku(board) is True
+    assert all(all(row) for row in board)
+    assert solve_sudoku(contradictory()) is False
+    assert solve_sudoku(read_board_from_file("input/puzzle6.txt"), max_nodes=1) is False
+
+
+@pytest.mark.parametrize("path", NINE_BY_NINE)
+def test_engines_agree_on_input_puzzles(path):
+    board = read_board_from_file(path)
+    boards = {}
+    for engine in engine_names():
+        result = solve(board, engine=engine)
+        assert result.status is SolveStatus.SOLVED, engine
+        assert is_solution_of(result.board, board), engine
+        boards[engine] = result.board
+    if EXPECTED_COUNT[path] == 1:
+        assert len({str(b) for b in boards.values()}) == 1
+    assert board == read_board_from_file(path)  # solve() không sửa đề
+
+
+@pytest.mark.parametrize("path", NINE_BY_NINE)
+def test_counting_engines_agree_on_solution_count(path):
+    board = read_board_from_file(path)
+    counting = [e for e in engine_names() if get_engine(e).counting]
+    assert counting
+    for engine in counting:
+        assert count_solutions(board, 2, engine) == EXPECTED_COUNT[path], engine
+
+
+COUNTING = [e for e in engine_names() if get_engine(e).counting]
+
+
+@pytest.mark.parametrize("engine", COUNTING)
+@pytest.mark.parametrize("limit", [1, 2, 5])
+def test_count_solutions_stops_at_limit(engine, limit):
+    # Bảng trống có vô số lời giải: chỉ dừng được nhờ limit
+    assert count_solutions([[0] * 9 for _ in range(9)], limit, engine) == limit
+
+
+@pytest.mark.parametrize("engine", COUNTING)
+def test_count_solutions_leaves_board_untouched(engine):
+    for path in ("input/puzzle1.txt", "input/puzzle4.txt"):
+        board = read_board_from_file(path)
+        count_solutions(board, 3, engine)
+        is_unique(board, engine)
+        assert board == read_board_from_file(path)
+
+
+@pytest.mark.parametrize("engine", COUNTING)
+def test_is_unique(engine):
+    assert is_unique(read_board_from_file("input/puzzle1.txt"), engine) is True
+    assert is_unique(read_board_from_file("input/puzzle4.txt"), engine) is False
+    assert is_unique(contradictory(), engine) is False
+
+
+def test_nxn_engine_solves_16x16():
+    board = read_board_nxn("input/nxn/puzzle_16x16.txt")
+    result = solve(board, engine="nxn", limit=2)
+    assert result.count == 1
+    assert is_solution_of(result.board, board)
+
+
+def test_nxn_engine_solves_empty_36x36_without_recursion():
+    # Hơn 1000 mức rẽ nhánh: vượt recursion limit mặc định nếu tìm kiếm đệ quy
+    board = [[0] * 36 for _ in range(36)]
+    result = solve(board, engine="nxn", collect_stats=True)
+    assert result.status is SolveStatus.SOLVED
+    assert result.stats.max_depth > 1000
+    assert is_solution_of(result.board, board)
+
+
+def test_solve_sudoku_fills_compact_board():
+    board = read_board_from_file("input/puzzle1.txt", compact=True)
+    assert solve_sudoku(board) is True
+    assert is_solution_of(board.to_rows(), read_board_from_file("input/puzzle1.txt"))
+    assert isinstance(board, CompactBoard)
+
+
+# Đề đầu tiên của bench/hard.txt. Hidden single chỉ lộ ra ở đơn vị của một
+# láng giềng vừa mất ứng viên: nếu lan truyền bỏ sót các đơn vị đó, tìm kiếm
+# phải đoán thêm và số nút tăng (28 thay vì 11).
+HARD = "000010006042600000080000000001070005300008100054000090020800040790030000000005003"
+
+
+@pytest.mark.parametrize("engine", ["bitmask", "iterative", "nxn"])
+def test_propagation_node_count_on_hard_puzzle(engine):
+    result = solve(parse_board_string(HARD), engine=engine, collect_stats=True)
+    assert result.status is SolveStatus.SOLVED
+    assert result.stats.nodes == 11
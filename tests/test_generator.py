@@ -0,0 +1,42 @@
+import pytest
+
+from sudoku_generator import SYMMETRIES, PuzzleGenerator, _symmetry_group, generate_many
+from sudoku_solver import is_unique
+
+
+def clue_count(board):
+    return sum(1 for row in board for v in row if v)
+
+
+@pytest.mark.parametrize("symmetry", SYMMETRIES)
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_generated_puzzle_is_unique_symmetric_and_near_target(symmetry, seed):
+    clues = 30
+    puzzle, solution = PuzzleGenerator(seed).generate(clues, symmetry)
+    assert is_unique(puzzle)
+    assert all(
+        puzzle[r][c] in (0, solution[r][c]) for r in range(9) for c in range(9)
+    )
+    # Không xuống dưới clues; đề đối xứng có thể dư tối đa một nhóm (< 4 ô)
+    count = clue_count(puzzle)
+    if symmetry == "none":
+        assert count == clues
+    else:
+        assert clues <= count < clues + 4
+    for i in range(81):
+        given = [bool(puzzle[j // 9][j % 9]) for j in _symmetry_group(i, symmetry)]
+        assert len(set(given)) == 1, (symmetry, i)
+
+
+def test_same_seed_same_puzzle():
+    first = PuzzleGenerator(7).generate(28, "rot180")
+    assert PuzzleGenerator(7).generate(28, "rot180") == first
+    assert PuzzleGenerator(8).generate(28, "rot180") != first
+    assert list(generate_many(3, 28, seed=5)) == list(generate_many(3, 28, seed=5))
+
+
+def test_generate_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        PuzzleGenerator(0).generate(16)
+    with pytest.raises(ValueError):
+        PuzzleGenerator(0).generate(30, "spiral")
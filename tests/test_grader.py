@@ -0,0 +1,31 @@
+from sudoku_grader import INVALID, NOT_UNIQUE, Grader, grade
+from sudoku_solver import solve
+from sudoku_utils import read_board_from_file
+
+
+def test_unique_puzzle_gets_a_difficulty():
+    g = grade(read_board_from_file("input/puzzle6.txt"))
+    assert g.rating == "expert" and g.score > 0
+
+
+def test_search_effort_matches_bitmask_stats():
+    board = read_board_from_file("input/puzzle6.txt")
+    stats = solve(board, engine="bitmask", collect_stats=True).stats
+    g = grade(board)
+    assert (g.nodes, g.backtracks) == (stats.nodes, stats.backtracks)
+    assert g.score == 7000 + stats.backtracks
+
+
+def test_multi_solution_puzzles_are_not_graded():
+    grader = Grader()
+    for name in ("puzzle4.txt", "puzzle5.txt"):
+        assert grader.grade(read_board_from_file(f"input/{name}")) == NOT_UNIQUE
+    assert grader.grade([[0] * 9 for _ in range(9)]) == NOT_UNIQUE
+
+
+def test_contradictory_puzzle_is_invalid():
+    board = read_board_from_file("input/puzzle1.txt")
+    r, c = next((r, c) for r in range(9) for c in range(9) if board[r][c] == 0)
+    # Hai ô cùng hàng mang cùng chữ số
+    board[r][c] = next(v for v in board[r] if v)
+    assert grade(board) == INVALID
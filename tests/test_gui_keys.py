@@ -0,0 +1,120 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from sudoku_conflicts import ConflictIndex  # noqa: E402
+from sudoku_gui import SudokuGUI  # noqa: E402
+
+
+class FakeGrid:
+    """Thay CanvasGrid (không cần màn hình): chỉ giữ giá trị / ghi chú."""
+
+    def __init__(self) -> None:
+        self.values = bytearray(81)
+        self.pencil = [0] * 81
+
+    def get_value(self, r, c):
+        return self.values[r * 9 + c]
+
+    def set_value(self, r, c, num):
+        self.values[r * 9 + c] = num
+
+    def get_pencil(self, r, c):
+        return self.pencil[r * 9 + c]
+
+    def set_pencil(self, r, c, mask):
+        self.pencil[r * 9 + c] = mask
+
+    def set_style(self, *args, **kwargs):
+        pass
+
+
+def make_gui(value: int = 5) -> SudokuGUI:
+    gui = SudokuGUI.__new__(SudokuGUI)
+    gui.board_grid = FakeGrid()
+    gui.conflicts = ConflictIndex()
+    gui.pencil_mode = False
+    gui.selected_cell = (0, 0)
+    gui._set_status = lambda *args: None
+    gui._set_cell_value(0, 0, value)
+    return gui
+
+
+def key(char: str, keysym: str = "") -> SimpleNamespace:
+    return SimpleNamespace(char=char, keysym=keysym)
+
+
+@pytest.mark.parametrize(
+    "event",
+    [
+        key("\t", "Tab"),
+        key("\r", "Return"),
+        key("\x1b", "Escape"),
+        key(" ", "space"),
+        key("\x01", "a"),  # Ctrl-A
+        key("x", "x"),
+        key("", "Shift_L"),
+    ],
+)
+def test_non_digit_keys_leave_cell_unchanged(event):
+    gui = make_gui(5)
+    gui._on_cell_key(event)
+    assert gui.board_grid.get_value(0, 0) == 5
+
+
+@pytest.mark.parametrize(
+    "event",
+    [key("\x08", "BackSpace"), key("\x7f", "Delete"), key("0", "0"), key(".", "period")],
+)
+def test_erase_keys_clear_cell(event):
+    gui = make_gui(5)
+    gui._on_cell_key(event)
+    assert gui.board_grid.get_value(0, 0) == 0
+
+
+def test_digit_key_sets_cell():
+    gui = make_gui(5)
+    gui._on_cell_key(key("7", "7"))
+    assert gui.board_grid.get_value(0, 0) == 7
+
+
+def make_nav_gui(selected):
+    gui = SudokuGUI.__new__(SudokuGUI)
+    gui.selected_cell = selected
+    gui._focus_cell = lambda r, c: setattr(gui, "selected_cell", (r, c))
+    return gui
+
+
+@pytest.mark.parametrize(
+    "start, step, expected",
+    [
+        ((0, 0), 1, (0, 1)),
+        ((0, 8), 1, (1, 0)),
+        ((8, 8), 1, (0, 0)),
+        ((1, 0), -1, (0, 8)),
+        ((0, 0), -1, (8, 8)),
+        (None, 1, (0, 0)),
+        (None, -1, (8, 8)),
+    ],
+)
+def test_tab_steps_selection_in_row_order(start, step, expected):
+    gui = make_nav_gui(start)
+    assert gui._step_selection(step) == "break"
+    assert gui.selected_cell == expected
+
+
+@pytest.mark.parametrize(
+    "start, delta, expected",
+    [
+        ((4, 4), (-1, 0), (3, 4)),
+        ((4, 4), (0, 1), (4, 5)),
+        ((0, 0), (-1, 0), (0, 0)),
+        ((8, 8), (0, 1), (8, 8)),
+    ],
+)
+def test_arrows_move_selection_and_stop_at_edges(start, delta, expected):
+    gui = make_nav_gui(start)
+    assert gui._move_selection(*delta) == "break"
+    assert gui.selected_cell == expected
@@ -0,0 +1,45 @@
+from sudoku_batch import solve_batch
+from sudoku_solver import solve
+from sudoku_store import SolutionStore
+from sudoku_utils import parse_board_string
+
+
+def read_puzzles(path, n):
+    with open(path, encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    return [parse_board_string(line) for line in lines[:n]]
+
+
+def test_put_many_and_deferred_put_persist(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+    boards = read_puzzles("bench/easy.txt", 5)
+    pairs = [(b, solve(b).board) for b in boards]
+
+    with SolutionStore(path) as store:
+        assert store.put_many(pairs[:4]) == 4
+        store.put(*pairs[4], commit=False)
+
+    with SolutionStore(path) as store:
+        assert len(store) == 5
+        for board, solution in pairs:
+            assert store.get(board) == solution
+
+
+def test_batch_writes_solutions_to_store(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+    with SolutionStore(path) as store:
+        results = list(solve_batch("bench/easy.txt", workers=1, chunksize=16, store=store))
+    with SolutionStore(path) as store:
+        assert len(store) == len(results)
+        board = read_puzzles("bench/easy.txt", 1)[0]
+        assert store.get(board) == solve(board).board
+
+
+def test_batch_rerun_uses_store(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+    with SolutionStore(path) as store:
+        first = list(solve_batch("bench/easy.txt", workers=1, chunksize=16, store=store))
+    with SolutionStore(path) as store:
+        again = list(solve_batch("bench/easy.txt", workers=1, chunksize=16, store=store))
+        assert store.hits == len(first) and store.misses == 0
+    assert again == first
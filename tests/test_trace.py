@@ -0,0 +1,38 @@
+import pytest
+
+from sudoku_trace import _HEADER, SearchTrace, record
+from sudoku_utils import read_board_from_file
+
+
+@pytest.fixture
+def saved(tmp_path):
+    trace = record(read_board_from_file("input/puzzle6.txt"), interval=8)
+    path = tmp_path / "puzzle6.trace"
+    trace.save(str(path))
+    return trace, path
+
+
+def test_save_load_roundtrip(saved):
+    trace, path = saved
+    loaded = SearchTrace.load(str(path))
+    assert loaded.result == trace.result
+    assert list(loaded.events) == list(trace.events)
+    assert loaded.board_at(len(loaded)) == trace.board_at(len(trace))
+
+
+@pytest.mark.parametrize("keep", [0, _HEADER.size - 1, _HEADER.size + 40, -1])
+def test_truncated_file_raises_value_error(saved, keep):
+    _, path = saved
+    data = path.read_bytes()
+    path.write_bytes(data[:keep])
+    with pytest.raises(ValueError):
+        SearchTrace.load(str(path))
+
+
+def test_corrupt_event_raises_value_error(saved):
+    _, path = saved
+    data = bytearray(path.read_bytes())
+    data[-2:] = (127 | (15 << 7)).to_bytes(2, "little")
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        SearchTrace.load(str(path))
@@ -0,0 +1,114 @@
+import pytest
+
+from sudoku_utils import (
+    CompactBoard,
+    board_to_string,
+    board_to_string_nxn,
+    parse_board_nxn_string,
+    parse_board_string,
+    read_board_from_file,
+    read_board_nxn,
+    validate_board_nxn,
+    write_board_nxn,
+    write_board_to_file,
+)
+
+PUZZLE = read_board_from_file("input/puzzle1.txt")
+
+
+def test_compact_board_round_trip():
+    compact = CompactBoard.from_rows(PUZZLE)
+    assert compact.to_rows() == PUZZLE
+    assert compact.to_string() == board_to_string(PUZZLE)
+    assert parse_board_string(compact.to_string()) == PUZZLE
+    assert CompactBoard(compact.memoryview()) == compact
+
+
+def test_compact_board_rows_are_views():
+    compact = CompactBoard.from_rows(PUZZLE)
+    copy = compact.copy()
+    copy[0][0] = 0 if PUZZLE[0][0] else 9
+    assert copy.cells[0] == copy[0][0] and compact.cells[0] == PUZZLE[0][0]
+    assert copy != compact and hash(compact) == hash(compact.copy())
+    assert [list(row) for row in compact] == PUZZLE
+
+
+def test_read_compact_and_write_back(tmp_path):
+    compact = read_board_from_file("input/puzzle1.txt", compact=True)
+    assert isinstance(compact, CompactBoard) and compact.to_rows() == PUZZLE
+    out = tmp_path / "board.txt"
+    write_board_to_file(compact, str(out))
+    assert read_board_from_file(str(out)) == PUZZLE
+
+
+def test_compact_board_rejects_wrong_size():
+    with pytest.raises(ValueError):
+        CompactBoard(bytes(80))
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "input/puzzle_error_duplicate.txt",
+        "input/puzzle_error_missing_line.txt",
+        "input/puzzle_error_wrong_char.txt",
+    ],
+)
+def test_read_rejects_bad_files(path):
+    with pytest.raises(ValueError):
+        read_board_from_file(path)
+
+
+def test_nxn_round_trip_16x16(tmp_path):
+    board = read_board_nxn("input/nxn/puzzle_16x16.txt")
+    assert len(board) == 16 and all(len(row) == 16 for row in board)
+    assert max(max(row) for row in board) > 9  # có ký hiệu A..G
+    out = tmp_path / "board16.txt"
+    write_board_nxn(board, str(out))
+    assert read_board_nxn(str(out)) == board
+
+
+def test_nxn_round_trip_multi_digit_tokens(tmp_path):
+    n = 36  # lớn hơn 35 => ghi số cách nhau bởi khoảng trắng
+    board = [[0] * n for _ in range(n)]
+    board[0][0], board[5][7], board[35][35] = 36, 12, 1
+    out = tmp_path / "board36.txt"
+    write_board_nxn(board, str(out))
+    assert " " in out.read_text(encoding="utf-8").splitlines()[0]
+    assert read_board_nxn(str(out)) == board
+
+
+def test_nxn_string_round_trip():
+    board = read_board_nxn("input/nxn/puzzle_16x16.txt")
+    assert parse_board_nxn_string(board_to_string_nxn(board)) == board
+
+
+def test_parse_nxn_string_4x4():
+    assert parse_board_nxn_string("1.3.....2.......") == [
+        [1, 0, 3, 0],
+        [0, 0, 0, 0],
+        [2, 0, 0, 0],
+        [0, 0, 0, 0],
+    ]
+
+
+@pytest.mark.parametrize(
+    "board",
+    [
+        [[1, 1, 0, 0], [0] * 4, [0] * 4, [0] * 4],  # trùng hàng
+        [[1, 0, 0, 0], [0] * 4, [1, 0, 0, 0], [0] * 4],  # trùng cột
+        [[1, 0, 0, 0], [0, 1, 0, 0], [0] * 4, [0] * 4],  # trùng khối
+        [[0] * 4, [0] * 4, [0] * 3, [0] * 4],  # hàng thiếu ô
+        [[0] * 3 for _ in range(3)],  # 3 không phải số chính phương
+    ],
+)
+def test_validate_nxn_rejects_bad_boards(board):
+    with pytest.raises(ValueError):
+        validate_board_nxn(board)
+
+
+def test_read_nxn_rejects_out_of_range_symbol(tmp_path):
+    path = tmp_path / "bad.txt"
+    path.write_text("1.5.\n....\n....\n....\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        read_board_nxn(str(path))
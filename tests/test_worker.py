@@ -0,0 +1,65 @@
+import time
+
+from sudoku_solver import SolveStatus
+from sudoku_utils import parse_board_string, read_board_from_file
+from sudoku_worker import SolveWorker
+
+
+def wait_messages(worker, timeout_s=10.0):
+    messages = []
+    deadline = time.monotonic() + timeout_s
+    while worker.running and time.monotonic() < deadline:
+        start = time.perf_counter()
+        messages += worker.poll()
+        assert time.perf_counter() - start < 0.05  # poll() không chặn
+        time.sleep(0.005)
+    return messages
+
+
+def test_default_solve_runs_without_stats():
+    worker = SolveWorker()
+    worker.start(read_board_from_file("input/puzzle6.txt"))
+    messages = wait_messages(worker)
+    kind, result = messages[-1]
+    assert kind == "done" and result.status is SolveStatus.SOLVED
+    assert result.stats is None and result.elapsed_ms is not None
+    assert all(m[0] != "progress" for m in messages)
+
+
+def test_collect_stats_is_passed_through():
+    worker = SolveWorker()
+    worker.start(read_board_from_file("input/puzzle6.txt"), collect_stats=True)
+    messages = wait_messages(worker)
+    kind, result = messages[-1]
+    assert kind == "done" and result.stats is not None and result.stats.nodes > 0
+    assert all(m[0] != "progress" for m in messages)
+
+
+def test_cancel_does_not_block_and_is_reaped():
+    with open("bench/17clue.txt", encoding="utf-8") as f:
+        text = next(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    worker = SolveWorker()
+    worker.start(parse_board_string(text), engine="backtracking", progress=True)
+    time.sleep(0.2)
+    start = time.perf_counter()
+    worker.cancel()
+    assert time.perf_counter() - start < 0.05
+    assert not worker.running and worker.poll() == []
+
+    deadline = time.monotonic() + 5.0
+    while not worker.reap():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_progress_streams_nodes_and_returns_stats():
+    with open("bench/17clue.txt", encoding="utf-8") as f:
+        text = next(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    worker = SolveWorker()
+    worker.start(parse_board_string(text), engine="backtracking", progress=True, max_nodes=50000)
+    messages = wait_messages(worker, timeout_s=30.0)
+    progress = [m for m in messages if m[0] == "progress"]
+    kind, result = messages[-1]
+    assert kind == "done" and result.stats is not None
+    nodes = [m[1] for m in progress]
+    assert nodes and nodes == sorted(nodes) and nodes[-1] <= result.stats.nodes